@@ -0,0 +1,44 @@
+"""
+Measures how long the validation of recorded answers takes for every command of CommandSetLegacy and CommandSet.
+The answers are taken from tests/soniccontrol/recorded_answers.py, so the script has to be run from the repository root.
+
+Example:
+    PYTHONPATH=src:. python scripts/benchmark_command_validation.py --repeat 2000
+"""
+import argparse
+import time
+from typing import Dict, List
+
+from soniccontrol.command import Command
+from soniccontrol.commands import CommandSet, CommandSetLegacy
+from tests.soniccontrol.recorded_answers import ANSWERS, LEGACY_ANSWERS
+
+
+def benchmark_command_set(name: str, commands: object, answers: Dict[str, List[str]], repeat: int) -> float:
+    print(f"{name}:")
+    total = 0.
+    for attribute, value in vars(commands).items():
+        if not isinstance(value, Command) or attribute not in answers:
+            continue
+        command: Command = value
+        elapsed = 0.
+        for answer in answers[attribute]:
+            command.answer.receive_answer(answer)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                command.validate()
+            elapsed += time.perf_counter() - start
+        per_answer = elapsed / (repeat * len(answers[attribute])) * 1e6
+        total += elapsed
+        print(f"  {attribute:<28} {command.message:<12} {per_answer:8.2f} us/answer")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1000, help="how often each answer gets validated")
+    args = parser.parse_args()
+
+    total = benchmark_command_set("CommandSetLegacy", CommandSetLegacy(None), LEGACY_ANSWERS, args.repeat)
+    total += benchmark_command_set("CommandSet", CommandSet(None), ANSWERS, args.repeat)
+    print(f"total: {total:.3f} s")
@@ -0,0 +1,66 @@
+"""
+Measures the round trip time of the status command over a connection.
+Run it once with --serial and once with --tcp against the same device to get the latency
+a serial device server adds compared to a direct serial connection.
+
+Example:
+    python scripts/benchmark_connection_latency.py --serial /dev/ttyUSB0
+    python scripts/benchmark_connection_latency.py --tcp 192.168.1.20:4000
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from soniccontrol.communication.communicator_builder import CommunicatorBuilder
+from soniccontrol.communication.connection_factory import (
+    ConnectionFactory,
+    SerialConnectionFactory,
+    TcpConnectionFactory,
+)
+
+
+def create_connection_factory(args: argparse.Namespace) -> ConnectionFactory:
+    if args.serial:
+        return SerialConnectionFactory(connection_name="benchmark", url=args.serial)
+    host, port = args.tcp.rsplit(":", 1)
+    return TcpConnectionFactory(
+        connection_name="benchmark",
+        host=host,
+        port=int(port),
+        protocol=args.protocol,
+        no_delay=not args.nagle,
+    )
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    logger = logging.getLogger("benchmark")
+    serial, commands = await CommunicatorBuilder.build(create_connection_factory(args), logger=logger)
+
+    round_trips = []
+    try:
+        for _ in range(args.count):
+            start = time.perf_counter()
+            await commands.get_status.execute(should_log=False)
+            round_trips.append((time.perf_counter() - start) * 1000)
+    finally:
+        await serial.close_communication()
+
+    round_trips.sort()
+    print(f"round trips: {len(round_trips)}")
+    print(f"mean:   {statistics.mean(round_trips):8.3f} ms")
+    print(f"median: {statistics.median(round_trips):8.3f} ms")
+    print(f"p95:    {round_trips[int(0.95 * (len(round_trips) - 1))]:8.3f} ms")
+    print(f"max:    {round_trips[-1]:8.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--serial", help="url of the serial port")
+    target.add_argument("--tcp", help="host:port of the serial device server")
+    parser.add_argument("--protocol", choices=["raw", "rfc2217"], default="raw")
+    parser.add_argument("--nagle", action="store_true", help="do not set TCP_NODELAY")
+    parser.add_argument("--count", type=int, default=200)
+    asyncio.run(benchmark(parser.parse_args()))
@@ -0,0 +1,107 @@
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import attrs
+
+
+# Answers of getters for values that rarely change, with the seconds they stay valid.
+# Values the user can set expire sooner, in case another client or a script on the device changed them.
+DEFAULT_ANSWER_TTLS: Dict[str, float] = {
+    "?info": 600.,
+    "?type": 600.,
+    "?help": 600.,
+    "?list_commands": 600.,
+    **{f"?atf{index}": 30. for index in range(1, 5)},
+    **{f"?att{index}": 30. for index in range(1, 5)},
+    "?atf": 30.,
+    "?atk": 30.,
+    "?att": 30.,
+    "?aton": 30.,
+}
+
+
+def _setters_invalidating_other_getters() -> Dict[str, Tuple[str, ...]]:
+    # A setter !name= always invalidates ?name. These are the getters whose answers contain more than that.
+    invalidations: Dict[str, Tuple[str, ...]] = {}
+    for index in range(1, 5):
+        invalidations[f"!atf{index}="] = (f"?atf{index}", "?atf")
+        invalidations[f"!atk{index}="] = (f"?atf{index}", "?atk") # legacy ?atfN answers with atfN and atkN
+        invalidations[f"!att{index}="] = (f"?att{index}", "?att")
+        invalidations[f"!aton{index}="] = ("?aton",)
+    return invalidations
+
+
+DEFAULT_INVALIDATIONS: Dict[str, Tuple[str, ...]] = _setters_invalidating_other_getters()
+
+
+CacheKey = Tuple[str, str]
+
+
+@attrs.define
+class AnswerCache:
+    """
+    Read-through cache for the answers of idempotent getters, keyed by the message and the argument.
+
+    Only messages that have a ttl are cached. Setters invalidate the getters that would answer with
+    the value they changed: !name= invalidates ?name and the getters listed in invalidations.
+    The setter can also be given with its argument in the message, like !atf1=1000000.
+    """
+    _ttls: Dict[str, float] = attrs.field(factory=lambda: dict(DEFAULT_ANSWER_TTLS), converter=dict)
+    _invalidations: Dict[str, Tuple[str, ...]] = attrs.field(
+        factory=lambda: dict(DEFAULT_INVALIDATIONS), converter=dict
+    )
+    _clock: Callable[[], float] = attrs.field(default=time.monotonic, repr=False)
+    _entries: Dict[CacheKey, Tuple[float, str]] = attrs.field(init=False, factory=dict, repr=False)
+    _hits: int = attrs.field(init=False, default=0)
+    _misses: int = attrs.field(init=False, default=0)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def is_cached(self, message: str) -> bool:
+        return message in self._ttls
+
+    def get(self, message: str, argument: Any = "") -> Optional[str]:
+        """
+        Returns the cached answer or None, if there is none or it expired.
+        Only lookups of messages with a ttl are counted as hits or misses.
+        """
+        if message not in self._ttls:
+            return None
+        key = (message, str(argument))
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, answer = entry
+            if self._clock() < expires_at:
+                self._hits += 1
+                return answer
+            del self._entries[key]
+        self._misses += 1
+        return None
+
+    def put(self, message: str, argument: Any, answer: str) -> None:
+        ttl = self._ttls.get(message)
+        if ttl is None:
+            return
+        self._entries[(message, str(argument))] = (self._clock() + ttl, answer)
+
+    def invalidate(self, message: str) -> None:
+        """
+        Removes the answers that are outdated after the given message was sent.
+        Messages that are not setters do not invalidate anything.
+        """
+        if not message.startswith("!"):
+            return
+        head, separator, _ = message.partition("=")
+        setter = head + separator
+        getters = ("?" + head[1:],) + self._invalidations.get(setter, ())
+        for key in [key for key in self._entries if key[0] in getters]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, List, Tuple, Union
 
 from soniccontrol.command import Answer
 from soniccontrol.commands import CommandSet, CommandSetLegacy
@@ -15,19 +15,23 @@ from soniccontrol.sonic_device import (
 class DeviceBuilder:
     def _add_commands_from_list_command_answer(
         self, commands: CommandSet, sonicAmp: SonicDevice, answer: Answer
-    ) -> None:
-        command_names = answer.string.split("#")
-        for command_name in command_names:
-            command_attrs = [
-                command
-                for name, command in commands.__dict__.items()
-                if not name.startswith("_") and not callable(command)
-            ]
-            command = next(
-                filter(lambda c: c.message == command_name, command_attrs), None
-            )
+    ) -> List[str]:
+        """
+        Adds the commands the device lists in the answer of ?list_commands to the device.
+
+        Returns:
+            List[str]: The commands the device advertises, but that are not known to the host.
+        """
+        unknown_commands: List[str] = []
+        for command_name in answer.string.split("#"):
+            if not command_name:
+                continue
+            command = commands.get_by_message(command_name)
             if command:
                 sonicAmp.add_command(command)
+            else:
+                unknown_commands.append(command_name)
+        return unknown_commands
 
     async def build_amp(self, ser: Communicator, commands: Union[CommandSet, CommandSetLegacy], logger: logging.Logger = logging.getLogger(), try_connection: bool = True) -> SonicDevice:
         builder_logger = logging.getLogger(logger.name + "." + DeviceBuilder.__name__)
@@ -71,9 +75,11 @@ class DeviceBuilder:
             builder_logger.debug("Get list of available commands of device")
             await commands.get_command_list.execute(should_log=False)
             if commands.get_command_list.answer.valid:
-                self._add_commands_from_list_command_answer(
+                unknown_commands = self._add_commands_from_list_command_answer(
                     commands, sonicamp, commands.get_command_list.answer
                 )
+                if unknown_commands:
+                    builder_logger.warning("The device supports commands unknown to soniccontrol: %s", str(unknown_commands))
                 builder_logger.debug("List of the commands that are supported: %s", str(sonicamp.commands.keys()))
                 return sonicamp
             else:
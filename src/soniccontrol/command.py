@@ -1,8 +1,5 @@
 import asyncio
-import json
-import logging
 import re
-import sys
 import time
 from typing import (
     Any,
@@ -13,55 +10,46 @@ from typing import (
     List,
     Literal,
     Optional,
+    Set,
+    Tuple,
     Union,
 )
 
 import attrs
-from icecream import ic
 from soniccontrol.communication.communicator import Communicator, Sendable
+from soniccontrol.logging import is_tracing, trace
 from soniccontrol.system import PLATFORM
 
-parrot_feeder = logging.getLogger("parrot_feeder")
-
 
 @attrs.define
-class Converter:
-    worker: Callable[[Any], Any] = attrs.field()
-    _converted: bool = attrs.field(default=False, init=False, repr=False)
-    _result: Any = attrs.field(init=False)
+class ConversionError:
+    keyword: str = attrs.field()
+    value: Any = attrs.field()
+    exception: Exception = attrs.field()
 
-    @property
-    def result(self) -> Any:
-        if self._converted:
-            return self._result
-        else:
-            ic("ERROR: Converter did not convert yet.")
-            return False
 
-    def convert(self, *args, **kwargs) -> Any:
-        try:
-            self._result = self.worker(*args, **kwargs)
-        except Exception:
-            ic("ERROR", sys.exc_info())
-            return False
-        else:
-            self._converted = True
-            return self._result
-
-
-@attrs.define
+# The converters are only converted when the validator is created. Without on_setattr, attrs does not
+# wrap the assignment of the result in accepts with the converter hooks.
+@attrs.define(on_setattr=attrs.setters.NO_OP)
 class CommandValidator:
     pattern: str = attrs.field()
-    _converters: Dict[str, Converter] = attrs.field(converter=dict, repr=False)
+    _converters: Dict[str, Callable[[Any], Any]] = attrs.field(converter=dict, repr=False)
     _after_converters: Dict[
-        str, Dict[Literal["worker", "keywords"], Union[Converter, str]]
+        str, Dict[Literal["worker", "keywords"], Any]
     ] = attrs.field(repr=False)
     _result: Dict[str, Any] = attrs.field(init=False, factory=dict, repr=False)
+    _errors: List[ConversionError] = attrs.field(init=False, factory=list, repr=False)
+    _literals: Optional[Tuple[str, ...]] = attrs.field(default=None, repr=False)
     _compiled_pattern: re.Pattern[str] = attrs.field(init=False, repr=False)
+    _matches_within_lines: bool = attrs.field(init=False, repr=False)
+    _parse: Callable[[str], Optional[Tuple[Dict[str, Any], List[ConversionError]]]] = attrs.field(
+        init=False, repr=False
+    )
 
     def __init__(
         self,
         pattern: str,
+        literal: str | Tuple[str, ...] | None = None,
         **kwargs: type[Any] | Callable[[Any], Any] | dict[str, Any],
     ) -> None:
         """
@@ -69,6 +57,9 @@ class CommandValidator:
 
         Parameters:
             pattern (str): The pattern to be used.
+            literal (str | Tuple[str, ...] | None): Text that appears in every answer the pattern accepts.
+                        If a tuple is given, at least one of them has to appear. The comparison ignores the case.
+                        Commands skip the regex search for answers and lines without it.
             **kwargs:   Additional keyword arguments that are passed to the Converter constructor.
                         The keyword argument should be a string that is the name of the
                         value. The value should be a Callable that takes in the value and returns
@@ -95,19 +86,19 @@ class CommandValidator:
             None
         """
         workers: dict[str, Callable[[Any], Any]] = dict()
-        after_workers: dict[str, Callable[[Any], Any]] = dict()
+        after_workers: dict[str, dict[str, Any]] = dict()
 
         for keyword, worker in kwargs.items():
             if isinstance(worker, dict):
-                worker["worker"] = Converter(worker["worker"])
                 after_workers[keyword] = worker
                 continue
-            workers[keyword] = Converter(worker)
+            workers[keyword] = worker
 
         self.__attrs_init__(
             pattern=pattern,
             converters=workers,
             after_converters=after_workers,
+            literals=(literal,) if isinstance(literal, str) else literal,
         )
 
     def __attrs_post_init__(self) -> None:
@@ -118,6 +109,13 @@ class CommandValidator:
             pattern=self.pattern,
             flags=re.IGNORECASE,
         )
+        if self._literals is not None:
+            assert all(literal and "\n" not in literal for literal in self._literals)
+            self._literals = tuple(literal.lower() for literal in self._literals)
+        self._matches_within_lines = re.search(
+            r"\^|\$|\\A|\\Z|\(\?<?[=!]", self.pattern
+        ) is None
+        self._parse = self._compile_parser()
 
     @property
     def result(self) -> Dict[str, Any]:
@@ -129,6 +127,110 @@ class CommandValidator:
         """
         return self._result
 
+    @property
+    def literals(self) -> Optional[Tuple[str, ...]]:
+        """
+        Returns the lowercase literals of which at least one appears in every accepted answer,
+        or None if the validator did not declare any.
+        """
+        return self._literals
+
+    @property
+    def value_names(self) -> Set[str]:
+        """
+        Returns the names of the values the validator puts into the result.
+        """
+        return {*self._converters.keys(), *self._after_converters.keys()}
+
+    @property
+    def matches_within_lines(self) -> bool:
+        """
+        True if the pattern has no anchors and no lookarounds. Then every match on a single line
+        is also a match on the whole answer, so a validator that rejected the whole answer
+        rejects each of its lines too.
+        """
+        return self._matches_within_lines
+
+    @property
+    def errors(self) -> List[ConversionError]:
+        """
+        Returns the errors of the converters that failed in the last call of accepts.
+        The values of failed converters are set to False in the result.
+
+        :return: A list of the conversion errors.
+        :rtype: List[ConversionError]
+        """
+        return self._errors
+
+    def _compile_parser(
+        self,
+    ) -> Callable[[str], Optional[Tuple[Dict[str, Any], List[ConversionError]]]]:
+        """
+        Builds the function that matches the data and converts the groups.
+        Which converter gets which group is resolved here once, so that parsing an answer
+        only needs a single pass over the groups of the match.
+        """
+        search = self._compiled_pattern.search
+        group_index = self._compiled_pattern.groupindex
+        group_converters = tuple(
+            (index - 1, keyword, self._converters.get(keyword, lambda value: value))
+            for keyword, index in sorted(group_index.items(), key=lambda item: item[1])
+        )
+        after_converters = tuple(
+            (
+                keyword,
+                worker["worker"],
+                tuple(k for k in worker["keywords"] if k in group_index),
+            )
+            for keyword, worker in self._after_converters.items()
+        )
+
+        group_keywords = tuple(keyword for _, keyword, _ in group_converters)
+        indexed_converters = tuple((index, convert) for index, _, convert in group_converters)
+
+        def convert_with_errors(
+            groups: Tuple[Any, ...]
+        ) -> Tuple[Dict[str, Any], List[ConversionError]]:
+            result: Dict[str, Any] = {}
+            errors: List[ConversionError] = []
+            for index, keyword, convert in group_converters:
+                value = groups[index]
+                try:
+                    result[keyword] = convert(value)
+                except Exception as e:
+                    result[keyword] = False
+                    errors.append(ConversionError(keyword, value, e))
+            return result, errors
+
+        def parse(data: str) -> Optional[Tuple[Dict[str, Any], List[ConversionError]]]:
+            match = search(data)
+            if match is None:
+                return None
+
+            groups = match.groups()
+            # Usually every converter succeeds. Converting all groups at once is cheaper
+            # than guarding each converter on its own, so only redo it group by group
+            # to find out which converters failed.
+            try:
+                result = dict(zip(
+                    group_keywords, [convert(groups[index]) for index, convert in indexed_converters]
+                ))
+                errors: List[ConversionError] = []
+            except Exception:
+                result, errors = convert_with_errors(groups)
+
+            for keyword, convert, keywords in after_converters:
+                arguments = {k: result[k] for k in keywords}
+                try:
+                    result[keyword] = convert(**arguments)
+                except Exception as e:
+                    result[keyword] = False
+                    errors.append(ConversionError(keyword, arguments, e))
+
+            return result, errors
+
+        return parse
+
     @staticmethod
     def generate_named_pattern(pattern: str, keywords: List[str]) -> str:
         """
@@ -183,27 +285,11 @@ class CommandValidator:
         """
         if not data:
             return False
-        result: Optional[re.Match] = self._compiled_pattern.search(data)
-        if result is None:
+        parsed = self._parse(data)
+        if parsed is None:
             return False
 
-        self._result = {
-            keyword: self._converters[keyword].convert(result.groupdict().get(keyword))
-            for keyword in result.groupdict().keys()
-        }
-        self.result.update(
-            {
-                keyword: self._after_converters[keyword]["worker"].convert(
-                    **{
-                        k: self._result.get(k)
-                        for k in worker["keywords"]
-                        if k in result.groupdict()
-                    }
-                )
-                for keyword, worker in self._after_converters.items()
-            }
-        )
-
+        self._result, self._errors = parsed
         return True
 
 
@@ -302,12 +388,12 @@ class Answer:
             None
         """
         self._received_timestamp = time.time()
-        if isinstance(answer, Iterable) and not isinstance(answer, str):
-            self._lines = list(answer)
-            self._string = "\n".join(answer)
-        elif isinstance(answer, str):
+        if isinstance(answer, str):
             self._lines = answer.splitlines()
             self._string = answer
+        elif isinstance(answer, Iterable):
+            self._lines = list(answer)
+            self._string = "\n".join(answer)
         else:
             raise ValueError(f"{answer = } is not of type {str, list, tuple, set}")
         self._measured_response = self._received_timestamp - self._creation_timestamp
@@ -370,10 +456,11 @@ class Command(Sendable):
     def add_validators(
         self, validators: Union[CommandValidator, Iterable[CommandValidator]]
     ) -> None:
+        # the validators can be the tuple shared with the CommandDefinition, so do not modify them in place
         if isinstance(validators, CommandValidator):
-            self._validators.append(validators)
+            self._validators = [*self._validators, validators]
         elif isinstance(validators, (list, tuple, set, Generator)):
-            self._validators.extend(validators)
+            self._validators = [*self._validators, *validators]
         else:
             raise ValueError("Illegal argument for validators", validators)
 
@@ -393,7 +480,7 @@ class Command(Sendable):
         Executes a command asynchronously.
 
         Args:
-            argument (Any, optional): The argument for the command. Defaults to None.
+            argument (Any, optional): The argument for the command. Defaults to None, which uses the argument of the command.
             connection (Optional[Communicator], optional): The connection to use for executing the command. Defaults to None.
 
         Returns:
@@ -403,7 +490,9 @@ class Command(Sendable):
             ValueError: If the serial communication reference is not viable.
             ConnectionError: If the device does not respond
 
-        This method resets the answer, sets the argument if provided, and sends the command asynchronously using the specified connection.
+        This method creates a CommandRequest with its own answer and argument and sends it using the specified connection.
+        The command itself is not modified by the call, except that answer and status_result are set to the ones of the request
+        afterwards. So the same command can be executed concurrently, each caller gets the answer of its own request.
         It then validates the answer and updates the status result with the received timestamp. Finally, it returns a tuple containing the answer and the status result.
         """
         if self.serial_communication is None and connection is None:
@@ -415,62 +504,167 @@ class Command(Sendable):
             assert self.serial_communication is not None
             connection = self.serial_communication
 
-        self.answer.reset()
-        if argument is not None:
-            self.set_argument(argument)
+        request = CommandRequest(
+            command=self, argument=self.argument if argument is None else argument
+        )
+
+        if should_log and is_tracing():
+            trace("COMMAND_CALL", request.get_dict())
 
-        if should_log:
-            parrot_feeder.debug("COMMAND_CALL(%s)", json.dumps(self.get_dict()))
-        
-        await connection.send_and_wait_for_answer(self)
+        await connection.send_and_wait_for_answer(request)
 
-        self.answer.valid = self.validate()
-        self.status_result.update({"timestamp": self.answer.received_timestamp})
+        request.answer.valid, request.status_result = self.validate_answer(request.answer)
+        request.status_result.update({"timestamp": request.answer.received_timestamp})
+        # answer and status_result of the command refer to the last completed call
+        self.answer = request.answer
+        self._status_result = request.status_result
 
-        if should_log:
-            parrot_feeder.debug("ANSWER(%s)", json.dumps({"message": self.answer.string}))
+        if should_log and is_tracing():
+            trace("ANSWER", {"message": request.answer.string})
 
-        return (self.answer, self.status_result)
+        return (request.answer, request.status_result)
 
     def validate(self) -> bool:
         """
-        Validates the answer received from the command execution.
+        Validates the answer of the command and stores the results of the validators in status_result.
+
+        Returns:
+            bool: True if the answer is valid, False otherwise.
+        """
+        valid, self._status_result = self.validate_answer(self.answer)
+        return valid
+
+    def validate_answer(self, answer: Answer) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Validates an answer received for this command.
 
         This function checks if the answer has any lines. If not, it returns False.
-        It then clears the unknown answers and status result.
         It updates the unknown answers with the lines of the answer.
+        Validators that declare literals are skipped, if the answer contains none of them.
         It iterates through each validator and checks if it accepts the entire string of the answer.
         If it does, it updates the status result and continues to the next validator.
         If not, it checks if any of the lines of the answer are accepted by the validator.
+        That is only needed for patterns with anchors or lookarounds, other patterns would have matched the entire string.
         If a line is accepted, it removes it from the unknown answers and updates the status result.
         If the entire string is accepted by at least one validator, it clears the unknown answers.
         Finally, it returns True if the number of lines in the answer is not equal to the number of unknown answers, otherwise False.
 
+        Args:
+            answer (Answer): The answer to validate. Its unknown answers are updated.
+
         Returns:
-            bool: True if the answer is valid, False otherwise.
+            Tuple[bool, Dict[str, Any]]: True if the answer is valid, False otherwise, and the results of the validators.
         """
-        if not self.answer.lines:
-            return False
+        status_result: Dict[str, Any] = {}
+        if not answer.lines:
+            return False, status_result
 
-        self.answer.unknown_answers.clear()
-        self._status_result.clear()
-        self.answer.unknown_answers = set(self.answer.lines)
+        string = answer.string
+        answer.unknown_answers = set(answer.lines)
+        lowered_string: Optional[str] = None
         entire_string_accepted: bool = False
         accepted: bool = False
 
         for validator in self.validators:
-            if validator.accepts(self.answer.string):
+            literals = validator.literals
+            if literals is not None:
+                if lowered_string is None:
+                    lowered_string = string.lower()
+                for literal in literals:
+                    if literal in lowered_string:
+                        break
+                else:
+                    continue
+
+            if validator.accepts(string):
                 entire_string_accepted = True
                 accepted = True
-                self._status_result.update(validator.result)
+                status_result.update(validator.result)
                 continue
-            for answer in self.answer.lines:
-                if validator.accepts(data=answer):
+            if validator.matches_within_lines:
+                continue
+            for line in answer.lines:
+                if validator.accepts(data=line):
                     accepted = True
-                    self.answer.unknown_answers.discard(answer)
-                    self._status_result.update(validator.result)
+                    answer.unknown_answers.discard(line)
+                    status_result.update(validator.result)
 
         if entire_string_accepted:
-            self.answer.unknown_answers.clear()
+            answer.unknown_answers.clear()
+
+        return accepted, status_result
+
+
+@attrs.define
+class CommandRequest(Sendable):
+    """
+    A single execution of a Command with its own argument and answer.
+    Command.execute creates a new request for every call and hands it to the communicator,
+    so several calls of the same command can be in flight without overwriting each other.
+    """
+
+    command: Command = attrs.field()
+    argument: str = attrs.field(default="", converter=str)
+    answer: Answer = attrs.field(init=False, factory=Answer)
+    status_result: Dict[str, Any] = attrs.field(init=False, factory=dict)
+    _byte_message: bytes = attrs.field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._byte_message = f"{self.full_message}\n".encode(PLATFORM.encoding)
+
+    @property
+    def message(self) -> str:
+        return self.command.message
+
+    @property
+    def full_message(self) -> str:
+        return f"{self.command.message}{self.argument}"
+
+    @property
+    def byte_message(self) -> bytes:
+        return self._byte_message
+
+    @property
+    def estimated_response_time(self) -> float:
+        return self.command.estimated_response_time
+
+    @property
+    def expects_long_answer(self) -> bool:
+        return self.command.expects_long_answer
+
+    def get_dict(self) -> dict:
+        return {"argument": self.argument, "message": self.message}
+
+
+def _to_validator_tuple(
+    validators: Union[CommandValidator, Iterable[CommandValidator]]
+) -> Tuple[CommandValidator, ...]:
+    if isinstance(validators, CommandValidator):
+        return (validators,)
+    return tuple(validators)
 
-        return accepted
+
+@attrs.frozen
+class CommandDefinition:
+    """
+    Immutable description of a command: its message, how the answer is validated and how long it takes.
+    Definitions are created once at import time. bind creates the Command for a connection,
+    which shares the compiled validators of the definition instead of creating new ones.
+    """
+
+    name: str = attrs.field()
+    message: str = attrs.field()
+    validators: Tuple[CommandValidator, ...] = attrs.field(
+        default=(), converter=_to_validator_tuple, eq=False, repr=False
+    )
+    estimated_response_time: float = attrs.field(default=5)
+    expects_long_answer: bool = attrs.field(default=False)
+
+    def bind(self, serial: Optional[Communicator]) -> Command:
+        return Command(
+            message=self.message,
+            estimated_response_time=self.estimated_response_time,
+            expects_long_answer=self.expects_long_answer,
+            validators=self.validators,
+            serial_communication=serial,
+        )
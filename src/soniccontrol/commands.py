@@ -1,733 +1,887 @@
 from __future__ import annotations
 import datetime
+from typing import ClassVar, Dict, Iterator, Optional, Tuple
 import attrs
 from soniccontrol.communication.communicator import Communicator
-from soniccontrol.command import Command, CommandValidator
+from soniccontrol.command import Command, CommandDefinition, CommandValidator
 
 
+# The command catalogue is defined once per protocol as a table of CommandDefinitions.
+# The validators and their regexes are compiled a single time, when this module is imported,
+# and are shared by the commands of all connections.
 
-class CommandSetLegacy:    
-    def __init__(self, serial: Communicator):
-        self.get_overview: Command = Command(
-            message="?",
-            estimated_response_time=0.5,
-            expects_long_answer=True,
-            validators=(
-                CommandValidator(pattern=r".*(khz|mhz).*", relay_mode=str),
-                CommandValidator(
-                    pattern=r".*freq[uency]*\s*=?\s*([\d]+).*", frequency=int
-                ),
-                CommandValidator(pattern=r".*gain\s*=?\s*([\d]+).*", gain=int),
-                CommandValidator(
-                    pattern=r".*signal.*(on|off).*",
-                    signal=lambda b: bool(b.lower() == "on"),
-                ),
-            ),
-            serial_communication=serial,
-        )
-
-        self.get_type: Command = Command(
-            message="?type",
-            estimated_response_time=0.5,
-            validators=CommandValidator(
-                pattern=r"sonic(catch|wipe|descale)", device_type=str
-            ),
-            serial_communication=serial,
-        )
-
-        self.get_info: Command = Command(
-            message="?info",
-            estimated_response_time=2.5,
-            expects_long_answer=True,
-            validators=(
-                CommandValidator(
-                    pattern=r".*ver.*([\d]+[.][\d]+).*", 
-                    firmware_version=attrs.converters.pipe(str, lambda v: v + ".0") # add a third version number, so that it is in line with the newer firmware version format
-                ),
-                CommandValidator(pattern=r"sonic(catch|wipe|descale)", type_=str),
+
+# Converters of the answers that are parsed most often, the status and ?sens.
+# Each is a single function instead of a chain of attrs.converters.pipe,
+# because they run for every status update.
+
+_BOOLEAN_STRINGS: Dict[str, bool] = {
+    "true": True, "t": True, "yes": True, "y": True, "on": True, "1": True,
+    "false": False, "f": False, "no": False, "n": False, "off": False, "0": False,
+}
+
+
+def to_bool(value: str) -> bool:
+    """ Converts the same strings to booleans as attrs.converters.to_bool """
+    try:
+        return _BOOLEAN_STRINGS[str(value).lower()]
+    except KeyError:
+        raise ValueError(f"Cannot convert value to bool: {value}") from None
+
+
+def legacy_temperature(value: str) -> Optional[float]:
+    """ Temperatures in °C outside of the range of the sensor are set to None """
+    temperature = float(value)
+    return temperature if -70 < temperature < 200 else None
+
+
+def millikelvin_to_celsius(value: str) -> float:
+    return (int(value) / 1000.0) - 272.15   # Convert miliKevling to Celsius by dividing by 1000 and subtracting Kevling constant
+
+
+def milli_to_base_unit(value: str) -> float:
+    return float(value) / 1000
+
+
+def micro_to_base_unit(value: str) -> float:
+    return float(value) / 1_000_000
+
+
+def fullscale_urms(value: str) -> float:
+    urms = float(value)
+    urms = urms if urms > 282_300 else 282_300
+    return (urms * 0.000_400_571 - 1_130.669_402) * 1000 + 0.5
+
+
+def fullscale_irms(value: str) -> float:
+    irms = float(value)
+    irms = irms if irms > 3_038_000 else 303_800
+    return (irms * 0.000_015_601 - 47.380671) * 1000 + 0.5
+
+
+def fullscale_phase(value: str) -> float:
+    return float(value) * 0.125 * 100
+
+LEGACY_COMMAND_DEFINITIONS: Tuple[CommandDefinition, ...] = (
+    CommandDefinition(
+        name="get_overview",
+        message="?",
+        estimated_response_time=0.5,
+        expects_long_answer=True,
+        validators=(
+            CommandValidator(pattern=r".*(khz|mhz).*", literal=("khz", "mhz"), relay_mode=str),
+            CommandValidator(
+                pattern=r".*freq[uency]*\s*=?\s*([\d]+).*", literal="freq", frequency=int
             ),
-            serial_communication=serial,
-        )
-        self.set_frequency: Command = Command(
-            message="!f=",
-            validators=CommandValidator(
-                pattern=r".*freq[uency]*\s*=?\s*([\d]+).*", frequency=int
+            CommandValidator(pattern=r".*gain\s*=?\s*([\d]+).*", literal="gain", gain=int),
+            CommandValidator(
+                pattern=r".*signal.*(on|off).*", literal="signal",
+                signal=lambda b: bool(b.lower() == "on"),
             ),
-            serial_communication=serial,
-        )
-
-        self.set_gain: Command = Command(
-            message="!g=",
-            validators=CommandValidator(pattern=r".*gain\s*=?\s*([\d]+).*", gain=int),
-            serial_communication=serial,
-        )
-
-        self.set_switching_frequency: Command = Command(
-            message="!swf=",
-            validators=CommandValidator(
-                pattern=r".*freq[uency]*\s*=?\s*([\d]+).*", switching_frequency=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_type",
+        message="?type",
+        estimated_response_time=0.5,
+        validators=CommandValidator(
+            pattern=r"sonic(catch|wipe|descale)", literal="sonic", device_type=str
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_info",
+        message="?info",
+        estimated_response_time=2.5,
+        expects_long_answer=True,
+        validators=(
+            CommandValidator(
+                pattern=r".*ver.*([\d]+[.][\d]+).*", literal="ver", 
+                firmware_version=attrs.converters.pipe(str, lambda v: v + ".0") # add a third version number, so that it is in line with the newer firmware version format
             ),
-            serial_communication=serial,
-        )
-
-        self.get_status: Command = Command(
-            message="-",
-            estimated_response_time=0.35,
-            validators=CommandValidator(
-                pattern=r"([\d])(?:[-#])([\d]+)(?:[-#])([\d]+)(?:[-#])([\d]+)(?:[-#])([\d])(?:[-#])(?:[']?)([-]?[\d]+[.][\d]+)?(?:[']?)",
-                error=int,
+            CommandValidator(pattern=r"sonic(catch|wipe|descale)", literal="sonic", type_=str),
+        ),
+    ),
+    CommandDefinition(
+        name="set_frequency",
+        message="!f=",
+        validators=CommandValidator(
+            pattern=r".*freq[uency]*\s*=?\s*([\d]+).*", literal="freq", frequency=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="set_gain",
+        message="!g=",
+        validators=CommandValidator(pattern=r".*gain\s*=?\s*([\d]+).*", literal="gain", gain=int),
+    ),
+
+    CommandDefinition(
+        name="set_switching_frequency",
+        message="!swf=",
+        validators=CommandValidator(
+            pattern=r".*freq[uency]*\s*=?\s*([\d]+).*", literal="freq", switching_frequency=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_status",
+        message="-",
+        estimated_response_time=0.35,
+        validators=CommandValidator(
+            pattern=r"([\d])(?:[-#])([\d]+)(?:[-#])([\d]+)(?:[-#])([\d]+)(?:[-#])([\d])(?:[-#])(?:[']?)([-]?[\d]+[.][\d]+)?(?:[']?)",
+            literal=("-", "#"),
+            error=int,
+            frequency=int,
+            gain=int,
+            protocol=int,
+            wipe_mode=to_bool,
+            temperature=legacy_temperature,
+            signal={
+                "keywords": ("frequency",),
+                "worker": lambda frequency: frequency != 0,
+            },
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_sens",
+        message="?sens",
+        estimated_response_time=0.35,
+        validators=(
+            CommandValidator(
+                pattern=r"([\d]+)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)",
                 frequency=int,
-                gain=int,
-                protocol=int,
-                wipe_mode=attrs.converters.to_bool,
-                temperature=attrs.converters.pipe(
-                    float, lambda t: t if -70 < t < 200 else None
-                ),
-                signal={
-                    "keywords": ("frequency",),
-                    "worker": lambda frequency: frequency != 0,
-                },
-            ),
-            serial_communication=serial,
-        )
-
-        self.get_sens: Command = Command(
-            message="?sens",
-            estimated_response_time=0.35,
-            validators=(
-                CommandValidator(
-                    pattern=r"([\d]+)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)",
-                    frequency=int,
-                    urms=float,
-                    irms=float,
-                    phase=float,
-                ),
-                CommandValidator(
-                    pattern=r".*(error).*",
-                    signal=lambda error: False,
-                    frequency=lambda error: 0,
-                    urms=lambda error: 0,
-                    irms=lambda error: 0,
-                    phase=lambda error: 0,
-                ),
-            ),
-            serial_communication=serial,
-        )
-
-        self.get_sens_factorised: Command = Command(
-            message="?sens",
-            estimated_response_time=0.35,
-            validators=(
-                CommandValidator(
-                    pattern=r"([\d]+)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)",
-                    frequency=int,
-                    urms=attrs.converters.pipe(float, lambda urms: urms / 1000),
-                    irms=attrs.converters.pipe(float, lambda irms: irms / 1000),
-                    phase=attrs.converters.pipe(float, lambda phase: phase / 1_000_000),
-                ),
-                CommandValidator(
-                    pattern=r".*(error).*",
-                    signal=lambda error: False,
-                    frequency=lambda error: 0,
-                    urms=lambda error: 0,
-                    irms=lambda error: 0,
-                    phase=lambda error: 0,
-                ),
+                urms=float,
+                irms=float,
+                phase=float,
             ),
-            serial_communication=serial,
-        )
-
-        self.get_sens_fullscale_values: Command = Command(
-            message="?sens",
-            estimated_response_time=0.35,
-            validators=(
-                CommandValidator(
-                    pattern=r"([\d]+)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)",
-                    frequency=int,
-                    urms=attrs.converters.pipe(
-                        float,
-                        lambda urms: urms if urms > 282_300 else 282_300,
-                        lambda urms: (urms * 0.000_400_571 - 1_130.669_402) * 1000
-                        + 0.5,
-                    ),
-                    irms=attrs.converters.pipe(
-                        float,
-                        lambda irms: irms if irms > 3_038_000 else 303_800,
-                        lambda irms: (irms * 0.000_015_601 - 47.380671) * 1000 + 0.5,
-                    ),
-                    phase=attrs.converters.pipe(
-                        float, lambda phase: phase * 0.125 * 100
-                    ),
-                ),
-                CommandValidator(
-                    pattern=r".*(error).*",
-                    signal=lambda error: False,
-                    frequency=lambda error: 0,
-                    urms=lambda error: 0,
-                    irms=lambda error: 0,
-                    phase=lambda error: 0,
-                ),
+            CommandValidator(
+                pattern=r".*(error).*", literal="error",
+                signal=lambda error: False,
+                frequency=lambda error: 0,
+                urms=lambda error: 0,
+                irms=lambda error: 0,
+                phase=lambda error: 0,
             ),
-            serial_communication=serial,
-        )
-
-        self.signal_on: Command = Command(
-            message="!ON",
-            validators=(
-                CommandValidator(
-                    pattern=r"signal.*(on)", signal=lambda b: b.lower() == "on"
-                ),
-                CommandValidator(
-                    pattern=r"\d+#(.+)", signal=lambda b: b.lower() == "on"
-                ),
-            ),
-            serial_communication=serial,
-        )
-
-        self.signal_off: Command = Command(
-            message="!OFF",
-            estimated_response_time=0.4,
-            validators=(
-                CommandValidator(
-                    pattern=r"signal.*(off)", signal=lambda b: not b.lower() == "off"
-                ),
-                CommandValidator(
-                    pattern=r"\d+#(.+)", signal=lambda b: not b.lower() == "off"
-                ),
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_sens_factorised",
+        message="?sens",
+        estimated_response_time=0.35,
+        validators=(
+            CommandValidator(
+                pattern=r"([\d]+)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)",
+                frequency=int,
+                urms=milli_to_base_unit,
+                irms=milli_to_base_unit,
+                phase=micro_to_base_unit,
             ),
-            serial_communication=serial,
-        )
-
-        self.signal_auto: Command = Command(
-            message="!AUTO",
-            estimated_response_time=0.5,
-            validators=CommandValidator(pattern=r".*(auto).*", protocol=str),
-            serial_communication=serial,
-        )
-
-        self.set_serial_mode: Command = Command(
-            message="!SERIAL",
-            validators=CommandValidator(
-                pattern=r".*mode.*(serial).*", communication_mode=str
+            CommandValidator(
+                pattern=r".*(error).*", literal="error",
+                signal=lambda error: False,
+                frequency=lambda error: 0,
+                urms=lambda error: 0,
+                irms=lambda error: 0,
+                phase=lambda error: 0,
             ),
-            serial_communication=serial,
-        )
-
-        self.set_analog_mode: Command = Command(
-            message="!ANALOG",
-            validators=CommandValidator(
-                pattern=r".*mode.*(analog).*", communication_mode=str
-            ),
-            serial_communication=serial,
-        )
-
-        self.set_khz_mode: Command = Command(
-            message="!KHZ",
-            validators=CommandValidator(pattern=r".*(khz).*", relay_mode=str),
-            serial_communication=serial,
-        )
-
-        self.set_mhz_mode: Command = Command(
-            message="!MHZ",
-            validators=CommandValidator(pattern=r".*(mhz).*", relay_mode=str),
-            serial_communication=serial,
-        )
-
-        self.set_atf1: Command = Command(
-            message="!atf1=",
-            validators=CommandValidator(
-                pattern=r".*freq[quency]*.*1.*=.*([\d]+)", atf1=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_sens_fullscale_values",
+        message="?sens",
+        estimated_response_time=0.35,
+        validators=(
+            CommandValidator(
+                pattern=r"([\d]+)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)(?:[\s]+)([-]?[\d]+[.]?[\d]?)",
+                frequency=int,
+                urms=fullscale_urms,
+                irms=fullscale_irms,
+                phase=fullscale_phase,
             ),
-            serial_communication=serial,
-        )
-
-        self.get_atf1: Command = Command(
-            message="?atf1",
-            expects_long_answer=True,
-            validators=CommandValidator(
-                pattern=r"([\d]+)\n([-]?[\d]+[\.]?[\d]*)", atf1=int, atk1=float
+            CommandValidator(
+                pattern=r".*(error).*", literal="error",
+                signal=lambda error: False,
+                frequency=lambda error: 0,
+                urms=lambda error: 0,
+                irms=lambda error: 0,
+                phase=lambda error: 0,
             ),
-            serial_communication=serial,
-        )
-
-        self.set_atk1: Command = Command(
-            message="!atk1=",
-            validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", atk1=float),
-            serial_communication=serial,
-        )
-
-        self.set_atf2: Command = Command(
-            message="!atf2=",
-            validators=CommandValidator(
-                pattern=r".*freq[quency]*.*2.*=.*([\d]+)", atf2=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="signal_on",
+        message="!ON",
+        validators=(
+            CommandValidator(
+                pattern=r"signal.*(on)", literal="signal", signal=lambda b: b.lower() == "on"
             ),
-            serial_communication=serial,
-        )
-
-        self.get_atf2: Command = Command(
-            message="?atf2",
-            expects_long_answer=True,
-            validators=CommandValidator(
-                pattern=r"([\d]+)\n([-]?[\d]+[\.]?[\d]*)", atf2=int, atk2=float
+            CommandValidator(
+                pattern=r"\d+#(.+)", literal="#", signal=lambda b: b.lower() == "on"
             ),
-            serial_communication=serial,
-        )
-
-        self.set_atk2: Command = Command(
-            message="!atk2=",
-            validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", atk2=float),
-            serial_communication=serial,
-        )
-
-        self.set_atf3: Command = Command(
-            message="!atf3=",
-            validators=CommandValidator(
-                pattern=r".*freq[quency]*.*3.*=.*([\d]+)", atf3=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="signal_off",
+        message="!OFF",
+        estimated_response_time=0.4,
+        validators=(
+            CommandValidator(
+                pattern=r"signal.*(off)", literal="signal", signal=lambda b: not b.lower() == "off"
             ),
-            serial_communication=serial,
-        )
-
-        self.get_atf3: Command = Command(
-            message="?atf3",
-            expects_long_answer=True,
-            validators=CommandValidator(
-                pattern=r"([\d]+)\n([-]?[\d]+[\.]?[\d]*)", atf3=int, atk3=float
+            CommandValidator(
+                pattern=r"\d+#(.+)", literal="#", signal=lambda b: not b.lower() == "off"
             ),
-            serial_communication=serial,
-        )
-
-        self.set_atk3: Command = Command(
-            message="!atk3=",
-            validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", atk3=float),
-            serial_communication=serial,
-        )
-
-        self.set_att1: Command = Command(
-            message="!att1=",
-            validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", att1=float),
-            serial_communication=serial,
-        )
-
-        self.get_att1: Command = Command(
-            message="?att1",
-            validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", att1=float),
-            serial_communication=serial,
-        )
-
-class CommandSet:
-    def __init__(self, serial: Communicator):
-        # TODO: Ask about ?error, how do we validate errors, if there is not a known number of errors
-        type_validator: CommandValidator = CommandValidator(
-            pattern=r"sonic(catch|wipe|descale)", device_type=str
-        )
-        firmware_version_validator: CommandValidator = CommandValidator(
-            pattern=r".*([\d]\.[\d]\.[\d]).*", firmware_version=str
-        )
-        update_date_validator: CommandValidator = CommandValidator(
-            pattern=r".*(\d{2}.\d{2}.\d{4}).*",
-            date=lambda date: (datetime.datetime.strptime(date, "%d.%m.%Y").date()), 
-        )
-        protocol_version_validator: CommandValidator = CommandValidator(
-            pattern=r".*([\d]\.[\d]\.[\d]).*", protocol_version=str
-        )
-        pzt_validator: CommandValidator = CommandValidator(
-            pattern=r"(.*)[#](\d+)", id=str, frequency=int
-        )
-        frequency_validator: CommandValidator = CommandValidator(
-            pattern=r"(\d+)\s*Hz", frequency=int
-        )
-        gain_validator: CommandValidator = CommandValidator(
-            pattern=r"(\d+)\s*%", gain=int
-        )
-        temp_validator: CommandValidator = CommandValidator(
-            pattern=r"(\d+)\s*°C", temp=float
-        )
-
-        # TODO: What should be the units in soniccontrol?
-        uipt_validator: CommandValidator = CommandValidator(
-            pattern=r"(\d+)\s*uV[#](\d+)\s*uA[#](\d+)\s*mDeg[#](\d+)\s*mDegC",
+        ),
+    ),
+
+    CommandDefinition(
+        name="signal_auto",
+        message="!AUTO",
+        estimated_response_time=0.5,
+        validators=CommandValidator(pattern=r".*(auto).*", literal="auto", protocol=str),
+    ),
+
+    CommandDefinition(
+        name="set_serial_mode",
+        message="!SERIAL",
+        validators=CommandValidator(
+            pattern=r".*mode.*(serial).*", literal="mode", communication_mode=str
+        ),
+    ),
+
+    CommandDefinition(
+        name="set_analog_mode",
+        message="!ANALOG",
+        validators=CommandValidator(
+            pattern=r".*mode.*(analog).*", literal="mode", communication_mode=str
+        ),
+    ),
+
+    CommandDefinition(
+        name="set_khz_mode",
+        message="!KHZ",
+        validators=CommandValidator(pattern=r".*(khz).*", literal="khz", relay_mode=str),
+    ),
+
+    CommandDefinition(
+        name="set_mhz_mode",
+        message="!MHZ",
+        validators=CommandValidator(pattern=r".*(mhz).*", literal="mhz", relay_mode=str),
+    ),
+
+    CommandDefinition(
+        name="set_atf1",
+        message="!atf1=",
+        validators=CommandValidator(
+            pattern=r".*freq[quency]*.*1.*=.*([\d]+)", literal="freq", atf1=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_atf1",
+        message="?atf1",
+        expects_long_answer=True,
+        validators=CommandValidator(
+            pattern=r"([\d]+)\n([-]?[\d]+[\.]?[\d]*)", atf1=int, atk1=float
+        ),
+    ),
+
+    CommandDefinition(
+        name="set_atk1",
+        message="!atk1=",
+        validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", atk1=float),
+    ),
+
+    CommandDefinition(
+        name="set_atf2",
+        message="!atf2=",
+        validators=CommandValidator(
+            pattern=r".*freq[quency]*.*2.*=.*([\d]+)", literal="freq", atf2=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_atf2",
+        message="?atf2",
+        expects_long_answer=True,
+        validators=CommandValidator(
+            pattern=r"([\d]+)\n([-]?[\d]+[\.]?[\d]*)", atf2=int, atk2=float
+        ),
+    ),
+
+    CommandDefinition(
+        name="set_atk2",
+        message="!atk2=",
+        validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", atk2=float),
+    ),
+
+    CommandDefinition(
+        name="set_atf3",
+        message="!atf3=",
+        validators=CommandValidator(
+            pattern=r".*freq[quency]*.*3.*=.*([\d]+)", literal="freq", atf3=int
+        ),
+    ),
+
+    CommandDefinition(
+        name="get_atf3",
+        message="?atf3",
+        expects_long_answer=True,
+        validators=CommandValidator(
+            pattern=r"([\d]+)\n([-]?[\d]+[\.]?[\d]*)", atf3=int, atk3=float
+        ),
+    ),
+
+    CommandDefinition(
+        name="set_atk3",
+        message="!atk3=",
+        validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", atk3=float),
+    ),
+
+    CommandDefinition(
+        name="set_att1",
+        message="!att1=",
+        validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", att1=float),
+    ),
+
+    CommandDefinition(
+        name="get_att1",
+        message="?att1",
+        validators=CommandValidator(pattern=r"([-]?[\d]*[\.]?[\d]*)", att1=float),
+    ),
+)
+
+
+# TODO: Ask about ?error, how do we validate errors, if there is not a known number of errors
+type_validator: CommandValidator = CommandValidator(
+    pattern=r"sonic(catch|wipe|descale)", literal="sonic", device_type=str
+)
+firmware_version_validator: CommandValidator = CommandValidator(
+    pattern=r".*([\d]\.[\d]\.[\d]).*", firmware_version=str
+)
+update_date_validator: CommandValidator = CommandValidator(
+    pattern=r".*(\d{2}.\d{2}.\d{4}).*",
+    date=lambda date: (datetime.datetime.strptime(date, "%d.%m.%Y").date()), 
+)
+protocol_version_validator: CommandValidator = CommandValidator(
+    pattern=r".*([\d]\.[\d]\.[\d]).*", protocol_version=str
+)
+pzt_validator: CommandValidator = CommandValidator(
+    pattern=r"(.*)[#](\d+)", literal="#", id=str, frequency=int
+)
+frequency_validator: CommandValidator = CommandValidator(
+    pattern=r"(\d+)\s*Hz", literal="hz", frequency=int
+)
+gain_validator: CommandValidator = CommandValidator(
+    pattern=r"(\d+)\s*%", literal="%", gain=int
+)
+temp_validator: CommandValidator = CommandValidator(
+    pattern=r"(\d+)\s*°C", literal="°c", temp=float
+)
+
+# TODO: What should be the units in soniccontrol?
+uipt_validator: CommandValidator = CommandValidator(
+    pattern=r"(\d+)\s*uV[#](\d+)\s*uA[#](\d+)\s*mDeg[#](\d+)\s*mDegC", literal="mdegc",
+    urms=int,
+    irms=int,
+    phase=int,
+    temperature=int,
+)
+adc_validator: CommandValidator = CommandValidator(
+    pattern=r"(\d+)\s*uV", literal="uv", adc_voltage=int
+)
+
+# TODO: Ask about the diffirence between !EXTERN and !RELAY
+control_mode_validator: CommandValidator = CommandValidator(
+    pattern=r"(\w+)\s*mode", literal="mode", control_mode=str
+)
+relay_mode_validator: CommandValidator = CommandValidator(
+    pattern=r"(\w+)\s*mode", literal="mode", relay_mode=str
+)
+
+# ATF validators
+atf1_validator: CommandValidator = CommandValidator(
+    pattern=r"atf1=(\d+)\s*Hz", literal="atf1=", atf1=int
+)
+atf2_validator: CommandValidator = CommandValidator(
+    pattern=r"atf2=(\d+)\s*Hz", literal="atf2=", atf2=int
+)
+atf3_validator: CommandValidator = CommandValidator(
+    pattern=r"atf3=(\d+)\s*Hz", literal="atf3=", atf3=int
+)
+atf4_validator: CommandValidator = CommandValidator(
+    pattern=r"atf4=(\d+)\s*Hz", literal="atf4=", atf4=int
+)
+
+# ATK validators
+atk1_validator: CommandValidator = CommandValidator(
+    pattern=r"atk1=(\d+\.\d+)", literal="atk1=", atk1=float
+)
+atk2_validator: CommandValidator = CommandValidator(
+    pattern=r"atk2=(\d+\.\d+)", literal="atk2=", atk2=float
+)
+atk3_validator: CommandValidator = CommandValidator(
+    pattern=r"atk3=(\d+\.\d+)", literal="atk3=", atk3=float
+)
+atk4_validator: CommandValidator = CommandValidator(
+    pattern=r"atk4=(\d+\.\d+)", literal="atk4=", atk4=float
+)
+
+# ATON validators
+aton1_validator: CommandValidator = CommandValidator(
+    pattern=r"aton1=(\d+)\s*ms", literal="aton1=", aton1=int
+)
+aton2_validator: CommandValidator = CommandValidator(
+    pattern=r"aton2=(\d+)\s*ms", literal="aton2=", aton2=int
+)
+aton3_validator: CommandValidator = CommandValidator(
+    pattern=r"aton3=(\d+)\s*ms", literal="aton3=", aton3=int
+)
+aton4_validator: CommandValidator = CommandValidator(
+    pattern=r"aton4=(\d+)\s*ms", literal="aton4=", aton4=int
+)
+
+# ATT validators
+att1_validator: CommandValidator = CommandValidator(
+    pattern=r"att1=(\d+\.\d+)\s*°C", literal="att1=", att1=float
+)
+att2_validator: CommandValidator = CommandValidator(
+    pattern=r"att2=(\d+\.\d+)\s*°C", literal="att2=", att2=float
+)
+att3_validator: CommandValidator = CommandValidator(
+    pattern=r"att3=(\d+\.\d+)\s*°C", literal="att3=", att3=float
+)
+att4_validator: CommandValidator = CommandValidator(
+    pattern=r"att4=(\d+\.\d+)\s*°C", literal="att4=", att4=float
+)
+
+signal_off_validator: CommandValidator = CommandValidator(
+    pattern=r".*(off).*", literal="off", signal=lambda b: not b.lower() == "off"
+)
+signal_on_validator: CommandValidator = CommandValidator(
+    pattern=r".*(on).*", literal="on", signal=lambda b: b.lower() == "on"
+)
+
+ms_value_validator: CommandValidator = CommandValidator(
+    pattern=r"(\d+)\s*ms", literal="ms", time_value=int
+)
+float_value_validator: CommandValidator = CommandValidator(
+    pattern=r"(\d+\.\d+)", value=float
+)
+
+rInt = r"(\d+)"
+rFloat = r"(\d+\.\d+)"
+rAlpha = r"([a-zA-Z]+)"
+
+
+COMMAND_DEFINITIONS: Tuple[CommandDefinition, ...] = (
+    CommandDefinition(
+        name="set_frequency",
+        message="!freq=",
+        validators=frequency_validator,
+    ),
+    CommandDefinition(
+        name="set_gain",
+        message="!gain=",
+        validators=gain_validator,
+    ),
+    CommandDefinition(
+        name="set_switching_frequency",
+        message="!swf=",
+        validators=frequency_validator,
+    ),
+
+    # TODO: implement this command for MVP AMP, if needed
+    # CommandDefinition(
+    #     name="get_overview",
+    #     message="?",
+    #     estimated_response_time=0.5,
+    #     expects_long_answer=True,
+    #     validators=(
+    #         CommandValidator(pattern=r".*(khz|mhz).*", relay_mode=str),
+    #         CommandValidator(
+    #             pattern=r".*freq[uency]*\s*=?\s*([\d]+).*", frequency=int
+    #         ),
+    #         CommandValidator(pattern=r".*g ain\s*=?\s*([\d]+).*", gain=int),
+    #         CommandValidator(
+    #             pattern=r".*signal.*(on|off).*",
+    #             signal=lambda b: bool(b.lower() == "on"),
+    #         ),
+    #     ),
+    # ),
+
+    # TODO: Is the type command in the set of MVP AMP commands?
+    # CommandDefinition(
+    #     name="get_type",
+    #     message="?type",
+    #     estimated_response_time=0.5,
+    #     validators=type_validator,
+    # ),
+
+    CommandDefinition(
+        name="get_info",
+        message="?info",
+        estimated_response_time=2.5,
+        expects_long_answer=True,
+        validators=(
+            type_validator,
+            firmware_version_validator,
+            # TODO: Here should be a HARDWARE ID validator
+            update_date_validator,
+        ),
+    ),
+
+    # TODO: maybe refactor CommandValidator to store multiple values
+    CommandDefinition(
+        name="get_command_list",
+        message="?list_commands",
+        estimated_response_time=0.5,
+        expects_long_answer=True,
+        validators=CommandValidator(pattern=r"(.+)(#(.+))+", literal="#"),
+    ),
+
+    # TODO: Ask if there are really 2 procedures sending like in the excel sheet
+    CommandDefinition(
+        name="get_status",
+        message="-",
+        estimated_response_time=0.35,
+        validators=CommandValidator(
+            pattern=f"{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rAlpha}", literal="#",
+            error=int,
+            frequency=int,
+            gain=int,
+            procedure=int,
+            temperature=millikelvin_to_celsius,
             urms=int,
             irms=int,
             phase=int,
-            temperature=int,
-        )
-        adc_validator: CommandValidator = CommandValidator(
-            pattern=r"(\d+)\s*uV", adc_voltage=int
-        )
-
-        # TODO: Ask about the diffirence between !EXTERN and !RELAY
-        control_mode_validator: CommandValidator = CommandValidator(
-            pattern=r"(\w+)\s*mode", control_mode=str
-        )
-        relay_mode_validator: CommandValidator = CommandValidator(
-            pattern=r"(\w+)\s*mode", relay_mode=str
-        )
-
-        # ATF validators
-        atf1_validator: CommandValidator = CommandValidator(
-            pattern=r"atf1=(\d+)\s*Hz", atf1=int
-        )
-        atf2_validator: CommandValidator = CommandValidator(
-            pattern=r"atf2=(\d+)\s*Hz", atf2=int
-        )
-        atf3_validator: CommandValidator = CommandValidator(
-            pattern=r"atf3=(\d+)\s*Hz", atf3=int
-        )
-        atf4_validator: CommandValidator = CommandValidator(
-            pattern=r"atf4=(\d+)\s*Hz", atf4=int
-        )
-
-        # ATK validators
-        atk1_validator: CommandValidator = CommandValidator(
-            pattern=r"atk1=(\d+\.\d+)", atk1=float
-        )
-        atk2_validator: CommandValidator = CommandValidator(
-            pattern=r"atk2=(\d+\.\d+)", atk2=float
-        )
-        atk3_validator: CommandValidator = CommandValidator(
-            pattern=r"atk3=(\d+\.\d+)", atk3=float
-        )
-        atk4_validator: CommandValidator = CommandValidator(
-            pattern=r"atk4=(\d+\.\d+)", atk4=float
-        )
-
-        # ATON validators
-        aton1_validator: CommandValidator = CommandValidator(
-            pattern=r"aton1=(\d+)\s*ms", aton1=int
-        )
-        aton2_validator: CommandValidator = CommandValidator(
-            pattern=r"aton2=(\d+)\s*ms", aton2=int
-        )
-        aton3_validator: CommandValidator = CommandValidator(
-            pattern=r"aton3=(\d+)\s*ms", aton3=int
-        )
-        aton4_validator: CommandValidator = CommandValidator(
-            pattern=r"aton4=(\d+)\s*ms", aton4=int
-        )
-
-        # ATT validators
-        att1_validator: CommandValidator = CommandValidator(
-            pattern=r"att1=(\d+\.\d+)\s*°C", att1=float
-        )
-        att2_validator: CommandValidator = CommandValidator(
-            pattern=r"att2=(\d+\.\d+)\s*°C", att2=float
-        )
-        att3_validator: CommandValidator = CommandValidator(
-            pattern=r"att3=(\d+\.\d+)\s*°C", att3=float
-        )
-        att4_validator: CommandValidator = CommandValidator(
-            pattern=r"att4=(\d+\.\d+)\s*°C", att4=float
-        )
-
-        signal_off_validator: CommandValidator = CommandValidator(
-            pattern=r".*(off).*", signal=lambda b: not b.lower() == "off"
-        )
-        signal_on_validator: CommandValidator = CommandValidator(
-            pattern=r".*(on).*", signal=lambda b: b.lower() == "on"
-        )
-
-        ms_value_validator: CommandValidator = CommandValidator(
-            pattern=r"(\d+)\s*ms", time_value=int
-        )
-        float_value_validator: CommandValidator = CommandValidator(
-            pattern=r"(\d+\.\d+)", value=float
-        )
-
-        self.set_frequency: Command = Command(
-            message="!freq=",
-            validators=frequency_validator,
-            serial_communication=serial,
-        )
-        self.set_gain: Command = Command(
-            message="!gain=",
-            validators=gain_validator,
-            serial_communication=serial,
-        )
-        self.set_switching_frequency: Command = Command(
-            message="!swf=",
-            validators=frequency_validator,
-            serial_communication=serial,
-        )
-
-        # TODO: implement this command for MVP AMP, if needed
-        # self.get_overview: Command = Command(
-        #     message="?",
-        #     estimated_response_time=0.5,
-        #     expects_long_answer=True,
-        #     validators=(
-        #         CommandValidator(pattern=r".*(khz|mhz).*", relay_mode=str),
-        #         CommandValidator(
-        #             pattern=r".*freq[uency]*\s*=?\s*([\d]+).*", frequency=int
-        #         ),
-        #         CommandValidator(pattern=r".*g ain\s*=?\s*([\d]+).*", gain=int),
-        #         CommandValidator(
-        #             pattern=r".*signal.*(on|off).*",
-        #             signal=lambda b: bool(b.lower() == "on"),
-        #         ),
-        #     ),
-        #     serial_communication=serial,
-        # )
-
-        # TODO: Is the type command in the set of MVP AMP commands?
-        # self.get_type: Command = Command(
-        #     message="?type",
-        #     estimated_response_time=0.5,
-        #     validators=type_validator,
-        #     serial_communication=serial,
-        # )
-
-        self.get_info: Command = Command(
-            message="?info",
-            estimated_response_time=2.5,
-            expects_long_answer=True,
-            validators=(
-                type_validator,
-                firmware_version_validator,
-                # TODO: Here should be a HARDWARE ID validator
-                update_date_validator,
-            ),
-            serial_communication=serial,
-        )
-
-        # TODO: maybe refactor CommandValidator to store multiple values
-        self.get_command_list: Command = Command(
-            message="?list_commands",
-            estimated_response_time=0.5,
-            expects_long_answer=True,
-            validators=CommandValidator(pattern=r"(.+)(#(.+))+"),
-            serial_communication=serial,
-        )
-
-        # TODO: Ask if there are really 2 procedures sending like in the excel sheet
-        rInt = r"(\d+)"
-        rFloat = r"(\d+\.\d+)"
-        rAlpha = r"([a-zA-Z]+)"
-        self.get_status: Command = Command(
-            message="-",
-            estimated_response_time=0.35,
-            validators=CommandValidator(
-                pattern=f"{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rInt}#{rAlpha}",
-                error=int,
-                frequency=int,
-                gain=int,
-                procedure=int,
-                temperature=attrs.converters.pipe(
-                    int,
-                    lambda temp: (temp / 1000.0) - 272.15,   # Convert miliKevling to Celsius by dividing by 1000 and subtracting Kevling constant
-                ),
-                urms=int,
-                irms=int,
-                phase=int,
-                ts_flag=int,
-                signal=attrs.converters.pipe(
-                    str,
-                    lambda signal: str.lower(signal),
-                    attrs.converters.to_bool,
-                ),
-            ),
-            serial_communication=serial,
-        )
-
-        self.signal_on: Command = Command(
-            message="!ON",
-            validators=signal_on_validator,
-            serial_communication=serial,
-        )
-
-        self.ramp: Command = Command( # TODO Quick fix, for scripting using remote ramp
-            message="!ramp",
-            serial_communication=serial,
-        )
-
-        self.signal_off: Command = Command(
-            message="!OFF",
-            estimated_response_time=0.4,
-            validators=signal_off_validator,
-            serial_communication=serial,
-        )
-
-        # TODO: Implement this command using info from david
-        # self.signal_auto: Command = Command(
-        #     message="!AUTO",
-        #     estimated_response_time=0.5,
-        #     validators=CommandValidator(pattern=r".*(auto).*", protocol=str),
-        #     serial_communication=serial,
-        # )
-
-        self.get_frequency: Command = Command(
-            message="?freq",
-            validators=frequency_validator,
-            serial_communication=serial,
-        )
-        self.get_gain: Command = Command(
-            message="?gain",
-            validators=gain_validator,
-            serial_communication=serial,
-        )
-        self.get_uipt: Command = Command(
-            message="?uipt",
-            validators=uipt_validator,
-            serial_communication=serial,
-        )
-        self.get_pzt: Command = Command(
-            message="?pzt",
-            validators=pzt_validator,
-            serial_communication=serial,
-        )
-
-        # ?-ATF,ATK,ATT,ATON Commands
-        self.get_atf_values: Command = Command(
-            message="?atf",
-            estimated_response_time=0.5,
-            validators=(
-                atf1_validator,
-                atf2_validator,
-                atf3_validator,
-                atf4_validator,
-            ),
-            serial_communication=serial,
-        )
-        self.get_atk_values: Command = Command(
-            message="?atk",
-            estimated_response_time=0.5,
-            validators=(
-                atk1_validator,
-                atk2_validator,
-                atk3_validator,
-                atk4_validator,
-            ),
-            serial_communication=serial,
-        )
-        self.get_att_values: Command = Command(
-            message="?att",
-            estimated_response_time=0.5,
-            validators=(
-                att1_validator,
-                att2_validator,
-                att3_validator,
-                att4_validator,
-            ),
-            serial_communication=serial,
-        )
-        self.get_aton_values: Command = Command(
-            message="?aton",
-            estimated_response_time=0.5,
-            validators=(
-                aton1_validator,
-                aton2_validator,
-                aton3_validator,
-                aton4_validator,
-            ),
-            serial_communication=serial,
-        )
-
-        # ATF Commands
-        self.set_atf1: Command = Command(
-            message="!atf1=",
-            validators=frequency_validator,
-            serial_communication=serial,
-        )
-        self.set_atf2: Command = Command(
-            message="!atf2=",
-            validators=frequency_validator,
-            serial_communication=serial,
-        )
-        self.set_atf3: Command = Command(
-            message="!atf3=",
-            validators=frequency_validator,
-            serial_communication=serial,
-        )
-        self.set_atf4: Command = Command(
-            message="!atf4=",
-            validators=frequency_validator,
-            serial_communication=serial,
-        )
-
-        # ATON Commands
-        self.set_aton1: Command = Command(
-            message="!aton1=",
-            validators=ms_value_validator,
-            serial_communication=serial,
-        )
-        self.set_aton2: Command = Command(
-            message="!aton2=",
-            validators=ms_value_validator,
-            serial_communication=serial,
-        )
-        self.set_aton3: Command = Command(
-            message="!aton3=",
-            validators=ms_value_validator,
-            serial_communication=serial,
-        )
-        self.set_aton4: Command = Command(
-            message="!aton4=",
-            validators=ms_value_validator,
-            serial_communication=serial,
-        )
-
-        # ATK Commands
-        self.set_atk1: Command = Command(
-            message="!atk1=",
-            validators=float_value_validator,
-            serial_communication=serial,
-        )
-        self.set_atk2: Command = Command(
-            message="!atk2=",
-            validators=float_value_validator,
-            serial_communication=serial,
-        )
-        self.set_atk3: Command = Command(
-            message="!atk3=",
-            validators=float_value_validator,
-            serial_communication=serial,
-        )
-        self.set_atk4: Command = Command(
-            message="!atk4=",
-            validators=float_value_validator,
-            serial_communication=serial,
-        )
-
-        # ATT Commands
-        self.set_att1: Command = Command(
-            message="!att1=",
-            validators=float_value_validator,
-            serial_communication=serial,
-        )
-        self.set_att2: Command = Command(
-            message="!att2=",
-            validators=float_value_validator,
-            serial_communication=serial,
-        )
-        self.set_att3: Command = Command(
-            message="!att3=",
-            validators=float_value_validator,
-            serial_communication=serial,
-        )
-        self.set_att4: Command = Command(
-            message="!att4=",
-            validators=float_value_validator,
-            serial_communication=serial,
-        )
-
-        # TODO add tune scan wipe with empty validators
-
-        self.tune: Command = Command(
-            message="!tune",
-            serial_communication=serial,
-        )
-
-        self.wipe: Command = Command(
-            message="!wipe",
-            serial_communication=serial,
-        )
-
-        self.scan: Command = Command(
-            message="!scan",
-            serial_communication=serial,
-        )
-
-        self.auto: Command = Command(
-            message="!auto",
-            serial_communication=serial,
-        )
+            ts_flag=int,
+            signal=to_bool,
+        ),
+    ),
+
+    # Only devices that list this command in ?list_commands can push their status
+    CommandDefinition(
+        name="set_status_stream",
+        message="!stream=",
+        validators=ms_value_validator,
+    ),
+
+    CommandDefinition(
+        name="signal_on",
+        message="!ON",
+        validators=signal_on_validator,
+    ),
+
+    CommandDefinition( # TODO Quick fix, for scripting using remote ramp
+        name="ramp",
+        message="!ramp",
+    ),
+
+    CommandDefinition(
+        name="signal_off",
+        message="!OFF",
+        estimated_response_time=0.4,
+        validators=signal_off_validator,
+    ),
+
+    # TODO: Implement this command using info from david
+    # CommandDefinition(
+    #     name="signal_auto",
+    #     message="!AUTO",
+    #     estimated_response_time=0.5,
+    #     validators=CommandValidator(pattern=r".*(auto).*", protocol=str),
+    # ),
+
+    CommandDefinition(
+        name="get_frequency",
+        message="?freq",
+        validators=frequency_validator,
+    ),
+    CommandDefinition(
+        name="get_gain",
+        message="?gain",
+        validators=gain_validator,
+    ),
+    CommandDefinition(
+        name="get_uipt",
+        message="?uipt",
+        validators=uipt_validator,
+    ),
+    CommandDefinition(
+        name="get_pzt",
+        message="?pzt",
+        validators=pzt_validator,
+    ),
+
+    # ?-ATF,ATK,ATT,ATON Commands
+    CommandDefinition(
+        name="get_atf_values",
+        message="?atf",
+        estimated_response_time=0.5,
+        validators=(
+            atf1_validator,
+            atf2_validator,
+            atf3_validator,
+            atf4_validator,
+        ),
+    ),
+    CommandDefinition(
+        name="get_atk_values",
+        message="?atk",
+        estimated_response_time=0.5,
+        validators=(
+            atk1_validator,
+            atk2_validator,
+            atk3_validator,
+            atk4_validator,
+        ),
+    ),
+    CommandDefinition(
+        name="get_att_values",
+        message="?att",
+        estimated_response_time=0.5,
+        validators=(
+            att1_validator,
+            att2_validator,
+            att3_validator,
+            att4_validator,
+        ),
+    ),
+    CommandDefinition(
+        name="get_aton_values",
+        message="?aton",
+        estimated_response_time=0.5,
+        validators=(
+            aton1_validator,
+            aton2_validator,
+            aton3_validator,
+            aton4_validator,
+        ),
+    ),
+
+    # ATF Commands
+    CommandDefinition(
+        name="set_atf1",
+        message="!atf1=",
+        validators=frequency_validator,
+    ),
+    CommandDefinition(
+        name="set_atf2",
+        message="!atf2=",
+        validators=frequency_validator,
+    ),
+    CommandDefinition(
+        name="set_atf3",
+        message="!atf3=",
+        validators=frequency_validator,
+    ),
+    CommandDefinition(
+        name="set_atf4",
+        message="!atf4=",
+        validators=frequency_validator,
+    ),
+
+    # ATON Commands
+    CommandDefinition(
+        name="set_aton1",
+        message="!aton1=",
+        validators=ms_value_validator,
+    ),
+    CommandDefinition(
+        name="set_aton2",
+        message="!aton2=",
+        validators=ms_value_validator,
+    ),
+    CommandDefinition(
+        name="set_aton3",
+        message="!aton3=",
+        validators=ms_value_validator,
+    ),
+    CommandDefinition(
+        name="set_aton4",
+        message="!aton4=",
+        validators=ms_value_validator,
+    ),
+
+    # ATK Commands
+    CommandDefinition(
+        name="set_atk1",
+        message="!atk1=",
+        validators=float_value_validator,
+    ),
+    CommandDefinition(
+        name="set_atk2",
+        message="!atk2=",
+        validators=float_value_validator,
+    ),
+    CommandDefinition(
+        name="set_atk3",
+        message="!atk3=",
+        validators=float_value_validator,
+    ),
+    CommandDefinition(
+        name="set_atk4",
+        message="!atk4=",
+        validators=float_value_validator,
+    ),
+
+    # ATT Commands
+    CommandDefinition(
+        name="set_att1",
+        message="!att1=",
+        validators=float_value_validator,
+    ),
+    CommandDefinition(
+        name="set_att2",
+        message="!att2=",
+        validators=float_value_validator,
+    ),
+    CommandDefinition(
+        name="set_att3",
+        message="!att3=",
+        validators=float_value_validator,
+    ),
+    CommandDefinition(
+        name="set_att4",
+        message="!att4=",
+        validators=float_value_validator,
+    ),
+
+    # TODO add tune scan wipe with empty validators
+
+    CommandDefinition(
+        name="tune",
+        message="!tune",
+    ),
+
+    CommandDefinition(
+        name="wipe",
+        message="!wipe",
+    ),
+
+    CommandDefinition(
+        name="scan",
+        message="!scan",
+    ),
+
+    CommandDefinition(
+        name="auto",
+        message="!auto",
+    ),
+)
+
+
+class BoundCommandSet:
+    """
+    Binds the command definitions of a protocol to one connection.
+    The commands are accessible as attributes named after their definitions.
+    Binding does not compile anything, the commands share the validators of their definitions.
+    """
+
+    definitions: ClassVar[Tuple[CommandDefinition, ...]] = ()
 
+    def __init__(self, serial: Communicator):
+        self._commands_by_message: Dict[str, Command] = {}
+        for definition in self.definitions:
+            command = definition.bind(serial)
+            setattr(self, definition.name, command)
+            # if several definitions share a message (?sens of the legacy protocol), the first one is indexed
+            self._commands_by_message.setdefault(definition.message, command)
+
+    def __iter__(self) -> Iterator[Command]:
+        return (getattr(self, definition.name) for definition in self.definitions)
+
+    def get_by_message(self, message: str) -> Optional[Command]:
+        return self._commands_by_message.get(message)
+
+
+class CommandSetLegacy(BoundCommandSet):
+    """
+    The commands of the legacy protocol.
+    """
+
+    definitions = LEGACY_COMMAND_DEFINITIONS
+
+    get_overview: Command
+    get_type: Command
+    get_info: Command
+    set_frequency: Command
+    set_gain: Command
+    set_switching_frequency: Command
+    get_status: Command
+    get_sens: Command
+    get_sens_factorised: Command
+    get_sens_fullscale_values: Command
+    signal_on: Command
+    signal_off: Command
+    signal_auto: Command
+    set_serial_mode: Command
+    set_analog_mode: Command
+    set_khz_mode: Command
+    set_mhz_mode: Command
+    set_atf1: Command
+    get_atf1: Command
+    set_atk1: Command
+    set_atf2: Command
+    get_atf2: Command
+    set_atk2: Command
+    set_atf3: Command
+    get_atf3: Command
+    set_atk3: Command
+    set_att1: Command
+    get_att1: Command
+
+
+class CommandSet(BoundCommandSet):
+    """
+    The commands of the sonic protocol v2.
+    """
+
+    definitions = COMMAND_DEFINITIONS
+
+    set_frequency: Command
+    set_gain: Command
+    set_switching_frequency: Command
+    get_info: Command
+    get_command_list: Command
+    get_status: Command
+    set_status_stream: Command
+    signal_on: Command
+    ramp: Command
+    signal_off: Command
+    get_frequency: Command
+    get_gain: Command
+    get_uipt: Command
+    get_pzt: Command
+    get_atf_values: Command
+    get_atk_values: Command
+    get_att_values: Command
+    get_aton_values: Command
+    set_atf1: Command
+    set_atf2: Command
+    set_atf3: Command
+    set_atf4: Command
+    set_aton1: Command
+    set_aton2: Command
+    set_aton3: Command
+    set_aton4: Command
+    set_atk1: Command
+    set_atk2: Command
+    set_atk3: Command
+    set_atk4: Command
+    set_att1: Command
+    set_att2: Command
+    set_att3: Command
+    set_att4: Command
+    tune: Command
+    wipe: Command
+    scan: Command
+    auto: Command
@@ -49,5 +49,12 @@ class Communicator(abc.ABC, EventManager):
     @abc.abstractmethod
     async def read_message(self) -> str: ...
 
+    async def read_status_package(self) -> str:
+        """
+        Waits for the next status package the device pushed.
+        Only devices that support the status stream push them, see SonicDevice.supports_status_stream.
+        """
+        raise Exception("The device cannot stream its status")
+
     @abc.abstractmethod
     async def change_baudrate(self) -> None: ...
\ No newline at end of file
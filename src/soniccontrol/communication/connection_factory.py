@@ -1,8 +1,10 @@
 import abc
 import asyncio
 from pathlib import Path
+import socket
 import attrs
-from typing import Tuple
+from attrs import validators
+from typing import Literal, Tuple
 
 from serial_asyncio import open_serial_connection
 
@@ -41,3 +43,36 @@ class SerialConnectionFactory(ConnectionFactory):
             url=self.url, baudrate=self.baudrate
         )
         return reader, writer
+
+
+@attrs.define()
+class TcpConnectionFactory(ConnectionFactory):
+    """
+    Connects to a device over a serial device server, so that devices on other lab benches can be controlled.
+
+    With the raw protocol the server forwards the bytes as they are (like ser2net in raw mode).
+    With rfc2217 pyserial negotiates the port settings with the server and sets the baudrate of the remote port.
+    pyserial disables Nagle's algorithm itself for rfc2217, so no_delay and keep_alive only apply to raw connections.
+    """
+    host: str = attrs.field(init=True)
+    port: int = attrs.field(init=True)
+    protocol: Literal["raw", "rfc2217"] = attrs.field(
+        default="raw", validator=validators.in_(["raw", "rfc2217"])
+    )
+    baudrate: int = attrs.field(default=9600)
+    no_delay: bool = attrs.field(default=True)
+    keep_alive: bool = attrs.field(default=True)
+
+    async def open_connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.protocol == "rfc2217":
+            reader, writer = await open_serial_connection(
+                url=f"rfc2217://{self.host}:{self.port}", baudrate=self.baudrate
+            )
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            sock = writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.no_delay))
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(self.keep_alive))
+
+        return reader, writer
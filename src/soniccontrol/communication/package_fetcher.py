@@ -13,6 +13,7 @@ class PackageFetcher:
         self._answers: Dict[int, str] = {}
         self._answer_received = asyncio.Event()
         self._messages = asyncio.Queue(maxsize=100)
+        self._status_packages = asyncio.Queue(maxsize=100)
         self._task = None
         self._protocol: SonicProtocol = protocol
         self._logger: logging.Logger = logging.getLogger(logger.name + "." + PackageFetcher.__name__)
@@ -60,7 +61,11 @@ class PackageFetcher:
                 self._logger.error("Exception occured while reading the package:\n%s", e)
                 return
 
-            if len(answer) > 0:
+            if len(answer) == 0:
+                continue
+            if package_id == SonicProtocol.STATUS_STREAM_PACKAGE_ID:
+                PackageFetcher._put_dropping_oldest(self._status_packages, answer)
+            else:
                 self._answers[package_id] = answer
                 self._answer_received.set()
 
@@ -85,11 +90,22 @@ class PackageFetcher:
         return message
     
     def _queue_message(self, message: str) -> None:
+        PackageFetcher._put_dropping_oldest(self._messages, message)
+
+    @staticmethod
+    def _put_dropping_oldest(queue: asyncio.Queue, item: str) -> None:
         try:
-            self._messages.put_nowait(message)
+            queue.put_nowait(item)
         except asyncio.QueueFull:
-            self._messages.get_nowait()
-            self._messages.put_nowait(message)
+            queue.get_nowait()
+            queue.put_nowait(item)
 
     async def pop_message(self) -> str:
         return await self._messages.get()
+
+    async def pop_status_package(self) -> str:
+        """
+        Waits for the next package the device pushed unsolicited with the reserved
+        status stream id. Those packages never show up in get_answer_of_package.
+        """
+        return await self._status_packages.get()
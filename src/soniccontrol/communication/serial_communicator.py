@@ -1,13 +1,13 @@
 import asyncio
 import logging
 import time
-from typing import Any, Dict, Final, Optional, List
+from typing import Any, Dict, Final, Optional, List, Union
 
 import attrs
 import serial
-from soniccontrol.communication.connection_factory import ConnectionFactory, SerialConnectionFactory
+from soniccontrol.communication.connection_factory import ConnectionFactory, SerialConnectionFactory, TcpConnectionFactory
 from soniccontrol.communication.package_fetcher import PackageFetcher
-from soniccontrol.command import Command, CommandValidator
+from soniccontrol.command import Command, CommandRequest, CommandValidator
 from soniccontrol.communication.communicator import Communicator
 from soniccontrol.communication.sonicprotocol import CommunicationProtocol, LegacySonicProtocol, SonicProtocol
 from soniccontrol.events import Event
@@ -18,10 +18,10 @@ class SerialCommunicator(Communicator):
     BAUDRATE = 9600
 
     _connection_opened: asyncio.Event = attrs.field(init=False, factory=asyncio.Event)
-    _command_queue: asyncio.Queue[Command] = attrs.field(
+    _command_queue: asyncio.Queue[Union[Command, CommandRequest]] = attrs.field(
         init=False, factory=asyncio.Queue, repr=False
     )
-    _answer_queue: asyncio.Queue[Command] = attrs.field(
+    _answer_queue: asyncio.Queue[Union[Command, CommandRequest]] = attrs.field(
         init=False, factory=asyncio.Queue, repr=False
     )
     _reader: Optional[asyncio.StreamReader] = attrs.field(
@@ -68,11 +68,13 @@ class SerialCommunicator(Communicator):
     async def open_communication(
         self, connection_factory: ConnectionFactory,
         baudrate = BAUDRATE,
-        loop = asyncio.get_event_loop()
+        loop: Optional[asyncio.AbstractEventLoop] = None
     ) -> None:
+        loop = loop if loop is not None else asyncio.get_running_loop()
         self._connection_factory = connection_factory
         self._logger.debug("try open communication")
-        if isinstance(connection_factory, SerialConnectionFactory):
+        # over rfc2217 the baudrate is set on the remote port, raw tcp connections ignore it
+        if isinstance(connection_factory, (SerialConnectionFactory, TcpConnectionFactory)):
             connection_factory.baudrate = baudrate
 
         self._restart = False 
@@ -97,7 +99,7 @@ class SerialCommunicator(Communicator):
         message_counter: int = 0
         message_id_max_client: Final[int] = 2 ** 16 - 1 # 65535 is the max for uint16. so we cannot go higher than that.
 
-        async def send_and_get(command: Command) -> None:
+        async def send_and_get(command: Union[Command, CommandRequest]) -> None:
             assert (self._writer is not None)
 
             if command.message != "-":
@@ -105,6 +107,8 @@ class SerialCommunicator(Communicator):
 
             nonlocal message_counter
             message_counter = (message_counter + 1) % message_id_max_client
+            if message_counter == SonicProtocol.STATUS_STREAM_PACKAGE_ID:
+                message_counter += 1 # the id is reserved for the status packages the device pushes
 
             message_str = self._protocol.parse_request(
                 command.full_message, message_counter
@@ -150,15 +154,14 @@ class SerialCommunicator(Communicator):
             if command.message != "-":
                 self._logger.info("Receive Answer: %s", answer)
 
-            index = answer.find('#')  #Quick fix for removing command code from answer
-            answer = answer[index + 1:] if index != -1 else answer 
+            answer = SerialCommunicator._remove_command_code(answer)
 
             command.answer.receive_answer(answer)
             self._answer_queue.put_nowait(command)
 
         try:
             while self._writer is not None and self._package_fetcher.is_running:
-                command: Command = await self._command_queue.get()
+                command: Union[Command, CommandRequest] = await self._command_queue.get()
                 await send_and_get(command)
         except asyncio.CancelledError:
             self._logger.warn("The serial communicator was stopped")
@@ -167,7 +170,7 @@ class SerialCommunicator(Communicator):
         finally:
             await self._close_communication()
 
-    async def send_and_wait_for_answer(self, command: Command) -> None:
+    async def send_and_wait_for_answer(self, command: Union[Command, CommandRequest]) -> None:
         if not self._connection_opened.is_set():
             raise ConnectionError("Communicator is not connected")
 
@@ -187,9 +190,18 @@ class SerialCommunicator(Communicator):
         else:
             raise ConnectionError("The connection was closed")
     
+    @staticmethod
+    def _remove_command_code(answer: str) -> str:
+        index = answer.find('#')  #Quick fix for removing command code from answer
+        return answer[index + 1:] if index != -1 else answer
+
     async def read_message(self) -> str:
         return await self._package_fetcher.pop_message()
 
+    async def read_status_package(self) -> str:
+        package = await self._package_fetcher.pop_status_package()
+        return SerialCommunicator._remove_command_code(package)
+
     async def close_communication(self, restart : bool = False) -> None:
         self._restart = restart
         if self._task is not None:
@@ -304,8 +316,9 @@ class LegacySerialCommunicator(Communicator):
             self._init_command.validate()
             self._logger.info(self._init_command.answer)
 
-        if isinstance(connection_factory, SerialConnectionFactory):
+        if isinstance(connection_factory, (SerialConnectionFactory, TcpConnectionFactory)):
             connection_factory.baudrate = baudrate
+        if isinstance(connection_factory, SerialConnectionFactory):
             self._url = connection_factory.url
 
 
@@ -317,7 +330,7 @@ class LegacySerialCommunicator(Communicator):
         self._task = asyncio.create_task(self._worker())
 
     async def _worker(self) -> None:
-        async def send_and_get(command: Command) -> None:
+        async def send_and_get(command: Union[Command, CommandRequest]) -> None:
             assert (self._writer is not None)
             if command.message != "-":
                 self._logger.info("Write command: %s", command.byte_message)
@@ -343,7 +356,7 @@ class LegacySerialCommunicator(Communicator):
             self._logger.warn("No connection available")
             return
         while self._writer is not None and not self._writer.is_closing():
-            command: Command = await self._command_queue.get()
+            command: Union[Command, CommandRequest] = await self._command_queue.get()
             try:
                 await send_and_get(command)
             except serial.SerialException:
@@ -355,7 +368,7 @@ class LegacySerialCommunicator(Communicator):
                 break
         await self._close_communication()
 
-    async def send_and_wait_for_answer(self, command: Command) -> None:
+    async def send_and_wait_for_answer(self, command: Union[Command, CommandRequest]) -> None:
         if not self.connection_opened.is_set():
             raise ConnectionError("Communicator is not connected")
 
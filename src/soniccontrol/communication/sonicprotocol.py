@@ -75,6 +75,8 @@ class DeviceLogLevel(Enum):
 
 class SonicProtocol(CommunicationProtocol):
     LOG_PREFIX = "LOG="
+    # Packages with this id are not answers to a request, but status packages the device pushes on its own
+    STATUS_STREAM_PACKAGE_ID = 0
 
     def __init__(self, logger: logging.Logger = logging.getLogger()):
         self._logger: logging.Logger = logging.getLogger(logger.name + "." + SonicProtocol.__name__)
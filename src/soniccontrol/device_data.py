@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import datetime
-from typing import Any, Callable, Dict, Literal, Optional, Tuple
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 
 import attrs
 from icecream import ic
@@ -22,6 +22,17 @@ def default_if_none(default: Any, type_: type = int) -> Callable[[Any], Any]:
     return converter
 
 
+@attrs.frozen
+class StatusChange:
+    """ The fields that changed in a single update of the status, with their new values """
+    version: int = attrs.field()
+    changes: Dict[str, Any] = attrs.field()
+    timestamp: datetime.datetime = attrs.field()
+
+
+StatusListener = Callable[[StatusChange], None]
+
+
 @attrs.define(slots=True)
 class Status:
     error: int = attrs.field(
@@ -126,6 +137,9 @@ class Status:
     _changed_data: Dict[str, Any] = attrs.field(init=False, factory=dict)
     _version: int = attrs.field(init=False, default=0)
     _remote_proc_finished_running: asyncio.Event = attrs.field(init=False, factory=asyncio.Event)
+    _change_waiters: List[asyncio.Future] = attrs.field(init=False, factory=list)
+    _subscribers: Dict[str, List[StatusListener]] = attrs.field(init=False, factory=dict, eq=False, repr=False)
+    _last_change: Optional[StatusChange] = attrs.field(init=False, default=None, eq=False, repr=False)
     
 
     @property
@@ -138,19 +152,32 @@ class Status:
 
     @property
     def version(self) -> int:
+        """ Is incremented by every update that changes the status """
         return self._version
     
     @property 
     def remote_proc_finished_running(self) -> asyncio.Event:
         return self._remote_proc_finished_running
+
+    @property
+    def last_change(self) -> Optional[StatusChange]:
+        """ The change of the last update that changed the status """
+        return self._last_change
+
+    def subscribe(self, field_name: str, listener: StatusListener) -> None:
+        """
+        Calls the listener with the StatusChange of every update that changes the given field.
+        A listener that is subscribed to several fields is called once per update.
+        """
+        if field_name not in _STATUS_FIELD_NAMES:
+            raise ValueError(f"Status has no field {field_name}")
+        self._subscribers.setdefault(field_name, []).append(listener)
+
+    def unsubscribe(self, field_name: str, listener: StatusListener) -> None:
+        self._subscribers[field_name].remove(listener)
     
     def get_dict(self) -> dict:
-        result = {}
-        for field in attrs.fields(Status):
-            if field.name in ["timestamp", "_changed", "_changed_data", "_remote_proc_finished_running"]: # skip not json serializable fields like datetime
-                continue
-            result[field.name] = getattr(self, field.name)
-        return result
+        return {name: getattr(self, name) for name in _STATUS_DICT_FIELDS}
 
     async def update(self, **kwargs) -> Status:
         self._changed.clear()
@@ -171,17 +198,74 @@ class Status:
                 except AttributeError:
                     continue
         if changed:
+            self._version += 1
+            self._last_change = StatusChange(
+                self._version,
+                {key: getattr(self, key) for key in self._changed_data if key != "timestamp"},
+                self.timestamp,
+            )
             #  check if the procedure was changed or finished
             if procedure != 0 and self.procedure != procedure:
-                self._remote_proc_finished_running.set()
-                await asyncio.sleep(0.1)
-                self._remote_proc_finished_running.clear()
-            
-            self._changed.set()
-            await asyncio.sleep(0.1)
-            self._changed.clear()
+                _pulse(self._remote_proc_finished_running)
+            _pulse(self._changed)
+            for waiter in self._change_waiters:
+                if not waiter.done():
+                    waiter.set_result(self._version)
+            self._change_waiters.clear()
+            self._notify_subscribers(self._last_change)
         return self
 
+    def _notify_subscribers(self, change: StatusChange) -> None:
+        if not self._subscribers:
+            return
+        listeners: Dict[StatusListener, None] = {}
+        for key in change.changes:
+            listeners.update(dict.fromkeys(self._subscribers.get(key, ())))
+        for listener in listeners:
+            listener(change)
+
+    async def wait_for_change(self, since_version: Optional[int] = None) -> int:
+        """
+        Waits until the status changes and returns the new version.
+
+        Args:
+            since_version (Optional[int]): If given, returns right away if the status changed after this version.
+                        Pass the version of the status that was last seen to not miss changes between two waits.
+
+        Returns:
+            int: The version of the status after the change.
+        """
+        if since_version is not None and since_version != self._version:
+            return self._version
+        waiter = asyncio.get_running_loop().create_future()
+        self._change_waiters.append(waiter)
+        try:
+            return await waiter
+        finally:
+            if not waiter.done() and waiter in self._change_waiters:
+                self._change_waiters.remove(waiter)
+
+
+def _pulse(event: asyncio.Event) -> None:
+    # set wakes up all tasks that are waiting for the event at this moment, they still return from wait
+    # when the event is cleared again before they run. So there is no need to keep the event set for a while.
+    event.set()
+    event.clear()
+
+
+_STATUS_FIELD_NAMES: Tuple[str, ...] = tuple(
+    field.name for field in attrs.fields(Status) if not field.name.startswith("_") and field.name != "timestamp"
+)
+
+# skip not json serializable fields like datetime
+_STATUS_DICT_FIELDS: Tuple[str, ...] = tuple(
+    field.name for field in attrs.fields(Status)
+    if field.name not in [
+        "timestamp", "_changed", "_changed_data", "_remote_proc_finished_running",
+        "_change_waiters", "_subscribers", "_last_change",
+    ]
+)
+
 
 @attrs.define
 class Modules:
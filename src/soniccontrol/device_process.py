@@ -0,0 +1,264 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import threading
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from soniccontrol.builder import DeviceBuilder
+from soniccontrol.communication.communicator_builder import CommunicatorBuilder
+from soniccontrol.communication.connection_factory import ConnectionFactory
+from soniccontrol.logging import create_logger_for_connection
+from soniccontrol.sonic_device import SonicDevice
+from soniccontrol.status_ring_buffer import StatusRecord, StatusRingBuffer
+
+
+# Messages over the pipe are tuples. The first element is the kind of the message.
+_COMMAND = "command"
+_STOP = "stop"
+_ANSWER = "answer"
+_CONNECTED = "connected"
+_ERROR = "error"
+
+
+def _run_device_worker(
+    connection_factory: ConnectionFactory,
+    ring_buffer_name: str,
+    connection: Connection,
+    log_path: Optional[Path],
+    poll_interval: float,
+    stream_interval_ms: int,
+) -> None:
+    asyncio.run(_device_worker(
+        connection_factory, ring_buffer_name, connection, log_path, poll_interval, stream_interval_ms
+    ))
+
+
+async def _device_worker(
+    connection_factory: ConnectionFactory,
+    ring_buffer_name: str,
+    connection: Connection,
+    log_path: Optional[Path],
+    poll_interval: float,
+    stream_interval_ms: int,
+) -> None:
+    connection_name = connection_factory.connection_name
+    if log_path:
+        logger = create_logger_for_connection(connection_name, log_path)
+    else:
+        logger = create_logger_for_connection(connection_name)
+    ring_buffer = StatusRingBuffer.attach(ring_buffer_name)
+
+    try:
+        serial, commands = await CommunicatorBuilder.build(connection_factory, logger=logger)
+        device = await DeviceBuilder().build_amp(ser=serial, commands=commands, logger=logger)
+    except Exception as e:
+        logger.error(e)
+        connection.send((_ERROR, str(e)))
+        ring_buffer.close()
+        return
+
+    connection.send((_CONNECTED, {
+        "device_type": device.info.device_type,
+        "firmware_version": device.info.firmware_version,
+        "firmware_info": device.info.firmware_info,
+    }))
+
+    async def publish_status() -> None:
+        if device.supports_status_stream:
+            await device.start_status_stream(stream_interval_ms)
+            while True:
+                try:
+                    await device.receive_streamed_status(timeout=5 * stream_interval_ms / 1000)
+                except asyncio.TimeoutError:
+                    await device.execute_command("-", should_log=False)
+                ring_buffer.write(device.status)
+        else:
+            while True:
+                await device.execute_command("-", should_log=False)
+                ring_buffer.write(device.status)
+                await asyncio.sleep(poll_interval)
+
+    async def execute_command(request_id: int, message: str, argument: Any) -> None:
+        answer = await device.execute_command(message, argument)
+        ring_buffer.write(device.status)
+        connection.send((_ANSWER, request_id, answer))
+
+    status_task = asyncio.create_task(publish_status())
+    command_tasks = set()
+    try:
+        while True:
+            request = await asyncio.to_thread(connection.recv)
+            if request[0] == _STOP:
+                break
+            _, request_id, message, argument = request
+            task = asyncio.create_task(execute_command(request_id, message, argument))
+            command_tasks.add(task)
+            task.add_done_callback(command_tasks.discard)
+    except EOFError:
+        logger.warning("The pipe to the gui process was closed")
+    finally:
+        status_task.cancel()
+        for task in list(command_tasks):
+            task.cancel()
+        await asyncio.gather(status_task, *command_tasks, return_exceptions=True)
+        await device.disconnect()
+        ring_buffer.close()
+        connection.close()
+
+
+class DeviceProcess:
+    """
+    Runs the communication stack of a device (Communicator, SonicDevice and the status polling)
+    in its own process, so that stalls of the gui do not delay the serial communication and the other way round.
+
+    The worker publishes every status it receives into a StatusRingBuffer in shared memory.
+    Commands are sent over a pipe and the answers are returned the same way.
+
+    It is a building block only. The GUI and the connection flow do not use it yet.
+    """
+
+    def __init__(
+        self,
+        connection_factory: ConnectionFactory,
+        log_path: Optional[Path] = None,
+        ring_buffer_capacity: int = 1024,
+        poll_interval: float = 0.,
+        stream_interval_ms: int = 100,
+    ) -> None:
+        self._connection_factory = connection_factory
+        self._log_path = log_path
+        self._ring_buffer_capacity = ring_buffer_capacity
+        self._poll_interval = poll_interval
+        self._stream_interval_ms = stream_interval_ms
+        self._logger = logging.getLogger(connection_factory.connection_name + "." + DeviceProcess.__name__)
+
+        self._ring_buffer: Optional[StatusRingBuffer] = None
+        self._read_index: int = 0
+        self._connection: Optional[Connection] = None
+        self._process: Optional[multiprocessing.Process] = None
+        self._receiver: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._request_ids = itertools.count()
+        self._pending_answers: Dict[int, asyncio.Future] = {}
+        self._connected: Optional[asyncio.Future] = None
+        self._info: Dict[str, Any] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        return self._info
+
+    async def start(self) -> None:
+        """
+        Starts the worker process and waits until it connected to the device.
+
+        Raises:
+            ConnectionError: If the worker could not connect to the device.
+        """
+        assert self._process is None
+        self._loop = asyncio.get_running_loop()
+        self._connected = self._loop.create_future()
+        self._ring_buffer = StatusRingBuffer.create(self._ring_buffer_capacity)
+        self._read_index = 0
+
+        self._connection, worker_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_run_device_worker,
+            args=(
+                self._connection_factory,
+                self._ring_buffer.name,
+                worker_connection,
+                self._log_path,
+                self._poll_interval,
+                self._stream_interval_ms,
+            ),
+            daemon=True,
+        )
+        self._logger.info("Start device process")
+        self._process.start()
+        worker_connection.close()
+
+        self._receiver = threading.Thread(target=self._receive, daemon=True)
+        self._receiver.start()
+
+        try:
+            self._info = await self._connected
+        except ConnectionError:
+            await self._join()
+            raise
+
+    def _receive(self) -> None:
+        assert self._connection is not None and self._loop is not None
+        while True:
+            try:
+                message = self._connection.recv()
+            except (EOFError, OSError):
+                self._loop.call_soon_threadsafe(self._on_worker_closed)
+                return
+            self._loop.call_soon_threadsafe(self._on_worker_message, message)
+
+    def _on_worker_message(self, message: tuple) -> None:
+        assert self._connected is not None
+        kind = message[0]
+        if kind == _CONNECTED and not self._connected.done():
+            self._connected.set_result(message[1])
+        elif kind == _ERROR and not self._connected.done():
+            self._connected.set_exception(ConnectionError(message[1]))
+        elif kind == _ANSWER:
+            future = self._pending_answers.pop(message[1], None)
+            if future is not None and not future.done():
+                future.set_result(message[2])
+
+    def _on_worker_closed(self) -> None:
+        if self._connected is not None and not self._connected.done():
+            self._connected.set_exception(ConnectionError("The device process terminated"))
+        for future in self._pending_answers.values():
+            if not future.done():
+                future.set_exception(ConnectionError("The device process terminated"))
+        self._pending_answers.clear()
+
+    async def execute_command(self, message: str, argument: Any = "") -> str:
+        assert self._connection is not None and self._loop is not None
+        if not self.is_running:
+            raise ConnectionError("The device process is not running")
+
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        self._pending_answers[request_id] = future
+        self._connection.send((_COMMAND, request_id, message, argument))
+        return await future
+
+    def read_status_records(self) -> List[StatusRecord]:
+        """
+        Returns the status records the worker published since the last call.
+        """
+        assert self._ring_buffer is not None
+        records, self._read_index = self._ring_buffer.read_since(self._read_index)
+        return records
+
+    async def stop(self) -> None:
+        if self._process is None:
+            return
+        self._logger.info("Stop device process")
+        if self._connection is not None and self.is_running:
+            self._connection.send((_STOP,))
+        await self._join()
+
+    async def _join(self) -> None:
+        assert self._process is not None
+        await asyncio.to_thread(self._process.join, 5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._ring_buffer is not None:
+            self._ring_buffer.close()
+            self._ring_buffer = None
@@ -1,5 +1,6 @@
 import abc
 import asyncio
+from typing import Any
 
 
 class Sendable(abc.ABC):
@@ -23,9 +24,31 @@ class Scriptable(abc.ABC):
     @abc.abstractmethod
     async def execute_command(*args, **kwargs) -> None: ...
 
+    @property
+    @abc.abstractmethod
+    def is_connected(self) -> bool: ...
+
+    @abc.abstractmethod
+    def has_command(self, command: Any) -> bool: ...
+
     @abc.abstractmethod
     async def get_overview() -> None: ...
 
+    @abc.abstractmethod
+    async def get_status() -> None: ...
+
+    @property
+    @abc.abstractmethod
+    def status_snapshot(self) -> Any: ...
+
+    @property
+    @abc.abstractmethod
+    def status(self) -> Any: ...
+
+    @property
+    @abc.abstractmethod
+    def procedure_reported_at(self) -> float: ...
+
     @abc.abstractmethod
     async def set_signal_on() -> None: ...
 
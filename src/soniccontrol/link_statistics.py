@@ -0,0 +1,77 @@
+import math
+from typing import Dict, Optional
+
+import attrs
+
+
+def command_key(message: str) -> str:
+    """ The message without an inline argument, so !f=1000 and !f= are counted as the same command """
+    head, separator, _ = message.partition("=")
+    return head + separator
+
+
+@attrs.define
+class LatencyStatistics:
+    """ Running count, mean, standard deviation and range of latencies in seconds (Welford's algorithm) """
+    count: int = attrs.field(default=0)
+    mean: float = attrs.field(default=0.)
+    _m2: float = attrs.field(default=0., repr=False)
+    minimum: float = attrs.field(default=math.inf)
+    maximum: float = attrs.field(default=0.)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        delta = seconds - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (seconds - self.mean)
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+@attrs.define
+class LinkStatistics:
+    """
+    Measured round trip times of the commands sent to a device, from sending the message until the answer
+    was received. They include the time the device needs to execute the command.
+    """
+    _commands: Dict[str, LatencyStatistics] = attrs.field(init=False, factory=dict)
+    _overall: LatencyStatistics = attrs.field(init=False, factory=LatencyStatistics)
+
+    @property
+    def overall(self) -> LatencyStatistics:
+        return self._overall
+
+    def record(self, message: str, seconds: float) -> None:
+        key = command_key(message)
+        statistics = self._commands.get(key)
+        if statistics is None:
+            statistics = self._commands[key] = LatencyStatistics()
+        statistics.record(seconds)
+        self._overall.record(seconds)
+
+    def latency(self, message: str) -> Optional[LatencyStatistics]:
+        return self._commands.get(command_key(message))
+
+    def expected_latency(self, message: str, default: float = 0.) -> LatencyStatistics:
+        """
+        The statistics of the command. For commands that were not measured yet, the statistics
+        of all commands are used, or the default latency, if nothing was measured yet.
+        """
+        statistics = self._commands.get(command_key(message))
+        if statistics is not None:
+            return statistics
+        if self._overall.count > 0:
+            return self._overall
+        return LatencyStatistics(count=0, mean=default, minimum=default, maximum=default)
+
+    def clear(self) -> None:
+        self._commands.clear()
+        self._overall = LatencyStatistics()
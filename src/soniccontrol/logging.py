@@ -1,6 +1,14 @@
+import json
 import logging
 import logging.handlers
 from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+parrot_feeder = logging.getLogger("parrot_feeder")
+
+# A trace sink gets the kind of the record, like COMMAND_CALL, ANSWER or DEVICE_STATE, and its data.
+TraceSink = Callable[[str, Dict[str, Any]], None]
+_trace_sinks: List[TraceSink] = []
 
 def get_base_logger(logger: logging.Logger) -> logging.Logger:
     try:
@@ -21,4 +29,32 @@ def create_logger_for_connection(connection_name: str, out_dir=Path(".")) -> log
     detailed_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)s:%(funcName)s - %(message)s - exception: %(exc_info)s")
     log_file_handler.setFormatter(detailed_formatter)
     logger.addHandler(log_file_handler)
-    return logger
\ No newline at end of file
+    return logger
+
+
+def add_trace_sink(sink: TraceSink) -> None:
+    _trace_sinks.append(sink)
+
+
+def remove_trace_sink(sink: TraceSink) -> None:
+    _trace_sinks.remove(sink)
+
+
+def is_tracing() -> bool:
+    """
+    Returns True if anything records the traffic with the device: a trace sink or
+    the parrot_feeder logger at debug level.
+    Callers check this before they build the data of a trace record, so that it costs nothing otherwise.
+    """
+    return bool(_trace_sinks) or parrot_feeder.isEnabledFor(logging.DEBUG)
+
+
+def trace(kind: str, data: Dict[str, Any]) -> None:
+    """
+    Passes a record to the trace sinks. The data is only serialised to json,
+    if the parrot_feeder logs it, as KIND(json).
+    """
+    for sink in _trace_sinks:
+        sink(kind, data)
+    if parrot_feeder.isEnabledFor(logging.DEBUG):
+        parrot_feeder.debug("%s(%s)", kind, json.dumps(data), stacklevel=2)
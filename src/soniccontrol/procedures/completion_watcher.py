@@ -0,0 +1,59 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from soniccontrol.sonic_device import SonicDevice
+
+
+class CompletionWatcher:
+    """
+    Makes sure that the status of the device is reported regularly while a procedure runs on the device,
+    so that the RemoteProcedure notices when it finished.
+
+    The poll interval adapts to the expected duration of the procedure: It polls rarely at the beginning,
+    more often the closer the expected end comes, and backs off again, if the procedure takes longer.
+    If the status is already reported by a status stream or by another poller, like the Updater of the GUI,
+    the watcher does not send anything.
+    """
+    MIN_INTERVAL_S: float = 0.05
+    MAX_INTERVAL_S: float = 1.
+    DEFAULT_INTERVAL_S: float = 0.5 # if the duration of the procedure is unknown
+
+    def __init__(
+        self,
+        device: SonicDevice,
+        expected_duration: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._device = device
+        self._expected_duration = expected_duration
+        self._clock = clock
+        self._sleep = sleep
+        self._poll_count: int = 0
+
+    @property
+    def poll_count(self) -> int:
+        """ The number of status polls the watcher sent itself """
+        return self._poll_count
+
+    def poll_interval(self, elapsed: float) -> float:
+        """ The longest time in seconds without a status report, after the procedure ran for the elapsed seconds """
+        if self._expected_duration is None:
+            return self.DEFAULT_INTERVAL_S
+        remaining = abs(self._expected_duration - elapsed)
+        return min(max(remaining / 4, self.MIN_INTERVAL_S), self.MAX_INTERVAL_S)
+
+    async def watch(self) -> None:
+        """ Runs until it gets cancelled """
+        start = self._clock()
+        last_poll = start
+        while True:
+            interval = self.poll_interval(self._clock() - start)
+            due = max(self._device.procedure_reported_at, last_poll) + interval - self._clock()
+            if due > 0:
+                await self._sleep(due)
+                continue
+            last_poll = self._clock()
+            await self._device.execute_command("-", should_log=False)
+            self._poll_count += 1
@@ -0,0 +1,182 @@
+import math
+from typing import Any, Callable, Dict, List, Sequence
+
+import attrs
+
+from soniccontrol.link_statistics import LinkStatistics, command_key
+from soniccontrol.procedures.holder import convert_to_holder_args
+from soniccontrol.procedures.procedure import RemoteProcedure
+from soniccontrol.procedures.procs.ramper import RamperArgs
+
+
+@attrs.frozen
+class DurationEstimate:
+    total: float = attrs.field() # expected runtime in seconds, inf for endless loops
+    nominal: float = attrs.field() # runtime in seconds, if the commands took no time
+    steps: int = attrs.field() # number of steps, endless loops are counted once
+    step_error: float = attrs.field() # expected time in seconds, that a step takes longer than planned
+    step_jitter: float = attrs.field() # standard deviation of the command latencies of a step in seconds
+    min_step_duration: float = attrs.field() # the time in seconds the commands of a step take on the link
+    feasible: bool = attrs.field() # False, if the commands of a step take longer than its holds
+
+    @property
+    def overhead(self) -> float:
+        """ The time in seconds the commands add to the nominal duration """
+        return self.total - self.nominal
+
+
+@attrs.define
+class _Sum:
+    total: float = 0.
+    nominal: float = 0.
+    steps: int = 0
+    variance: float = 0.
+    feasible: bool = True
+
+    def add(self, other: "_Sum", times: float = 1) -> None:
+        self.total += other.total * times
+        self.nominal += other.nominal * times
+        self.steps += other.steps * (int(times) if math.isfinite(times) else 1)
+        self.variance += other.variance * (times if math.isfinite(times) else 1)
+        self.feasible = self.feasible and other.feasible
+
+
+# The messages the aliases of the legacy scripts send
+_ALIAS_MESSAGES: Dict[str, str] = {
+    "frequency": "!f=",
+    "gain": "!g=",
+    "on": "!ON",
+    "off": "!OFF",
+    "auto": "!AUTO",
+    "AUTO": "!AUTO",
+    "!AUTO": "!AUTO",
+}
+
+
+class DurationEstimator:
+    """
+    Predicts how long procedures and scripts take on the current link, from the hold times and the latencies
+    of their commands measured by the LinkStatistics of the device.
+    Commands that were not measured yet are expected to take as long as the average command,
+    or the default latency, if nothing was measured yet.
+    """
+    DEFAULT_LATENCY_S: float = 0.05
+
+    def __init__(self, link_statistics: LinkStatistics, default_latency: float = DEFAULT_LATENCY_S) -> None:
+        self._link_statistics = link_statistics
+        self._default_latency = default_latency
+
+    def _latency(self, messages: Sequence[str]) -> _Sum:
+        latencies = [self._link_statistics.expected_latency(message, self._default_latency) for message in messages]
+        mean = sum(latency.mean for latency in latencies)
+        return _Sum(total=mean, variance=sum(latency.variance for latency in latencies))
+
+    def estimate_local_ramp(self, args: RamperArgs) -> DurationEstimate:
+        """
+        Estimates RamperLocal. Its steps are scheduled on deadlines, so the latencies of the commands
+        are part of the holds and only delay the ramp, if they take longer than the holds.
+        """
+        steps = len(range(0, 2 * args.half_range + args.step, args.step))
+        hold_on = args.hold_on.duration_in_ms / 1000
+        hold_off = args.hold_off.duration_in_ms / 1000
+        if hold_off:
+            during_on = self._latency(["!f=", "!ON"])
+            during_off = self._latency(["-", "!OFF"])
+            overrun = max(0., during_on.total - hold_on) + max(0., during_off.total - hold_off)
+            feasible = during_on.total <= hold_on and during_off.total <= hold_off
+        else:
+            # the status poll at the end of the hold is part of the hold of the next step
+            during_on = self._latency(["!f=", "-"])
+            during_off = _Sum()
+            overrun = max(0., during_on.total - hold_on)
+            feasible = during_on.total <= hold_on
+        setup = self._latency(["?", "!OFF"])
+        nominal = steps * (hold_on + hold_off)
+        return DurationEstimate(
+            total=setup.total + nominal + steps * overrun,
+            nominal=nominal,
+            steps=steps,
+            step_error=overrun,
+            step_jitter=math.sqrt(during_on.variance + during_off.variance),
+            min_step_duration=during_on.total + during_off.total,
+            feasible=feasible,
+        )
+
+    def estimate_remote_procedure(self, procedure: RemoteProcedure, args: Any) -> DurationEstimate:
+        """ Estimates a procedure that runs on the device. Only uploading and starting it depends on the link. """
+        commands = self._latency(procedure.get_arg_commands(args) + procedure.get_start_commands(args))
+        expected_duration = procedure.expected_duration(args)
+        nominal = math.inf if expected_duration is None else expected_duration
+        return DurationEstimate(
+            total=commands.total + nominal,
+            nominal=nominal,
+            steps=1,
+            step_error=commands.total,
+            step_jitter=math.sqrt(commands.variance),
+            min_step_duration=commands.total,
+            feasible=True,
+        )
+
+    def estimate_script(
+        self,
+        commands: List[Dict[str, Any]],
+        estimate_ramp: Callable[[RamperArgs], DurationEstimate],
+    ) -> DurationEstimate:
+        """
+        Estimates a parsed legacy script. Its holds are plain sleeps after the commands before them,
+        so every command delays the rest of the script by its latency.
+
+        Args:
+            commands: The parsed lines of the script, like the LegacySequencer gets them.
+            estimate_ramp: Estimates the ramps of the script with the ramp procedure of the device.
+        """
+        script = self._latency(["?", "!OFF"]) # sent before and after the script
+        script.add(self._estimate_lines(commands, 0, len(commands), estimate_ramp))
+        return DurationEstimate(
+            total=script.total,
+            nominal=script.nominal,
+            steps=script.steps,
+            step_error=(script.total - script.nominal) / script.steps if script.steps and math.isfinite(script.total) else 0.,
+            step_jitter=math.sqrt(script.variance / script.steps) if script.steps else 0.,
+            min_step_duration=self._link_statistics.expected_latency("", self._default_latency).mean,
+            feasible=script.feasible,
+        )
+
+    def _estimate_lines(
+        self,
+        commands: List[Dict[str, Any]],
+        begin: int,
+        end: int,
+        estimate_ramp: Callable[[RamperArgs], DurationEstimate],
+    ) -> _Sum:
+        block = _Sum()
+        line = begin
+        while line < end:
+            command: str = commands[line]["command"]
+            argument: Any = commands[line]["argument"]
+            if command == "startloop":
+                loop_end = commands[line]["loop"]["end"]
+                quantifier = commands[line]["loop"]["quantifier"]
+                times = math.inf if quantifier == -1 else quantifier
+                block.add(self._estimate_lines(commands, line + 1, loop_end, estimate_ramp), times)
+                line = loop_end + 1
+                continue
+
+            if command == "hold":
+                holder_args = convert_to_holder_args(argument)
+                duration = holder_args.duration_in_ms / 1000
+                block.add(_Sum(total=duration, nominal=duration, steps=1))
+            elif command in ("ramp_freq", "ramp_freq_range"):
+                ramp_args = RamperArgs.from_range(*argument) if command == "ramp_freq" else RamperArgs.from_center(*argument)
+                ramp = estimate_ramp(ramp_args)
+                block.add(_Sum(
+                    total=ramp.total, nominal=ramp.nominal, steps=ramp.steps,
+                    variance=ramp.steps * ramp.step_jitter ** 2, feasible=ramp.feasible
+                ))
+            else:
+                message = command if command.startswith(("!", "?")) else _ALIAS_MESSAGES[command]
+                latency = self._latency([command_key(message)])
+                latency.steps = 1
+                block.add(latency)
+            line += 1
+        return block
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import math
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import attrs
+
+from soniccontrol.procedures.procedure import Procedure, ProcedureType, RemoteProcedure
+from soniccontrol.procedures.procedure_controller import ProcedureController
+from soniccontrol.sonic_device import SonicDevice
+
+
+@attrs.frozen
+class FleetMemberResult:
+    device_index: int = attrs.field()
+    result: Any = attrs.field()
+    error: Optional[BaseException] = attrs.field()
+    latency: float = attrs.field() # round trip time of a status poll in seconds, nan if the device could not be prepared
+    # estimated arrival of the start command at the device relative to the common start in seconds,
+    # derived from the answer to the start command. It is nan for procedures without a start command,
+    # like the local ramp, and for devices that were not started.
+    start_skew: float = attrs.field()
+
+
+class FleetRunner:
+    """
+    Executes the same procedure on several devices at once, so that they start together.
+
+    First the round trip time to every device is measured and the parameters of the procedure are uploaded
+    to all devices concurrently. Only after all of them are ready, the procedures are started. The start of
+    each device is delayed by the difference between its latency and the one of the slowest device,
+    so that the start commands arrive at the devices at the same time. Commands, that a procedure
+    sends before its start command, like the frequency of a scan, add one round trip each.
+    Local procedures, like the local ramp, schedule their steps relative to their start,
+    so they stay in lockstep afterwards.
+    """
+
+    def __init__(
+        self,
+        controllers: Sequence[ProcedureController],
+        logger: logging.Logger = logging.getLogger(),
+        latency_samples: int = 3,
+        start_margin: float = 0.05,
+    ) -> None:
+        self._controllers = list(controllers)
+        self._logger = logging.getLogger(logger.name + "." + FleetRunner.__name__)
+        self._latency_samples = latency_samples
+        self._start_margin = start_margin # time in seconds between scheduling the starts and the first start
+
+    @property
+    def controllers(self) -> List[ProcedureController]:
+        return self._controllers
+
+    async def run(self, proc_type: ProcedureType, args: Any) -> List[FleetMemberResult]:
+        """
+        Executes the procedure on all devices and waits until all of them finished.
+        Errors of single devices do not stop the others, they are returned in the results.
+        Devices that could not be prepared are not started, their latency is nan.
+        """
+        procedures: List[Procedure] = []
+        for index, controller in enumerate(self._controllers):
+            procedure = controller.get_procedure(proc_type)
+            if procedure is None:
+                raise Exception(f"The procedure {repr(proc_type)} is not available for the device {index}")
+            if controller.is_proc_running:
+                raise Exception(f"There is already a procedure running on the device {index}")
+            if controller.is_queue_running:
+                raise Exception(f"The queue of the device {index} is running")
+            procedures.append(procedure)
+
+        self._logger.info("Prepare procedure %s on %d devices", proc_type.name, len(procedures))
+        prepared: List[Union[float, BaseException]] = list(await asyncio.gather(*(
+            self._prepare(controller.device, procedure, args)
+            for controller, procedure in zip(self._controllers, procedures)
+        ), return_exceptions=True))
+        latencies: Dict[int, float] = {}
+        for index, latency in enumerate(prepared):
+            if isinstance(latency, BaseException):
+                self._logger.error("Could not prepare the device %d: %s", index, latency)
+            else:
+                latencies[index] = latency
+
+        loop = asyncio.get_running_loop()
+        # the start is sent after the commands, that the procedure sends before it, were answered
+        leads: Dict[int, float] = {
+            index: latency / 2 + latency * procedures[index].round_trips_before_start(args)
+            for index, latency in latencies.items()
+        }
+        arrival = loop.time() + self._start_margin + max(leads.values(), default=0.)
+        dispatched: Dict[int, asyncio.Future] = {index: loop.create_future() for index in latencies}
+        started_at: Dict[int, float] = {}
+        start_waiters: List[asyncio.Future] = []
+
+        def start(index: int) -> None:
+            procedure = procedures[index]
+            try:
+                task = self._controllers[index].execute_procedure(procedure, proc_type, args)
+            except Exception as e:
+                dispatched[index].set_exception(e)
+                return
+            dispatched[index].set_result(task)
+            if isinstance(procedure, RemoteProcedure):
+                # the procedure is started, when the start command was answered
+                waiter = asyncio.ensure_future(procedure.started.wait())
+                waiter.add_done_callback(lambda waiter: record_start(index, waiter))
+                start_waiters.append(waiter)
+
+        def record_start(index: int, waiter: asyncio.Future) -> None:
+            if not waiter.cancelled():
+                started_at[index] = loop.time()
+
+        handles: List[asyncio.TimerHandle] = [
+            loop.call_at(arrival - lead, start, index) for index, lead in leads.items()
+        ]
+        results: List[FleetMemberResult] = []
+        try:
+            for index, preparation in enumerate(prepared):
+                if isinstance(preparation, BaseException):
+                    results.append(FleetMemberResult(index, None, preparation, math.nan, math.nan))
+                    continue
+                future = dispatched[index]
+                await asyncio.wait([future])
+                error = future.exception()
+                if error is not None:
+                    results.append(
+                        FleetMemberResult(index, None, error, latencies[index], math.nan)
+                    )
+                    continue
+                task = future.result()
+                await asyncio.wait([task])
+                result, error = None, None
+                if task.cancelled():
+                    error = asyncio.CancelledError()
+                elif task.exception() is not None:
+                    error = task.exception()
+                else:
+                    result = task.result()
+                skew = math.nan
+                if index in started_at:
+                    skew = started_at[index] - latencies[index] / 2 - arrival
+                results.append(FleetMemberResult(index, result, error, latencies[index], skew))
+        finally:
+            for handle in handles:
+                handle.cancel()
+            for waiter in start_waiters:
+                waiter.cancel()
+        self._logger.info("Procedure %s finished on %d devices", proc_type.name, len(results))
+        return results
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(
+            controller.stop_proc() for controller in self._controllers if controller.is_proc_running
+        ), return_exceptions=True)
+
+    async def _prepare(self, device: SonicDevice, procedure: Procedure, args: Any) -> float:
+        round_trips: List[float] = []
+        for _ in range(self._latency_samples):
+            sent_at = time.monotonic()
+            await device.execute_command("-", should_log=False)
+            round_trips.append(time.monotonic() - sent_at)
+        await procedure.upload_args(device, args)
+        return statistics.median(round_trips) if round_trips else 0.
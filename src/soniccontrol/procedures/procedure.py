@@ -1,10 +1,13 @@
-
-
 import abc
+import asyncio
+import time
 from enum import Enum
-from typing import Any, Type
+from typing import Any, List, Optional, Type
+
+import attrs
 
 from soniccontrol.interfaces import Scriptable
+from soniccontrol.procedures.status_sampling import check_connection
 
 
 class ProcedureType(Enum):
@@ -14,6 +17,17 @@ class ProcedureType(Enum):
     TUNE = "Tune"
     AUTO = "Auto"
     WIPE = "Wipe"
+    RESONANCE_SEARCH = "Resonance Search"
+
+@attrs.define
+class ProcedureCheckpoint:
+    """
+    Progress of an interrupted procedure, so that it can be resumed on a new connection.
+    The state is specific to the procedure, like the RampCheckpoint of the local ramp.
+    """
+    proc_type: ProcedureType = attrs.field()
+    state: Any = attrs.field()
+
 
 class Procedure(abc.ABC):
     @classmethod
@@ -22,3 +36,115 @@ class Procedure(abc.ABC):
 
     @abc.abstractmethod
     async def execute(self, device: Scriptable, args: Any) -> None: ...
+
+    async def upload_args(self, device: Scriptable, args: Any) -> None:
+        """
+        Sends the parameters of the procedure to the device without starting it, so that a queue can do that
+        while the previous procedure is still running. Procedures that run locally have nothing to upload.
+        """
+        pass
+
+    def round_trips_before_start(self, args: Any) -> int:
+        """
+        The number of commands, that execute waits for before it sends the command that starts
+        the procedure, if the args were uploaded already.
+        """
+        return 0
+
+    @property
+    def checkpoint(self) -> Any:
+        """
+        The progress of the last execution, if it was interrupted, else None.
+        Procedures that cannot be resumed have no checkpoint.
+        """
+        return None
+
+    async def resume(self, device: Scriptable, checkpoint: Any) -> Any:
+        """ Continues an interrupted execution from its checkpoint and returns the result like execute """
+        raise Exception(f"The procedure {type(self).__name__} cannot be resumed")
+
+
+class RemoteProcedure(Procedure):
+    """
+    Procedure that runs on the device. It is configured with setters and then started.
+    If the args were already uploaded with upload_args, execute only starts it.
+    It finishes, when a status report, that was received after the start, tells that no procedure
+    runs anymore. The reports have to come from somebody else, like the CompletionWatcher.
+    """
+    FINISHED_CHECK_INTERVAL_S: float = 0.1 # status reports without changes do not wake up the wait
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._uploaded_args: Any = None
+        self._started: asyncio.Event = asyncio.Event()
+
+    @property
+    def started(self) -> asyncio.Event:
+        """
+        Is set during an execution, after the start commands were sent
+        or after it was stopped while sending them.
+        From then on the status reports tell whether the procedure runs on the device.
+        """
+        return self._started
+
+    @abc.abstractmethod
+    def get_arg_commands(self, args: Any) -> List[str]:
+        """ The setters for the parameters, that can be sent while another procedure runs """
+        ...
+
+    @abc.abstractmethod
+    def get_start_commands(self, args: Any) -> List[str]: ...
+
+    def expected_duration(self, args: Any) -> Optional[float]:
+        """ How long the procedure is expected to run in seconds, or None if it runs until it is stopped """
+        return None
+
+    def round_trips_before_start(self, args: Any) -> int:
+        return len(self.get_start_commands(args)) - 1
+
+    async def upload_args(self, device: Scriptable, args: Any) -> None:
+        self._uploaded_args = None
+        for command in self.get_arg_commands(args):
+            await device.execute_command(command)
+        self._uploaded_args = args
+
+    async def execute(self, device: Scriptable, args: Any) -> None:
+        self._started.clear()
+        starting = False
+        try:
+            if self._uploaded_args is not args:
+                await self.upload_args(device, args)
+            self._uploaded_args = None
+            starting = True
+            for command in self.get_start_commands(args):
+                await device.execute_command(command)
+            started_at = time.monotonic()
+            self._started.set()
+            await self._wait_until_finished(device, started_at)
+        except asyncio.CancelledError:
+            await device.execute_command("!OFF")
+            if starting:
+                stopped_at = time.monotonic()
+                self._started.set()
+                await self._wait_until_finished(device, stopped_at)
+        finally:
+            self._started.clear()
+
+    async def _wait_until_finished(self, device: Scriptable, since: float) -> None:
+        """
+        Waits until a status report, that was received after since, tells that no procedure runs.
+        A procedure that finished before the first report does not change the status,
+        so the state is checked instead of waiting for a change.
+
+        Raises:
+            ConnectionError: If the connection was lost.
+        """
+        version = device.status.version
+        while device.procedure_reported_at <= since or device.status.procedure != 0:
+            check_connection(device)
+            try:
+                version = await asyncio.wait_for(
+                    device.status.wait_for_change(version), self.FINISHED_CHECK_INTERVAL_S
+                )
+            except asyncio.TimeoutError:
+                pass
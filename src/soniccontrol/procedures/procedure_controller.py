@@ -1,12 +1,16 @@
 from enum import Enum
 import logging
-from typing import Any, Dict, Literal, Optional, Type
+from collections import deque
+from typing import Any, Coroutine, Deque, Dict, List, Literal, Optional, Type
 import asyncio
 
-from soniccontrol.procedures.holder import HolderArgs
-from soniccontrol.procedures.procedure import Procedure, ProcedureType
+from soniccontrol.link_statistics import command_key
+from soniccontrol.procedures.completion_watcher import CompletionWatcher
+from soniccontrol.procedures.duration_estimator import DurationEstimate, DurationEstimator
+from soniccontrol.procedures.procedure import Procedure, ProcedureCheckpoint, ProcedureType, RemoteProcedure
 from soniccontrol.procedures.procedure_instantiator import ProcedureInstantiator
-from soniccontrol.procedures.procs.ramper import RamperArgs
+from soniccontrol.procedures.procedure_queue import Postcondition, Precondition, QueueItem
+from soniccontrol.procedures.procs.ramper import RamperArgs, RamperLocal
 from soniccontrol.sonic_device import SonicDevice
 from soniccontrol.logging import get_base_logger
 from soniccontrol.events import Event, EventManager
@@ -14,6 +18,11 @@ from soniccontrol.events import Event, EventManager
 class ProcedureController(EventManager):
     PROCEDURE_STOPPED: Literal["<<PROCEDURE_STOPPED>>"] = "<<PROCEDURE_STOPPED>>"
     PROCEDURE_RUNNING: Literal["<<PROCEDURE_RUNNING>>"] = "<<PROCEDURE_RUNNING>>"
+    QUEUE_ITEM_STARTED: Literal["<<QUEUE_ITEM_STARTED>>"] = "<<QUEUE_ITEM_STARTED>>"
+    QUEUE_ITEM_FINISHED: Literal["<<QUEUE_ITEM_FINISHED>>"] = "<<QUEUE_ITEM_FINISHED>>"
+    QUEUE_ITEM_SKIPPED: Literal["<<QUEUE_ITEM_SKIPPED>>"] = "<<QUEUE_ITEM_SKIPPED>>"
+    QUEUE_ITEM_FAILED: Literal["<<QUEUE_ITEM_FAILED>>"] = "<<QUEUE_ITEM_FAILED>>"
+    QUEUE_FINISHED: Literal["<<QUEUE_FINISHED>>"] = "<<QUEUE_FINISHED>>"
 
     def __init__(self, device: SonicDevice):
         super().__init__()
@@ -27,6 +36,21 @@ class ProcedureController(EventManager):
         self._ramp: Optional[Procedure] = self._procedures.get(ProcedureType.RAMP, None)
         self._running_proc_task: Optional[asyncio.Task] = None
         self._running_proc_type: Optional[ProcedureType] = None
+        self._running_procedure: Optional[Procedure] = None
+        self._checkpoint: Optional[ProcedureCheckpoint] = None
+        self._completion_watcher_task: Optional[asyncio.Task] = None
+        self._last_result: Any = None
+        self._queue: Deque[QueueItem] = deque()
+        self._queue_task: Optional[asyncio.Task] = None
+        self._current_item: Optional[QueueItem] = None
+        self._skip_requested: bool = False
+
+    @property
+    def device(self) -> SonicDevice:
+        return self._device
+
+    def get_procedure(self, proc_type: ProcedureType) -> Optional[Procedure]:
+        return self._procedures.get(proc_type, None)
 
     @property
     def proc_args_list(self) -> Dict[ProcedureType, Type]:
@@ -43,6 +67,44 @@ class ProcedureController(EventManager):
     def running_proc_type(self) -> Optional[ProcedureType]:
         return self._running_proc_type
 
+    @property
+    def last_result(self) -> Any:
+        """
+        The result returned by the last procedure that finished successfully, like the SweepResult of a local ramp.
+        Procedures that do not measure anything return None.
+        """
+        return self._last_result
+
+    @property
+    def checkpoint(self) -> Optional[ProcedureCheckpoint]:
+        """
+        The progress of the last procedure, if it was interrupted and can be resumed, else None.
+        It can be passed to resume_proc of a controller for a new connection to the device.
+        """
+        return self._checkpoint
+
+    def estimate_duration(self, proc_type: ProcedureType, args: Any) -> DurationEstimate:
+        """
+        Predicts how long the procedure takes with the latencies measured on the link to the device so far.
+        """
+        procedure = self._procedures.get(proc_type, None)
+        if procedure is None:
+            raise Exception(f"The procedure {repr(proc_type)} is not available for the current device")
+
+        estimator = DurationEstimator(self._device.link_statistics)
+        if isinstance(procedure, RamperLocal):
+            return estimator.estimate_local_ramp(args)
+        if isinstance(procedure, RemoteProcedure):
+            return estimator.estimate_remote_procedure(procedure, args)
+        raise Exception(f"The duration of the procedure {repr(proc_type)} cannot be estimated")
+
+    def estimate_script_duration(self, commands: List[Dict[str, Any]]) -> DurationEstimate:
+        """
+        Predicts how long a parsed legacy script takes with the latencies measured on the link to the device so far.
+        """
+        estimator = DurationEstimator(self._device.link_statistics)
+        return estimator.estimate_script(commands, lambda args: self.estimate_duration(ProcedureType.RAMP, args))
+
     def execute_proc(self, proc_type: ProcedureType, args: Any) -> None:
         assert(proc_type in self._procedures)
         procedure = self._procedures.get(proc_type, None)
@@ -51,15 +113,75 @@ class ProcedureController(EventManager):
        
         self.execute_procedure(procedure, proc_type, args)
 
-    def execute_procedure(self, procedure: Procedure, proc_type: ProcedureType, args: Any):
+    def execute_procedure(self, procedure: Procedure, proc_type: ProcedureType, args: Any) -> asyncio.Task:
         if self.is_proc_running:
             raise Exception("There is already a procedure running")
         
         self._logger.info("Run procedure %s with args %s", proc_type.name, str(args))
+        return self._start_procedure(procedure, proc_type, args, procedure.execute(self._device, args))
+
+    def resume_proc(self, checkpoint: Optional[ProcedureCheckpoint] = None) -> asyncio.Task:
+        """
+        Resumes an interrupted procedure from its checkpoint. Defaults to the checkpoint of this controller.
+        """
+        checkpoint = checkpoint or self._checkpoint
+        if checkpoint is None:
+            raise Exception("There is no procedure to resume")
+        procedure = self._procedures.get(checkpoint.proc_type, None)
+        if procedure is None:
+            raise Exception(f"The procedure {repr(checkpoint.proc_type)} is not available for the current device")
+        if self.is_proc_running:
+            raise Exception("There is already a procedure running")
+
+        self._logger.info("Resume procedure %s", checkpoint.proc_type.name)
+        return self._start_procedure(
+            procedure, checkpoint.proc_type, None, procedure.resume(self._device, checkpoint.state)
+        )
+
+    def _start_procedure(
+        self, procedure: Procedure, proc_type: ProcedureType, args: Any, run: Coroutine[Any, Any, Any]
+    ) -> asyncio.Task:
+        self._checkpoint = None
         self._running_proc_type = proc_type
-        self._running_proc_task = asyncio.create_task(procedure.execute(self._device, args))
+        self._running_procedure = procedure
+        self._running_proc_task = asyncio.create_task(run)
+        self._running_proc_task.add_done_callback(self._store_result)
         self._running_proc_task.add_done_callback(lambda _e: self._on_proc_finished())
+        if isinstance(procedure, RemoteProcedure):
+            # The procedure waits for a status report that tells that it finished
+            self._completion_watcher_task = asyncio.create_task(self._watch_completion(procedure, args))
         self.emit(Event(ProcedureController.PROCEDURE_RUNNING, proc_type=proc_type))
+        return self._running_proc_task
+
+    async def _watch_completion(self, procedure: RemoteProcedure, args: Any) -> None:
+        try:
+            expected_duration = procedure.expected_duration(args)
+        except Exception as e:
+            # the estimate only sets the poll rate, so the default one will do
+            self._logger.warning("Could not estimate the duration of the procedure: %s", e)
+            expected_duration = None
+        # the expected duration is counted from the start and not from the upload of the args
+        await procedure.started.wait()
+        await CompletionWatcher(self._device, expected_duration).watch()
+
+    async def run_proc(self, proc_type: ProcedureType, args: Any) -> Any:
+        """
+        Executes the procedure like execute_proc, but waits until it finished and returns its result.
+        """
+        self.execute_proc(proc_type, args)
+        assert self._running_proc_task is not None
+        return await self._running_proc_task
+
+    def _store_result(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is None:
+            self._last_result = task.result()
+        elif self._running_proc_type is not None and self._running_procedure is not None:
+            self._save_checkpoint(self._running_proc_type, self._running_procedure)
+
+    def _save_checkpoint(self, proc_type: ProcedureType, procedure: Procedure) -> None:
+        if procedure.checkpoint is not None:
+            self._logger.info("Procedure %s was interrupted, its progress can be resumed", proc_type.name)
+            self._checkpoint = ProcedureCheckpoint(proc_type, procedure.checkpoint)
 
     async def stop_proc(self) -> None:
         self._logger.info("Stop procedure")
@@ -68,10 +190,174 @@ class ProcedureController(EventManager):
             await self._running_proc_task
             self._on_proc_finished()
 
+    @property
+    def queue(self) -> List[QueueItem]:
+        """ The procedures that are waiting in the queue """
+        return list(self._queue)
+
+    @property
+    def current_item(self) -> Optional[QueueItem]:
+        return self._current_item
+
+    @property
+    def is_queue_running(self) -> bool:
+        return self._queue_task is not None and not self._queue_task.done()
+
+    def enqueue(
+        self,
+        proc_type: ProcedureType,
+        args: Any,
+        precondition: Optional[Precondition] = None,
+        postcondition: Optional[Postcondition] = None,
+        overlap_upload: bool = False,
+    ) -> QueueItem:
+        """
+        Appends a procedure to the queue. Procedures can also be appended, while the queue is running.
+        """
+        if proc_type not in self._procedures:
+            raise Exception(f"The procedure {repr(proc_type)} is not available for the current device")
+        item = QueueItem(proc_type, args, precondition, postcondition, overlap_upload)
+        self._queue.append(item)
+        return item
+
+    def start_queue(self) -> None:
+        """
+        Executes the procedures of the queue one after another.
+
+        A procedure, whose precondition is not met, is skipped. If a procedure fails or its postcondition is
+        not met, the queue stops and the remaining procedures stay in it.
+        """
+        if self.is_queue_running:
+            raise Exception("The queue is already running")
+        if self.is_proc_running:
+            raise Exception("There is already a procedure running")
+        self._queue_task = asyncio.create_task(self._run_queue())
+
+    async def run_queue(self) -> None:
+        """ Executes the queue like start_queue, but waits until it finished """
+        self.start_queue()
+        assert self._queue_task is not None
+        await self._queue_task
+
+    async def skip_current(self) -> None:
+        """ Stops the procedure, that is running in the queue, and continues with the next one """
+        task = self._running_proc_task
+        if self._current_item is None or task is None:
+            return
+        self._logger.info("Skip procedure %s", self._current_item.proc_type.name)
+        self._skip_requested = True
+        task.cancel()
+        await asyncio.wait([task])
+
+    async def stop_queue(self) -> None:
+        """ Removes all procedures from the queue and stops the running one """
+        self._logger.info("Stop queue")
+        self._queue.clear()
+        await self.skip_current()
+        if self._queue_task is not None:
+            await asyncio.wait([self._queue_task])
+
+    async def _run_queue(self) -> None:
+        upload: Optional[asyncio.Task] = None
+        try:
+            while self._queue:
+                item = self._queue.popleft()
+                self._current_item = item
+                if upload is not None:
+                    await self._finish_upload(upload)
+                    upload = None
+                if item.precondition is not None and not await item.precondition(self._device):
+                    self._logger.info("Skip procedure %s, because its precondition is not met", item.proc_type.name)
+                    self.emit(Event(ProcedureController.QUEUE_ITEM_SKIPPED, item=item, reason="precondition"))
+                    continue
+
+                procedure = self._procedures[item.proc_type]
+                self._skip_requested = False
+                try:
+                    # raises for example, if a procedure was started outside of the queue
+                    self.execute_procedure(procedure, item.proc_type, item.args)
+                except Exception as error:
+                    self._logger.error("Procedure %s could not be started: %s", item.proc_type.name, error)
+                    self.emit(Event(ProcedureController.QUEUE_ITEM_FAILED, item=item, reason="error", error=error))
+                    break
+                task = self._running_proc_task
+                assert task is not None
+                self.emit(Event(ProcedureController.QUEUE_ITEM_STARTED, item=item))
+
+                next_item = self._queue[0] if self._queue else None
+                if next_item is not None and next_item.overlap_upload:
+                    next_procedure = self._procedures[next_item.proc_type]
+                    if not self._shares_setters(procedure, item.args, next_procedure, next_item.args):
+                        upload = asyncio.create_task(self._upload_when_started(
+                            procedure, task, next_procedure, next_item.args
+                        ))
+
+                await asyncio.wait([task])
+                if self._skip_requested or task.cancelled():
+                    self.emit(Event(ProcedureController.QUEUE_ITEM_SKIPPED, item=item, reason="skipped"))
+                    continue
+                error = task.exception()
+                if error is not None:
+                    self._logger.error("Procedure %s failed: %s", item.proc_type.name, error)
+                    self.emit(Event(ProcedureController.QUEUE_ITEM_FAILED, item=item, reason="error", error=error))
+                    break
+                result = task.result()
+                if item.postcondition is not None and not await item.postcondition(self._device, result):
+                    self._logger.error("Postcondition of procedure %s is not met", item.proc_type.name)
+                    self.emit(Event(ProcedureController.QUEUE_ITEM_FAILED, item=item, reason="postcondition", error=None))
+                    break
+                self.emit(Event(ProcedureController.QUEUE_ITEM_FINISHED, item=item, result=result))
+        finally:
+            if upload is not None:
+                # the next procedure uploads its args itself, if it is run later
+                upload.cancel()
+                await self._finish_upload(upload)
+            self._current_item = None
+            self.emit(Event(ProcedureController.QUEUE_FINISHED))
+
+    async def _upload_when_started(
+        self, running: Procedure, running_task: asyncio.Task, upload: Procedure, upload_args: Any
+    ) -> None:
+        """
+        Uploads the args after the running procedure sent its own setters and start commands,
+        so that the commands of both are not sent in between each other.
+        """
+        if isinstance(running, RemoteProcedure):
+            started = asyncio.create_task(running.started.wait())
+            try:
+                await asyncio.wait([started, running_task], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                started.cancel()
+        await upload.upload_args(self._device, upload_args)
+
+    async def _finish_upload(self, upload: asyncio.Task) -> None:
+        """
+        Waits until the upload is done. If it failed, the procedure uploads its args itself,
+        when it is executed.
+        """
+        await asyncio.wait([upload])
+        if not upload.cancelled() and upload.exception() is not None:
+            self._logger.warning("Could not upload the args in advance: %s", upload.exception())
+
+    @staticmethod
+    def _shares_setters(running: Procedure, running_args: Any, upload: Procedure, upload_args: Any) -> bool:
+        """
+        Uploading the args of a procedure, that uses a setter of the running procedure, would overwrite
+        the args of the running one. AutoProc for example uses the setters of ScanProc and TuneProc.
+        """
+        if not isinstance(running, RemoteProcedure) or not isinstance(upload, RemoteProcedure):
+            return False
+        running_setters = {command_key(command) for command in running.get_arg_commands(running_args)}
+        return any(command_key(command) in running_setters for command in upload.get_arg_commands(upload_args))
+
     def _on_proc_finished(self) -> None:
         self._logger.info("Procedure stopped")
+        if self._completion_watcher_task is not None:
+            self._completion_watcher_task.cancel()
+            self._completion_watcher_task = None
         self._running_proc_task = None
         self._running_proc_type = None
+        self._running_procedure = None
         self.emit(Event(ProcedureController.PROCEDURE_STOPPED))
 
     async def ramp_freq(
@@ -83,18 +369,12 @@ class ProcedureController(EventManager):
         hold_on_unit: Literal["ms", "s"] = "ms",
         hold_off_time: float = 0,
         hold_off_unit: Literal["ms", "s"] = "ms",
-    ) -> None:
-        half_range = (stop - start) // 2
-        freq_center = start + half_range
-        assert(half_range > 0)
-
-        return await self.ramp_freq_range(
-            freq_center, 
-            half_range, 
-            step,
+    ) -> Any:
+        return await self._execute_ramp(RamperArgs.from_range(
+            start, stop, step,
             hold_on_time, hold_on_unit,
             hold_off_time, hold_off_unit
-        )
+        ))
     
     async def ramp_freq_range(
         self,
@@ -105,17 +385,32 @@ class ProcedureController(EventManager):
         hold_on_unit: Literal["ms", "s"] = "ms",
         hold_off_time: float = 0,
         hold_off_unit: Literal["ms", "s"] = "ms",
-    ) -> None:
+    ) -> Any:
+        return await self._execute_ramp(RamperArgs.from_center(
+            freq_center, half_range, step,
+            hold_on_time, hold_on_unit,
+            hold_off_time, hold_off_unit
+        ))
+
+    async def resume_ramp(self, checkpoint: ProcedureCheckpoint) -> Any:
+        """ Resumes an interrupted ramp of a script and waits until it finished """
         if self._ramp is None:
             raise Exception("No Ramp procedure available for the current device")
 
-        return await self._ramp.execute(
-            self._device,
-            RamperArgs(
-                freq_center, 
-                half_range,
-                step,
-                HolderArgs(hold_on_time, hold_on_unit),
-                HolderArgs(hold_off_time, hold_off_unit)
-            )
-        )
\ No newline at end of file
+        return await self._run_ramp(self._ramp.resume(self._device, checkpoint.state))
+
+    async def _execute_ramp(self, args: RamperArgs) -> Any:
+        if self._ramp is None:
+            raise Exception("No Ramp procedure available for the current device")
+
+        return await self._run_ramp(self._ramp.execute(self._device, args))
+
+    async def _run_ramp(self, run: Coroutine[Any, Any, Any]) -> Any:
+        assert self._ramp is not None
+        self._checkpoint = None
+        try:
+            self._last_result = await run
+        except BaseException:
+            self._save_checkpoint(ProcedureType.RAMP, self._ramp)
+            raise
+        return self._last_result
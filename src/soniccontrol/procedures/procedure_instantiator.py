@@ -2,6 +2,7 @@ from typing import Dict, Optional
 from soniccontrol.procedures.procedure import Procedure, ProcedureType
 from soniccontrol.procedures.procs.auto import AutoProc
 from soniccontrol.procedures.procs.ramper import Ramper, RamperLocal, RamperRemote
+from soniccontrol.procedures.procs.resonance_search import ResonanceSearchProc
 from soniccontrol.procedures.procs.scan import ScanProc
 from soniccontrol.procedures.procs.tune import TuneProc
 from soniccontrol.procedures.procs.wipe import WipeProc
@@ -24,6 +25,9 @@ class ProcedureInstantiator:
         if ramp:
             procedures[ProcedureType.RAMP] = ramp
 
+        if device.status_has_values("urms", "irms", "phase"): # the resonance search measures the impedance and phase
+            procedures[ProcedureType.RESONANCE_SEARCH] = ResonanceSearchProc()
+
         if device.has_command("!scan"):
             procedures[ProcedureType.SCAN] = ScanProc()
 
@@ -0,0 +1,22 @@
+from typing import Any, Awaitable, Callable, Optional
+
+import attrs
+
+from soniccontrol.procedures.procedure import ProcedureType
+from soniccontrol.sonic_device import SonicDevice
+
+# Is checked right before the procedure is started. The procedure is skipped, if it returns False.
+Precondition = Callable[[SonicDevice], Awaitable[bool]]
+# Gets the result of the procedure. The queue is stopped, if it returns False.
+Postcondition = Callable[[SonicDevice, Any], Awaitable[bool]]
+
+
+@attrs.define(eq=False)
+class QueueItem:
+    proc_type: ProcedureType = attrs.field()
+    args: Any = attrs.field()
+    precondition: Optional[Precondition] = attrs.field(default=None)
+    postcondition: Optional[Postcondition] = attrs.field(default=None)
+    # Upload the args of this procedure to the device, while the previous one is still running.
+    # It is uploaded afterwards anyway, if the previous procedure uses one of its setters.
+    overlap_upload: bool = attrs.field(default=False)
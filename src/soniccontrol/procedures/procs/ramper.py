@@ -1,12 +1,15 @@
-from typing import List, Type, Union
-import asyncio
+from typing import List, Optional, Type, Union
 
 import attrs
 from attrs import validators
 
 from soniccontrol.interfaces import Scriptable
-from soniccontrol.procedures.holder import Holder, HolderArgs, convert_to_holder_args
-from soniccontrol.procedures.procedure import Procedure
+from soniccontrol.procedures.holder import HolderArgs, TimeUnit, convert_to_holder_args
+from soniccontrol.procedures.procedure import Procedure, RemoteProcedure
+from soniccontrol.procedures.status_sampling import check_connection, sample_status
+from soniccontrol.procedures.step_scheduler import StepScheduler, StepTiming
+from soniccontrol.procedures.sweep_result import SweepResult
+from soniccontrol.status_snapshot import StatusSnapshot
 
 
 @attrs.define(auto_attribs=True)
@@ -35,6 +38,44 @@ class RamperArgs:
         converter=convert_to_holder_args
     )
 
+    @staticmethod
+    def from_center(
+        freq_center: int,
+        half_range: int,
+        step: int,
+        hold_on_time: float = 100,
+        hold_on_unit: TimeUnit = "ms",
+        hold_off_time: float = 0,
+        hold_off_unit: TimeUnit = "ms",
+    ) -> "RamperArgs":
+        """ Creates the args from the arguments of the script command ramp_freq_range """
+        return RamperArgs(
+            freq_center,
+            half_range,
+            step,
+            HolderArgs(hold_on_time, hold_on_unit),
+            HolderArgs(hold_off_time, hold_off_unit)
+        )
+
+    @staticmethod
+    def from_range(
+        start: int,
+        stop: int,
+        step: int,
+        hold_on_time: float = 100,
+        hold_on_unit: TimeUnit = "ms",
+        hold_off_time: float = 0,
+        hold_off_unit: TimeUnit = "ms",
+    ) -> "RamperArgs":
+        """ Creates the args from the arguments of the script command ramp_freq """
+        half_range = (stop - start) // 2
+        assert(half_range > 0)
+        return RamperArgs.from_center(
+            start + half_range, half_range, step,
+            hold_on_time, hold_on_unit,
+            hold_off_time, hold_off_unit
+        )
+
 
 class Ramper(Procedure):
     def __init__(self) -> None:
@@ -45,71 +86,134 @@ class Ramper(Procedure):
         return RamperArgs
 
 
+@attrs.define
+class RampCheckpoint:
+    """ Progress of a local ramp. It is updated after every completed step. """
+    args: RamperArgs = attrs.field()
+    next_step: int = attrs.field(default=0)
+    samples: List[StatusSnapshot] = attrs.field(factory=list) # the status measured in each completed step
+
+    @property
+    def values(self) -> List[int]:
+        """ The frequencies of all steps of the ramp """
+        args = self.args
+        start = args.freq_center - args.half_range
+        stop = args.freq_center + args.half_range + args.step # add a step to stop so that stop is inclusive
+        return [start + i * args.step for i in range(int((stop - start) / args.step)) ]
+
+    @property
+    def is_finished(self) -> bool:
+        return self.next_step >= len(self.values)
+
+    def partial_result(self) -> SweepResult:
+        """ The frequency response of the steps completed so far """
+        return SweepResult.from_snapshots(self.values[:self.next_step], self.samples)
+
+
 class RamperLocal(Ramper):
     def __init__(self) -> None:
         super().__init__()
+        self._step_timings: List[StepTiming] = []
+        self._checkpoint: Optional[RampCheckpoint] = None
+
+    @property
+    def step_timings(self) -> List[StepTiming]:
+        """ The planned and actual timing of every step of the last ramp """
+        return self._step_timings
+
+    @property
+    def checkpoint(self) -> Optional[RampCheckpoint]:
+        return self._checkpoint
+
+    def round_trips_before_start(self, args: RamperArgs) -> int:
+        return 1 # the overview
 
     async def execute(
         self,
         device: Scriptable,
         args: RamperArgs
-    ) -> None:
-        start = args.freq_center - args.half_range
-        stop = args.freq_center + args.half_range + args.step # add a step to stop so that stop is inclusive
-        values = [start + i * args.step for i in range(int((stop - start) / args.step)) ]
-
+    ) -> SweepResult:
+        """
+        Ramps the frequency and measures the status at the end of the hold of each step.
+        Returns the measured frequency response.
+        """
+        return await self.resume(device, RampCheckpoint(args))
+
+    async def resume(self, device: Scriptable, checkpoint: RampCheckpoint) -> SweepResult:
+        """
+        Continues an interrupted ramp with the step after the last completed one.
+        The checkpoint is updated in place, so it can be resumed again, if the ramp gets interrupted again.
+        """
+        self._checkpoint = checkpoint
         try:
             await device.get_overview()
             # TODO: Do we need those two lines?
             # await device.execute_command(f"!freq={start}")
             # await device.set_signal_on()
-            await self._ramp(device, list(values), args.hold_on, args.hold_off)
+            await self._ramp(device, checkpoint, checkpoint.args.hold_on, checkpoint.args.hold_off)
         finally:
             await device.set_signal_off()
+        self._checkpoint = None
+        return checkpoint.partial_result()
 
     async def _ramp(
         self,
         device: Scriptable,
-        values: List[Union[int, float]],
+        checkpoint: RampCheckpoint,
         hold_on: HolderArgs,
         hold_off: HolderArgs,
     ) -> None:
-        i: int = 0
+        # The steps are scheduled on a monotonic timeline, so the time the commands take
+        # is part of the hold and does not add up over the steps.
+        hold_on_s = hold_on.duration_in_ms / 1000
+        hold_off_s = hold_off.duration_in_ms / 1000
+        scheduler = StepScheduler()
+        self._step_timings = []
+        values = checkpoint.values
+        i: int = checkpoint.next_step
         while i < len(values):
             value = values[i]
 
+            scheduler.begin_step(hold_on_s + hold_off_s)
             await device.execute_command(f"!f={value}") # FIXME use internal freq command of device
             if hold_off.duration:
                 await device.set_signal_on()
-            await Holder.execute(hold_on)
+            check_connection(device)
+            await scheduler.hold_until(hold_on_s)
+            sample = await sample_status(device)
 
             if hold_off.duration:
                 await device.set_signal_off()
-                await Holder.execute(hold_off)
+                check_connection(device)
+                await scheduler.hold_until(hold_on_s + hold_off_s)
+
+            self._step_timings.append(scheduler.end_step())
 
             i += 1
+            checkpoint.samples.append(sample)
+            checkpoint.next_step = i
 
 
-class RamperRemote(Ramper):
+class RamperRemote(Ramper, RemoteProcedure):
     def __init__(self) -> None:
         super().__init__()
 
-    async def execute(
-        self,
-        device: Scriptable,
-        args: RamperArgs
-    ) -> None:
-        try:
-            start = args.freq_center - args.half_range
-            stop = args.freq_center + args.half_range + args.step
-
-            await device.execute_command(f"!ramp_f_start={start}")
-            await device.execute_command(f"!ramp_f_stop={stop}")
-            await device.execute_command(f"!ramp_f_step={args.step}")
-            await device.execute_command(f"!ramp_t_on={int(args.hold_on.duration_in_ms)}")
-            await device.execute_command(f"!ramp_t_off={int(args.hold_off.duration_in_ms)}")
-            await device.execute_command(f"!ramp")
-        except asyncio.CancelledError:
-            await device.execute_command("!OFF")  # TODO Maybe make a !stop command
-        finally:
-            await device.get_remote_proc_finished_event().wait()
+    def get_arg_commands(self, args: RamperArgs) -> List[str]:
+        start = args.freq_center - args.half_range
+        stop = args.freq_center + args.half_range + args.step
+        return [
+            f"!ramp_f_start={start}",
+            f"!ramp_f_stop={stop}",
+            f"!ramp_f_step={args.step}",
+            f"!ramp_t_on={int(args.hold_on.duration_in_ms)}",
+            f"!ramp_t_off={int(args.hold_off.duration_in_ms)}",
+        ]
+
+    def get_start_commands(self, args: RamperArgs) -> List[str]:
+        return [
+            "!ramp",
+        ]
+
+    def expected_duration(self, args: RamperArgs) -> Optional[float]:
+        steps = 2 * args.half_range // args.step + 1
+        return steps * (args.hold_on.duration_in_ms + args.hold_off.duration_in_ms) / 1000
@@ -0,0 +1,151 @@
+import math
+from typing import List, Tuple, Type
+
+import attrs
+import numpy as np
+from attrs import validators
+
+from soniccontrol.interfaces import Scriptable
+from soniccontrol.procedures.holder import HolderArgs, convert_to_holder_args
+from soniccontrol.procedures.procedure import Procedure
+from soniccontrol.procedures.status_sampling import check_connection, sample_status
+from soniccontrol.procedures.step_scheduler import StepScheduler
+from soniccontrol.procedures.sweep_result import SweepResult
+from soniccontrol.status_snapshot import StatusSnapshot, to_array
+
+
+@attrs.define(auto_attribs=True)
+class ResonanceSearchArgs:
+    freq_center: int = attrs.field(validator=[
+        validators.instance_of(int),
+        validators.ge(0),
+        validators.le(10000000)
+    ])
+    half_range: int = attrs.field(validator=[
+        validators.instance_of(int),
+        validators.ge(0),
+        validators.le(5000000)
+    ])
+    coarse_step: int = attrs.field(validator=[
+        validators.instance_of(int),
+        validators.ge(10),
+        validators.le(500000)
+    ])
+    resolution: int = attrs.field(default=10, validator=[
+        validators.instance_of(int),
+        validators.ge(1),
+        validators.le(500000)
+    ])
+    points_per_zoom: int = attrs.field(default=11, validator=[
+        validators.instance_of(int),
+        validators.ge(3),
+        validators.le(1000)
+    ])
+    hold_on: HolderArgs = attrs.field(
+        default=HolderArgs(100, "ms"),
+        converter=convert_to_holder_args
+    )
+
+
+@attrs.frozen
+class ResonanceSearchResult:
+    resonance_frequency: int = attrs.field()
+    resolution: int = attrs.field()
+    iterations: int = attrs.field()
+    sweep: SweepResult = attrs.field() # all measured points in the order they were measured
+
+
+def find_resonance_bracket(frequencies: np.ndarray, phase: np.ndarray, impedance: np.ndarray) -> Tuple[int, int, float]:
+    """
+    Finds the interval of the grid that contains the resonance and an estimate of its frequency.
+
+    The resonance is the phase zero-crossing closest to the impedance minimum. The frequency of the crossing
+    is interpolated linearly. If the phase has no zero-crossing on the grid, the impedance minimum and
+    its neighbours are used instead.
+
+    Returns the indices of the lower and upper bound of the interval and the estimated frequency.
+    """
+    best = int(np.argmin(impedance))
+    signs = np.sign(phase)
+    crossings = np.flatnonzero((signs[:-1] != signs[1:]) | (signs[:-1] == 0))
+    if len(crossings) > 0:
+        i = int(crossings[np.argmin(np.abs(crossings + 0.5 - best))])
+        if phase[i] == 0:
+            return i, i + 1, float(frequencies[i])
+        ratio = phase[i] / (phase[i] - phase[i + 1])
+        return i, i + 1, float(frequencies[i] + ratio * (frequencies[i + 1] - frequencies[i]))
+    return max(best - 1, 0), min(best + 1, len(frequencies) - 1), float(frequencies[best])
+
+
+class ResonanceSearchProc(Procedure):
+    """
+    Searches the resonance frequency with a coarse sweep, followed by sweeps that zoom
+    into the interval around the resonance, until the step is not larger than the resolution.
+
+    So a sharp resonance is found with a few dozen measurements, instead of sweeping the whole range
+    with the resolution as step.
+    """
+
+    @classmethod
+    def get_args_class(cls) -> Type:
+        return ResonanceSearchArgs
+
+    async def execute(self, device: Scriptable, args: ResonanceSearchArgs) -> ResonanceSearchResult:
+        """
+        Raises:
+            ConnectionError: If the connection was lost.
+            Exception: If a step was not measured, no impedance could be measured or the phase stays zero.
+        """
+        frequencies: List[int] = []
+        samples: List[StatusSnapshot] = []
+        scheduler = StepScheduler()
+        hold_on_s = args.hold_on.duration_in_ms / 1000
+
+        async def measure(grid: np.ndarray) -> np.ndarray:
+            for frequency in grid:
+                scheduler.begin_step(hold_on_s)
+                await device.execute_command(f"!f={frequency}")
+                check_connection(device)
+                await scheduler.hold_until(hold_on_s)
+                # raises instead of zooming in on a stale snapshot
+                sample = await sample_status(device)
+                scheduler.end_step()
+                frequencies.append(int(frequency))
+                samples.append(sample)
+            return to_array(samples[-len(grid):])
+
+        start = args.freq_center - args.half_range
+        stop = args.freq_center + args.half_range
+        step: float = args.coarse_step
+        # add a step to stop so that stop is inclusive
+        grid = np.arange(start, stop + args.coarse_step, args.coarse_step, dtype=np.int64)
+        iterations = 0
+        try:
+            await device.get_overview()
+            await device.set_signal_on()
+            while True:
+                measured = await measure(grid)
+                iterations += 1
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    impedance = np.where(measured["irms"] > 0, measured["urms"] / measured["irms"], np.inf)
+                if not np.isfinite(impedance).any() or not measured["phase"].any():
+                    # the bracket would just be the first point of the grid
+                    raise Exception("The device did not measure the impedance and the phase, the resonance cannot be found")
+                lower, upper, estimate = find_resonance_bracket(grid, measured["phase"], impedance)
+                if step <= args.resolution or upper == lower:
+                    break
+                # zoom into the bracket, the bounds were already measured, but are needed for finding the next one
+                start, stop = int(grid[lower]), int(grid[upper])
+                step = max(args.resolution, (stop - start) / (args.points_per_zoom - 1))
+                grid = np.unique(np.round(np.arange(start, stop + step / 2, step)).astype(np.int64))
+            resonance_frequency = int(round(estimate))
+            await device.execute_command(f"!f={resonance_frequency}")
+        finally:
+            await device.set_signal_off()
+
+        return ResonanceSearchResult(
+            resonance_frequency=resonance_frequency,
+            resolution=math.ceil(step),
+            iterations=iterations,
+            sweep=SweepResult.from_snapshots(frequencies, samples),
+        )
@@ -1,12 +1,10 @@
-import asyncio
-from typing import Type
+from typing import List, Optional, Type
 
 import attrs
 from attrs import validators
 
-from soniccontrol.interfaces import Scriptable
 from soniccontrol.procedures.holder import HolderArgs, convert_to_holder_args
-from soniccontrol.procedures.procedure import Procedure
+from soniccontrol.procedures.procedure import RemoteProcedure
 
 
 @attrs.define(auto_attribs=True)
@@ -36,20 +34,27 @@ class ScanArgs:
         converter=convert_to_holder_args
     )
 
-class ScanProc(Procedure):
+class ScanProc(RemoteProcedure):
     @classmethod
     def get_args_class(cls) -> Type: 
         return ScanArgs
 
-    async def execute(self, device: Scriptable, args: ScanArgs) -> None:
-        try:
-            await device.execute_command(f"!f={args.Scanning_f_center_Hz}")
-            await device.execute_command(f"!scan_gain={args.Scanning_gain}")
-            await device.execute_command(f"!scan_f_range={args.Scanning_f_range_Hz}")
-            await device.execute_command(f"!scan_f_step={args.Scanning_f_step_Hz}")
-            await device.execute_command(f"!scan_t_step={int(args.Scanning_t_step_ms.duration_in_ms)}")
-            await device.execute_command("!scan")
-        except asyncio.CancelledError:
-            await device.execute_command("!OFF")
-        finally:
-            await device.get_remote_proc_finished_event().wait()
+    def get_arg_commands(self, args: ScanArgs) -> List[str]:
+        return [
+            f"!scan_gain={args.Scanning_gain}",
+            f"!scan_f_range={args.Scanning_f_range_Hz}",
+            f"!scan_f_step={args.Scanning_f_step_Hz}",
+            f"!scan_t_step={int(args.Scanning_t_step_ms.duration_in_ms)}",
+        ]
+
+    def get_start_commands(self, args: ScanArgs) -> List[str]:
+        return [
+            f"!f={args.Scanning_f_center_Hz}",
+            "!scan",
+        ]
+
+    def expected_duration(self, args: ScanArgs) -> Optional[float]:
+        if args.Scanning_f_step_Hz == 0:
+            return None
+        steps = args.Scanning_f_range_Hz // args.Scanning_f_step_Hz + 1
+        return steps * args.Scanning_t_step_ms.duration_in_ms / 1000
@@ -1,12 +1,10 @@
-import asyncio
-from typing import Type
+from typing import List, Optional, Type
 
 import attrs
 from attrs import validators
 
-from soniccontrol.interfaces import Scriptable
 from soniccontrol.procedures.holder import HolderArgs, convert_to_holder_args
-from soniccontrol.procedures.procedure import Procedure
+from soniccontrol.procedures.procedure import RemoteProcedure
 
 
 @attrs.define(auto_attribs=True)
@@ -26,18 +24,22 @@ class TuneArgs:
         converter=convert_to_holder_args
     )
 
-class TuneProc(Procedure):
+class TuneProc(RemoteProcedure):
     @classmethod
     def get_args_class(cls) -> Type: 
         return TuneArgs
 
-    async def execute(self, device: Scriptable, args: TuneArgs) -> None:
-        try:
-            await device.execute_command(f"!tune_f_step={args.Tuning_f_step_Hz}")
-            await device.execute_command(f"!tune_t_time={int(args.Tuning_time_ms.duration_in_ms)}")
-            await device.execute_command(f"!tune_t_step={int(args.Tuning_t_step_ms.duration_in_ms)}")
-            await device.execute_command("!tune")
-        except asyncio.CancelledError:
-            await device.execute_command("!OFF")
-        finally:
-            await device.get_remote_proc_finished_event().wait()
+    def get_arg_commands(self, args: TuneArgs) -> List[str]:
+        return [
+            f"!tune_f_step={args.Tuning_f_step_Hz}",
+            f"!tune_t_time={int(args.Tuning_time_ms.duration_in_ms)}",
+            f"!tune_t_step={int(args.Tuning_t_step_ms.duration_in_ms)}",
+        ]
+
+    def get_start_commands(self, args: TuneArgs) -> List[str]:
+        return [
+            "!tune",
+        ]
+
+    def expected_duration(self, args: TuneArgs) -> Optional[float]:
+        return args.Tuning_time_ms.duration_in_ms / 1000
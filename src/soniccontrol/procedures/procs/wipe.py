@@ -1,12 +1,10 @@
-import asyncio
-from typing import Type
+from typing import List, Type
 
 import attrs
 from attrs import validators
 
-from soniccontrol.interfaces import Scriptable
 from soniccontrol.procedures.holder import HolderArgs, convert_to_holder_args
-from soniccontrol.procedures.procedure import Procedure
+from soniccontrol.procedures.procedure import RemoteProcedure
 
 
 @attrs.define(auto_attribs=True)
@@ -34,20 +32,21 @@ class WipeArgs:
         converter=convert_to_holder_args
     )
 
-class WipeProc(Procedure):
+class WipeProc(RemoteProcedure):
     @classmethod
     def get_args_class(cls) -> Type: 
         return WipeArgs
 
-    async def execute(self, device: Scriptable, args: WipeArgs) -> None:
-        try:
-            await device.execute_command(f"!wipe_f_range={args.Wipe_f_range_Hz}")
-            await device.execute_command(f"!wipe_f_step={args.Wipe_f_step_Hz}")
-            await device.execute_command(f"!wipe_t_on={int(args.Wipe_t_on_ms.duration_in_ms)}")
-            await device.execute_command(f"!wipe_t_off={int(args.Wipe_t_off_ms.duration_in_ms)}")
-            await device.execute_command(f"!wipe_t_pause={int(args.Wipe_t_pause_ms.duration_in_ms)}")
-            await device.execute_command("!wipe")
-        except asyncio.CancelledError:
-            await device.execute_command("!OFF")
-        finally:
-            await device.get_remote_proc_finished_event().wait()
+    def get_arg_commands(self, args: WipeArgs) -> List[str]:
+        return [
+            f"!wipe_f_range={args.Wipe_f_range_Hz}",
+            f"!wipe_f_step={args.Wipe_f_step_Hz}",
+            f"!wipe_t_on={int(args.Wipe_t_on_ms.duration_in_ms)}",
+            f"!wipe_t_off={int(args.Wipe_t_off_ms.duration_in_ms)}",
+            f"!wipe_t_pause={int(args.Wipe_t_pause_ms.duration_in_ms)}",
+        ]
+
+    def get_start_commands(self, args: WipeArgs) -> List[str]:
+        return [
+            "!wipe",
+        ]
@@ -0,0 +1,31 @@
+from soniccontrol.interfaces import Scriptable
+from soniccontrol.status_snapshot import StatusSnapshot
+
+
+def check_connection(device: Scriptable) -> None:
+    """
+    Raises ConnectionError, if the connection to the device was lost.
+    execute_command only logs a lost connection, so procedures have to check it themselves.
+    """
+    if not device.is_connected:
+        raise ConnectionError("The connection to the device was lost")
+
+
+async def sample_status(device: Scriptable) -> StatusSnapshot:
+    """
+    Measures the status with ?sens, if the device has it, or else with a status poll.
+    If ?sens gets no valid answer, the status poll is sent as well.
+
+    Raises:
+        ConnectionError: If the connection was lost.
+        Exception: If no command answered with a valid measurement.
+    """
+    previous_snapshot = device.status_snapshot
+    messages = ["?sens", "-"] if device.has_command("?sens") else ["-"]
+    for message in messages:
+        await device.execute_command(message)
+        check_connection(device)
+        # invalid answers do not replace the snapshot
+        if device.status_snapshot is not previous_snapshot:
+            return device.status_snapshot
+    raise Exception(f"The device did not answer {' or '.join(messages)} with a valid measurement")
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+import attrs
+
+
+@attrs.frozen
+class StepTiming:
+    """
+    Planned and actual timing of a step. All times are in seconds since the scheduler started.
+    """
+    index: int = attrs.field()
+    planned_start: float = attrs.field()
+    actual_start: float = attrs.field()
+    commands_done: float = attrs.field()
+    planned_end: float = attrs.field()
+    actual_end: float = attrs.field()
+
+    @property
+    def command_latency(self) -> float:
+        """ Time the commands at the start of the step took. It is subtracted from the hold. """
+        return self.commands_done - self.actual_start
+
+    @property
+    def start_delay(self) -> float:
+        return self.actual_start - self.planned_start
+
+    @property
+    def overrun(self) -> float:
+        """ How much longer the step took than planned, because its commands took longer than its hold """
+        return max(0., self.actual_end - self.planned_end)
+
+
+class StepScheduler:
+    """
+    Plans steps of a given duration on a monotonic timeline, so that waiting for commands does not add up.
+
+    Each step is planned to start where the previous one was planned to end. The holds of a step wait until
+    deadlines relative to its planned start, instead of sleeping for the hold time after the commands.
+    So the time the commands took is subtracted from the hold.
+    If the commands of a step took longer than its hold, the timeline is moved to the actual end of the step.
+    Then the following steps still get their full durations, instead of being shortened to catch up.
+    The small delays with which sleeps wake up do not move the timeline, so they do not add up either.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self._origin: Optional[float] = None
+        self._next_start: float = 0.
+        self._index: int = -1
+        self._planned_start: float = 0.
+        self._planned_end: float = 0.
+        self._actual_start: float = 0.
+        self._commands_done: Optional[float] = None
+        self._missed_deadline: bool = False
+
+    def _now(self) -> float:
+        assert self._origin is not None
+        return self._clock() - self._origin
+
+    def begin_step(self, duration: float) -> None:
+        """ Starts the next step, that should last the given duration in seconds. """
+        if self._origin is None:
+            self._origin = self._clock()
+        now = self._now()
+        self._index += 1
+        self._planned_start = self._next_start
+        self._planned_end = self._planned_start + duration
+        self._actual_start = now
+        self._commands_done = None
+        self._missed_deadline = False
+
+    def commands_done(self) -> None:
+        """ Marks that the commands of the step were sent. Otherwise the first hold marks it. """
+        self._commands_done = self._now()
+
+    async def hold_until(self, offset: float) -> None:
+        """ Waits until the given time in seconds after the planned start of the step. """
+        if self._commands_done is None:
+            self.commands_done()
+        remaining = self._planned_start + offset - self._now()
+        if remaining > 0:
+            await self._sleep(remaining)
+        else:
+            self._missed_deadline = True
+
+    def end_step(self) -> StepTiming:
+        if self._commands_done is None:
+            self.commands_done()
+        assert self._commands_done is not None
+        actual_end = self._now()
+        if self._missed_deadline:
+            self._next_start = max(self._planned_end, actual_end)
+        else:
+            self._next_start = self._planned_end
+        return StepTiming(
+            index=self._index,
+            planned_start=self._planned_start,
+            actual_start=self._actual_start,
+            commands_done=self._commands_done,
+            planned_end=self._planned_end,
+            actual_end=actual_end,
+        )
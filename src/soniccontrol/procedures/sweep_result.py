@@ -0,0 +1,89 @@
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from soniccontrol.status_snapshot import STATUS_SNAPSHOT_DTYPE, StatusSnapshot, to_array
+
+
+class SweepResult:
+    """
+    Frequency response measured by a sweep. It has one entry per sample: the frequency that was set
+    and the status snapshot that was measured. Sweeps that take one sample at the end of the hold of each step
+    have one entry per step, else the entries are tagged with the index of the step they were taken in.
+
+    The values are stored as numpy arrays, so they can be used for analysis directly.
+    """
+
+    def __init__(self, set_frequencies: np.ndarray, samples: np.ndarray, step_indices: Optional[np.ndarray] = None) -> None:
+        assert samples.dtype == STATUS_SNAPSHOT_DTYPE
+        assert len(set_frequencies) == len(samples)
+        assert step_indices is None or len(step_indices) == len(samples)
+        self._set_frequencies = set_frequencies
+        self._samples = samples
+        self._step_indices = np.arange(len(samples), dtype=np.int64) if step_indices is None else step_indices
+
+    @staticmethod
+    def from_snapshots(
+        set_frequencies: Iterable[int],
+        snapshots: Iterable[StatusSnapshot],
+        step_indices: Optional[Iterable[int]] = None
+    ) -> "SweepResult":
+        return SweepResult(
+            np.array(list(set_frequencies), dtype=np.int64),
+            to_array(snapshots),
+            None if step_indices is None else np.array(list(step_indices), dtype=np.int64)
+        )
+
+    @property
+    def step_indices(self) -> np.ndarray:
+        """ The index of the step in which each sample was taken """
+        return self._step_indices
+
+    @property
+    def set_frequencies(self) -> np.ndarray:
+        """ The frequency in Hz that was set in each step """
+        return self._set_frequencies
+
+    @property
+    def samples(self) -> np.ndarray:
+        """ The status snapshot measured in each step, as structured array with the dtype STATUS_SNAPSHOT_DTYPE """
+        return self._samples
+
+    @property
+    def monotonic_time(self) -> np.ndarray:
+        return self._samples["monotonic_time"]
+
+    @property
+    def frequency(self) -> np.ndarray:
+        """ The frequency the device reported in each step """
+        return self._samples["frequency"]
+
+    @property
+    def urms(self) -> np.ndarray:
+        return self._samples["urms"]
+
+    @property
+    def irms(self) -> np.ndarray:
+        return self._samples["irms"]
+
+    @property
+    def phase(self) -> np.ndarray:
+        return self._samples["phase"]
+
+    @property
+    def temperature(self) -> np.ndarray:
+        return self._samples["temperature"]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """ Saves the result as uncompressed .npz file """
+        np.savez(path, set_frequencies=self._set_frequencies, samples=self._samples, step_indices=self._step_indices)
+
+    @staticmethod
+    def load(path: Union[str, Path]) -> "SweepResult":
+        with np.load(path) as data:
+            step_indices = data["step_indices"] if "step_indices" in data else None
+            return SweepResult(data["set_frequencies"], data["samples"], step_indices)
@@ -1,22 +1,25 @@
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from soniccontrol.builder import DeviceBuilder
 from soniccontrol.communication.communicator_builder import CommunicatorBuilder
-from soniccontrol.communication.connection_factory import CLIConnectionFactory, ConnectionFactory, SerialConnectionFactory
+from soniccontrol.communication.connection_factory import CLIConnectionFactory, ConnectionFactory, SerialConnectionFactory, TcpConnectionFactory
 from soniccontrol.logging import create_logger_for_connection
 from soniccontrol.procedures.procedure_controller import ProcedureController, ProcedureType
 from soniccontrol.procedures.procs.ramper import RamperArgs
+from soniccontrol.procedures.sweep_result import SweepResult
 from soniccontrol.scripting.legacy_scripting import LegacyScriptingFacade
 from soniccontrol.scripting.scripting_facade import ScriptingFacade
 from soniccontrol.sonic_device import SonicDevice
+from soniccontrol.status_history import StatusHistory
 
 
 class RemoteController:
     NOT_CONNECTED = "Controller is not connected to a device"
 
-    def __init__(self, log_path: Optional[Path]=None):
+    def __init__(self, log_path: Optional[Path]=None, status_history_capacity: int = 10_000):
         self._device: Optional[SonicDevice] = None
+        self._status_history_capacity = status_history_capacity
         self._scripting: Optional[ScriptingFacade] = None
         self._proc_controller: Optional[ProcedureController] = None
         self._log_path: Optional[Path] = log_path
@@ -31,6 +34,7 @@ class RemoteController:
             logger=logger
         )
         self._device = await DeviceBuilder().build_amp(ser=serial, commands=commands, logger=logger)
+        self._device.status_history = StatusHistory(self._status_history_capacity)
         await self._device.serial.connection_opened.wait()
         self._scripting = LegacyScriptingFacade(self._device)
         self._proc_controller = ProcedureController(self._device)
@@ -49,6 +53,26 @@ class RemoteController:
         await self._connect(connection_factory, connection_name)
         assert self._device is not None
 
+    async def connect_via_tcp(self, host: str, port: int, **kwargs) -> None:
+        """
+        Connects to a device behind a serial device server.
+        The kwargs are passed to the TcpConnectionFactory (protocol, baudrate, no_delay, ...).
+        """
+        assert self._device is None
+        connection_name = f"{host}_{port}"
+        connection_factory = TcpConnectionFactory(
+            connection_name=connection_name, host=host, port=port, **kwargs
+        )
+        await self._connect(connection_factory, connection_name)
+        assert self._device is not None
+
+    @property
+    def status_history(self) -> StatusHistory:
+        """ The status snapshots of all commands sent to the connected device """
+        assert self._device is not None,    RemoteController.NOT_CONNECTED
+        assert self._device.status_history is not None
+        return self._device.status_history
+
     async def set_attr(self, attr: str, val: str) -> str:
         assert self._device is not None,    RemoteController.NOT_CONNECTED
         return await self._device.execute_command("!" + attr + "=" + val)
@@ -75,6 +99,23 @@ class RemoteController:
 
         self._proc_controller.execute_proc(ProcedureType.RAMP, ramp_args)
 
+    async def sweep(self, ramp_args: RamperArgs) -> Optional[SweepResult]:
+        """
+        Executes a ramp and waits until it finished.
+        Returns the measured frequency response, or None if the ramp runs on the device itself.
+        """
+        assert self._device is not None,    RemoteController.NOT_CONNECTED
+        assert self._proc_controller is not None
+
+        return await self._proc_controller.run_proc(ProcedureType.RAMP, ramp_args)
+
+    @property
+    def last_procedure_result(self) -> Any:
+        assert self._device is not None,    RemoteController.NOT_CONNECTED
+        assert self._proc_controller is not None
+
+        return self._proc_controller.last_result
+
     def execute_procedure(self, procedure: ProcedureType, args: dict) -> None:
         assert self._device is not None,    RemoteController.NOT_CONNECTED
         assert self._proc_controller is not None
@@ -0,0 +1,103 @@
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+import attrs
+
+from soniccontrol.scripting.scripting_facade import BuiltInFunctions
+
+
+class OpCode(IntEnum):
+    SEND = 0 # sends the line as it is to the device
+    CALL = 1 # calls a built-in function
+    LOOP_START = 2
+    LOOP_END = 3
+
+
+# The built-in functions by the name they are called in the scripts
+_FUNCTIONS: Dict[str, BuiltInFunctions] = {
+    **{ function.value: function for function in BuiltInFunctions },
+    "AUTO": BuiltInFunctions.AUTO,
+}
+
+
+@attrs.frozen
+class CompiledScript:
+    """
+    A legacy script compiled into parallel arrays, one entry per line, so that it can be executed
+    without looking anything up. Loops jump with a precomputed jump table and count their remaining
+    iterations in counter slots, which are kept separately by the sequencer.
+    """
+    opcodes: Tuple[OpCode, ...] = attrs.field()
+    functions: Tuple[Optional[BuiltInFunctions], ...] = attrs.field() # the function of CALL lines
+    commands: Tuple[str, ...] = attrs.field() # the command of each line as written in the script
+    arguments: Tuple[Any, ...] = attrs.field()
+    jumps: Tuple[int, ...] = attrs.field() # LOOP_START: the line after the loop, LOOP_END: the line of LOOP_START
+    slots: Tuple[int, ...] = attrs.field() # the counter slot of the loop of LOOP_START and LOOP_END lines
+    initial_counters: Tuple[int, ...] = attrs.field() # the iterations of each loop, -1 for endless loops
+    nested_slots: Tuple[Tuple[int, ...], ...] = attrs.field() # the slots of the loops inside each loop
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def new_counters(self) -> List[int]:
+        return list(self.initial_counters)
+
+
+def compile_script(commands: List[Dict[str, Any]]) -> CompiledScript:
+    """
+    Compiles the parsed lines of a script, as returned by the SonicParser.
+
+    Raises:
+        ValueError: If a line calls an unknown function or the loops are not closed
+    """
+    opcodes: List[OpCode] = []
+    functions: List[Optional[BuiltInFunctions]] = []
+    jumps: List[int] = [-1] * len(commands)
+    slots: List[int] = [-1] * len(commands)
+    initial_counters: List[int] = []
+    nested_slots: List[List[int]] = []
+    open_loops: List[int] = [] # slots of the loops the current line is in
+
+    for line, command in enumerate(commands):
+        name: str = command["command"]
+        function: Optional[BuiltInFunctions] = None
+        if name == "startloop":
+            opcode = OpCode.LOOP_START
+            slot = len(initial_counters)
+            for outer_slot in open_loops:
+                nested_slots[outer_slot].append(slot)
+            initial_counters.append(command["loop"]["quantifier"])
+            nested_slots.append([])
+            open_loops.append(slot)
+            slots[line] = slot
+            jumps[line] = command["loop"]["end"] + 1
+        elif name == "endloop":
+            opcode = OpCode.LOOP_END
+            if not open_loops:
+                raise ValueError(f"The endloop in line {line} has no startloop")
+            slot = open_loops.pop()
+            slots[line] = slot
+            jumps[line] = slots.index(slot) # the line of the startloop
+        elif name.startswith(("!", "?")):
+            opcode = OpCode.SEND
+        else:
+            opcode = OpCode.CALL
+            function = _FUNCTIONS.get(name)
+            if function is None:
+                raise ValueError(f"{command} is not valid.")
+        opcodes.append(opcode)
+        functions.append(function)
+
+    if open_loops:
+        raise ValueError("Syntax of loops is invalid. Maybe you forgot to close a loop?")
+
+    return CompiledScript(
+        opcodes=tuple(opcodes),
+        functions=tuple(functions),
+        commands=tuple(command["command"] for command in commands),
+        arguments=tuple(command["argument"] for command in commands),
+        jumps=tuple(jumps),
+        slots=tuple(slots),
+        initial_counters=tuple(initial_counters),
+        nested_slots=tuple(tuple(nested) for nested in nested_slots),
+    )
@@ -1,9 +1,11 @@
 import logging
 from typing import List, Optional, Dict, Any, Union, Tuple
-import copy
 import attrs
+from soniccontrol.procedures.duration_estimator import DurationEstimate
 from soniccontrol.procedures.holder import Holder, convert_to_holder_args
+from soniccontrol.procedures.procedure import ProcedureCheckpoint
 from soniccontrol.procedures.procedure_controller import ProcedureController
+from soniccontrol.scripting.legacy_compiler import CompiledScript, OpCode, compile_script
 from soniccontrol.scripting.scripting_facade import BuiltInFunctions, Script, ScriptingFacade
 from soniccontrol.sonic_device import SonicDevice
 from soniccontrol.logging import get_base_logger
@@ -139,30 +141,42 @@ class SonicParser:
             raise ValueError("One or more commands are illegal or written wrong")
 
 
+@attrs.define()
+class ScriptCheckpoint:
+    """
+    Progress of a script: the line to execute next and the loop counters.
+    If the script was interrupted during a ramp, it has the checkpoint of the ramp too.
+    """
+    current_line: int = attrs.field()
+    counters: List[int] = attrs.field()
+    procedure: Optional[ProcedureCheckpoint] = attrs.field(default=None)
+
+
 @attrs.define()
 class LegacySequencer(Script):
     _sonicamp: SonicDevice = attrs.field(repr=False)
     _logger: logging.Logger = attrs.field()
     _proc_controller: ProcedureController = attrs.field()
-    _commands: List[Any] = attrs.field(factory=list)
-    _original_commands: List[Any] = attrs.field(factory=list)
+    _program: CompiledScript = attrs.field()
+    _counters: List[int] = attrs.field(init=False, factory=list)
     _current_line: int = attrs.field(default=0)
     _commands_aliases: List[BuiltInFunctions] = attrs.field(init=False, default=list(BuiltInFunctions))
     _current_command: str = attrs.field(init=False, default="")
+    _ramp_checkpoint: Optional[ProcedureCheckpoint] = attrs.field(init=False, default=None)
 
     def __init__(
         self,
         sonicamp: SonicDevice,
         logger: logging.Logger,
         proc_controller: ProcedureController,
-        commands: List[Any],
-        original_commands: List[Any],
+        program: CompiledScript,
         include_command_aliases: Optional[List[BuiltInFunctions]] = None,
         exclude_command_aliases: Optional[List[BuiltInFunctions]] = None
     ) -> None:
         super().__init__()
         logger = logging.getLogger(logger.name + "." + LegacySequencer.__name__)
-        self.__attrs_init__(sonicamp, logger, proc_controller, commands, original_commands)
+        self.__attrs_init__(sonicamp, logger, proc_controller, program)
+        self._counters = program.new_counters()
         if include_command_aliases:
             self._commands_aliases = include_command_aliases.copy()
         if exclude_command_aliases:
@@ -179,7 +193,26 @@ class LegacySequencer(Script):
 
     @property
     def is_finished(self) -> bool:
-        return self._current_line >= len(self._commands)
+        return self._current_line >= len(self._program)
+
+    @property
+    def checkpoint(self) -> ScriptCheckpoint:
+        """ The progress of the script. The current line was not completed yet. """
+        procedure: Optional[ProcedureCheckpoint] = None
+        if not self.is_finished and self._program.functions[self._current_line] in (
+            BuiltInFunctions.RAMP_FREQ, BuiltInFunctions.RAMP_FREQ_RANGE
+        ):
+            procedure = self._ramp_checkpoint
+        return ScriptCheckpoint(self._current_line, list(self._counters), procedure)
+
+    def restore(self, checkpoint: ScriptCheckpoint) -> None:
+        """ Continues the script from the checkpoint, instead of from the beginning """
+        if len(checkpoint.counters) != len(self._counters) or checkpoint.current_line > len(self._program):
+            raise Exception("The checkpoint does not belong to this script")
+        self._logger.info("Resume script at line %d", checkpoint.current_line)
+        self._counters = list(checkpoint.counters)
+        self._current_line = checkpoint.current_line
+        self._ramp_checkpoint = checkpoint.procedure
 
     async def _before_script(self) -> None:
         await self._sonicamp.get_overview()
@@ -188,78 +221,84 @@ class LegacySequencer(Script):
         await self._sonicamp.set_signal_off()
 
     async def _execute_step(self) -> None: 
-        if self._commands[self._current_line]["command"] == "startloop":
+        opcode = self._program.opcodes[self._current_line]
+        if opcode == OpCode.LOOP_START:
             self.startloop_response()
-        elif self._commands[self._current_line]["command"] == "endloop":
+        elif opcode == OpCode.LOOP_END:
             self.endloop_response()
         else:
             await self.execute_command(self._current_line)
+            if not self._sonicamp.is_connected:
+                # the line is not completed, so that resuming the script sends it again
+                raise ConnectionError("The connection to the device was lost")
             self._current_line += 1
 
     def startloop_response(self) -> None:
-        loop: Dict[str, int] = self._commands[self._current_line]["loop"]
-        if (
-            loop.get("quantifier")
-            and isinstance(loop.get("quantifier"), int)
-            and loop.get("quantifier") != -1
-        ):
-            loop["quantifier"] -= 1
+        slot = self._program.slots[self._current_line]
+        counter = self._counters[slot]
+        if counter > 0:
+            self._counters[slot] = counter - 1
             self._current_line += 1
-        elif loop.get("quantifier") == -1:
+        elif counter == -1:
             self._current_line += 1
         else:
-            self._logger.debug("Jumping to %d; quantifier = 0", loop['end'] + 1)
-            self._current_line = loop["end"] + 1
+            self._logger.debug("Jumping to %d; quantifier = 0", self._program.jumps[self._current_line])
+            self._current_line = self._program.jumps[self._current_line]
 
     def endloop_response(self) -> None:
         self._logger.debug("'endloop' @ %d", self._current_line)
-        loop_command: dict[str, int] = list(
-            filter(
-                lambda x: (x["loop"].get("end") == self._current_line), self._commands
-            )
-        )[0]
-        loop: Dict[str, Any] = loop_command["loop"]
-        self._commands[loop["begin"] + 1 : loop["end"] - 1] = copy.deepcopy(
-            self._original_commands[loop["begin"] + 1 : loop["end"] - 1]
-        )
-        self._current_line = loop["begin"]
+        # the loops inside start over with the next iteration
+        for nested_slot in self._program.nested_slots[self._program.slots[self._current_line]]:
+            self._counters[nested_slot] = self._program.initial_counters[nested_slot]
+        self._current_line = self._program.jumps[self._current_line]
 
-    async def _execute_command_alias(self, command: Dict[str, Any]) -> None:
-        enum_type = next((elem for elem in BuiltInFunctions if elem.value == command["command"]), None)
-        match enum_type:
+    async def _execute_command_alias(self, function: Optional[BuiltInFunctions], argument: Any) -> None:
+        match function:
             case BuiltInFunctions.FREQUENCY:
-                await self._sonicamp.set_frequency(command["argument"])
+                await self._sonicamp.set_frequency(argument)
             case BuiltInFunctions.GAIN:
-                await self._sonicamp.set_gain(command["argument"])
-            case BuiltInFunctions.RAMP_FREQ:
-                self._current_command = "ramp_freq"
-                await self._proc_controller.ramp_freq(*command["argument"])
-            case BuiltInFunctions.RAMP_FREQ_RANGE:
+                await self._sonicamp.set_gain(argument)
+            case BuiltInFunctions.RAMP_FREQ | BuiltInFunctions.RAMP_FREQ_RANGE:
                 self._current_command = "ramp_freq"
-                await self._proc_controller.ramp_freq_range(*command["argument"])
-            case "!AUTO" | "AUTO" | BuiltInFunctions.AUTO:
+                await self._ramp(function, argument)
+            case BuiltInFunctions.AUTO:
                 await self._sonicamp.set_signal_auto()
             case BuiltInFunctions.HOLD:
                 self._current_command = "Hold"
-                holder_args = convert_to_holder_args(command["argument"])
+                holder_args = convert_to_holder_args(argument)
                 await Holder.execute(holder_args)
             case BuiltInFunctions.ON:
                 await self._sonicamp.set_signal_on()
             case BuiltInFunctions.OFF:
                 await self._sonicamp.set_signal_off()
             case _:
-                raise ValueError(f"{command} is not valid.") # FIXME program halts when this error gets raised
+                raise ValueError(f"{function} is not valid.") # FIXME program halts when this error gets raised
 
 
+    async def _ramp(self, ramp_type: BuiltInFunctions, argument: Any) -> None:
+        ramp_checkpoint, self._ramp_checkpoint = self._ramp_checkpoint, None
+        try:
+            if ramp_checkpoint is not None:
+                await self._proc_controller.resume_ramp(ramp_checkpoint)
+            elif ramp_type == BuiltInFunctions.RAMP_FREQ:
+                await self._proc_controller.ramp_freq(*argument)
+            else:
+                await self._proc_controller.ramp_freq_range(*argument)
+        except BaseException:
+            # keep the progress of the ramp, so that resuming the script does not repeat its completed steps
+            self._ramp_checkpoint = self._proc_controller.checkpoint
+            raise
+
     async def execute_command(self, line: int) -> None:
-        command: Dict[str, Any] = self._commands[self._current_line]
-        self._current_command = f'Executing {command["command"]} {command["argument"]}'
-        self._logger.info(f"Executing command: '%s'", str(command))
+        command = self._program.commands[line]
+        argument = self._program.arguments[line]
+        self._current_command = f'Executing {command} {argument}'
+        self._logger.info("Executing command: '%s %s'", command, argument)
 
-        if command["command"].startswith(("?", "!")):
-            await self._sonicamp.execute_command(command["command"])
+        if self._program.opcodes[line] == OpCode.SEND:
+            await self._sonicamp.execute_command(command)
         else:
-            await self._execute_command_alias(command)
+            await self._execute_command_alias(self._program.functions[line], argument)
 
 
 class LegacyScriptingFacade(ScriptingFacade):
@@ -271,26 +310,38 @@ class LegacyScriptingFacade(ScriptingFacade):
         self._include_command_aliases: Optional[List[BuiltInFunctions]] = kwargs.get("include_command_aliases", None)
         self._exclude_command_aliases: Optional[List[BuiltInFunctions]] = kwargs.get("exclude_command_aliases", None)
 
-    def parse_script(self, text: str) -> LegacySequencer:
-        self._logger.debug("Parse script:\n%s", text)
+    def _parse_commands(self, text: str) -> List[Dict[str, Any]]:
         parsed_test = self._parser.parse_text(text)
         parsed_test = zip(
             parsed_test["commands"], parsed_test["arguments"], parsed_test["loops"]
         )
 
-        commands = list(
+        return list(
             {"command": command, "argument": argument, "loop": loop}
             for command, argument, loop in parsed_test
         )
-        original_commands = copy.deepcopy(commands)
-        
-        self._logger.debug("parsed commands:\n%s", str(original_commands))
+
+    def parse_script(self, text: str, checkpoint: Optional[ScriptCheckpoint] = None) -> LegacySequencer:
+        """
+        Parses and compiles the script. With a checkpoint of the same script, it resumes where the checkpoint was taken.
+        """
+        self._logger.debug("Parse script:\n%s", text)
+        commands = self._parse_commands(text)
+        self._logger.debug("parsed commands:\n%s", str(commands))
         interpreter = LegacySequencer(
-            self._device, self._logger, self._proc_controller, 
-            commands=commands, original_commands=original_commands,
+            self._device, self._logger, self._proc_controller, compile_script(commands),
             include_command_aliases=self._include_command_aliases,
             exclude_command_aliases=self._exclude_command_aliases
         )     
+        if checkpoint is not None:
+            interpreter.restore(checkpoint)
         return interpreter
 
+    def estimate_duration(self, text: str) -> DurationEstimate:
+        """
+        Predicts how long the script runs on the device, with the latencies measured on the link so far.
+        Scripts with endless loops take forever.
+        """
+        return self._proc_controller.estimate_script_duration(self._parse_commands(text))
+
     def lint_text(self, text: str) -> str: ...
@@ -1,20 +1,25 @@
 import asyncio
-import json
 import logging
+import math
+import time
 from typing import Any, Literal, Optional, Union, Iterable, Dict
 
 import attrs
 from icecream import ic
+from soniccontrol.answer_cache import AnswerCache
 from soniccontrol.device_data import Info, Status
+from soniccontrol.command import Answer
 from soniccontrol.commands import Command, CommandValidator
 from soniccontrol.interfaces import Scriptable
+from soniccontrol.link_statistics import LinkStatistics
+from soniccontrol.logging import is_tracing, trace
+from soniccontrol.status_history import StatusHistory
+from soniccontrol.status_snapshot import StatusSnapshot
 from soniccontrol.procedures.procs.ramper import Ramper
 from soniccontrol.communication.serial_communicator import Communicator
 
 CommandValitors = Union[CommandValidator, Iterable[CommandValidator]]
 
-parrot_feeder = logging.getLogger("parrot_feeder")
-
 
 @attrs.define(kw_only=True)
 class SonicDevice(Scriptable):
@@ -25,6 +30,11 @@ class SonicDevice(Scriptable):
     _status: Status = attrs.field()
     _info: Info = attrs.field()
     _ramp: Optional[Ramper] = attrs.field(init=False, default=None)
+    _answer_cache: Optional[AnswerCache] = attrs.field(default=None)
+    _status_snapshot: StatusSnapshot = attrs.field(init=False, factory=StatusSnapshot)
+    _status_history: Optional[StatusHistory] = attrs.field(default=None)
+    _procedure_reported_at: float = attrs.field(init=False, default=-math.inf)
+    _link_statistics: LinkStatistics = attrs.field(init=False, factory=LinkStatistics)
 
     def __attrs_post_init__(self) -> None:
         self._logger = logging.getLogger(self._logger.name + "." + SonicDevice.__name__)
@@ -37,6 +47,14 @@ class SonicDevice(Scriptable):
     def serial(self, serial: Communicator) -> None:
         self._serial = serial
 
+    @property
+    def is_connected(self) -> bool:
+        """
+        False after the connection was closed or lost. execute_command does not raise, if the connection
+        gets lost, so procedures check this after their commands.
+        """
+        return self._serial.connection_opened.is_set()
+
     @property
     def commands(self) -> Dict[str, Command]:
         return self._commands
@@ -49,12 +67,70 @@ class SonicDevice(Scriptable):
     def info(self) -> Info:
         return self._info
 
+    @property
+    def status_snapshot(self) -> StatusSnapshot:
+        """
+        The status values of the last valid answer, built directly from the results of the validators.
+        Use it instead of status, where many samples are needed. Invalid answers do not replace it,
+        so a new snapshot after a command means that the device answered it.
+        """
+        return self._status_snapshot
+
+    @property
+    def status_history(self) -> Optional[StatusHistory]:
+        """
+        If set, every status snapshot of the device is appended to it.
+        """
+        return self._status_history
+
+    @status_history.setter
+    def status_history(self, status_history: Optional[StatusHistory]) -> None:
+        self._status_history = status_history
+
+    @property
+    def procedure_reported_at(self) -> float:
+        """
+        The time.monotonic of the last answer, that reported the running procedure, like a status poll
+        or a package of the status stream. It is -inf, if there was none yet.
+        """
+        return self._procedure_reported_at
+
+    def _update_status_snapshot(self, status_result: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        self._status_snapshot = self._status_snapshot.updated(status_result, now)
+        if "procedure" in status_result:
+            self._procedure_reported_at = now
+        if self._status_history is not None:
+            self._status_history.append(self._status_snapshot)
+
+    @property
+    def link_statistics(self) -> LinkStatistics:
+        """ The measured round trip times of the commands sent to the device """
+        return self._link_statistics
+
+    @property
+    def answer_cache(self) -> Optional[AnswerCache]:
+        """
+        The cache for the answers of getters that rarely change. Caching is off, if it is None.
+        """
+        return self._answer_cache
+
+    @answer_cache.setter
+    def answer_cache(self, answer_cache: Optional[AnswerCache]) -> None:
+        self._answer_cache = answer_cache
+
+    @property
+    def supports_status_stream(self) -> bool:
+        return self.has_command("!stream=")
+
     def get_remote_proc_finished_event(self) -> asyncio.Event:
         return self._status.remote_proc_finished_running
 
     async def disconnect(self) -> None:
         if self.serial.connection_opened.is_set():
             self._logger.info("Disconnect")
+            if self._answer_cache is not None:
+                self._answer_cache.clear()
             await self.serial.close_communication()
             del self
 
@@ -100,6 +176,16 @@ class SonicDevice(Scriptable):
             ) is not None
         )
 
+    def status_has_values(self, *names: str) -> bool:
+        """
+        Returns True if the answer of the status command contains all the values with the given names.
+        """
+        status_command = self._commands.get("-")
+        if status_command is None:
+            return False
+        value_names = set().union(*(validator.value_names for validator in status_command.validators))
+        return set(names) <= value_names
+
     async def send_message(self, message: str = "", argument: Any = "", should_log: bool = True) -> str:
         return (
             await Command(
@@ -136,6 +222,8 @@ class SonicDevice(Scriptable):
             - If the command is not found in the SonicDevice device's commands, it will be executed as a new command.
             - The status of the device will be updated with the command's status result and any additional status keyword arguments.
             - The command's answer will be returned as a string.
+            - If the answer cache is enabled, cached answers are returned without sending the message
+              and without updating the status. Setters invalidate the cached answers they change.
 
         Example:
             >>> sonicamp = SonicDevice()
@@ -146,26 +234,90 @@ class SonicDevice(Scriptable):
             message = message if isinstance(message, str) else message.message
             if should_log:
                 self._logger.info("Execute command %s with argument %s", message, str(argument))
+            cache = self._answer_cache
+            if cache is not None:
+                cached_answer = cache.get(message, argument)
+                if cached_answer is not None:
+                    self._logger.debug("Answer of %s taken from the cache", message)
+                    return cached_answer
+                cache.invalidate(message)
             if message not in self._commands.keys():
                 self._logger.debug("Command not found in commands of sonicamp %s", message)
                 self._logger.debug("Executing message as a new Command...")
-                return await self.send_message(message=message, argument=argument, should_log=should_log)
+                sent_at = time.monotonic()
+                answer_string = await self.send_message(message=message, argument=argument, should_log=should_log)
+                self._link_statistics.record(message, time.monotonic() - sent_at)
+                if cache is not None:
+                    cache.invalidate(message)
+                return answer_string
             
             command: Command = self._commands[message]
-            await command.execute(argument=argument, connection=self._serial, should_log=should_log)
+            sent_at = time.monotonic()
+            answer, status_result = await command.execute(
+                argument=argument, connection=self._serial, should_log=should_log
+            )
+            self._link_statistics.record(message, time.monotonic() - sent_at)
+            if cache is not None:
+                # getters that were answered while the setter was sent, may have cached the old value
+                cache.invalidate(message)
+                if answer.valid:
+                    cache.put(message, argument, answer.string)
         except Exception as e:
             self._logger.error(e)
             await self.disconnect()
             return str(e)
 
+        if answer.valid:
+            self._update_status_snapshot({**status_result, **status_kwargs_if_valid_command})
         await self._status.update(
-            **command.status_result, **status_kwargs_if_valid_command
+            **status_result, **status_kwargs_if_valid_command
         )
 
-        if should_log:
-            parrot_feeder.debug("DEVICE_STATE(%s)", json.dumps(self._status.get_dict()))
+        if should_log and is_tracing():
+            trace("DEVICE_STATE", self._status.get_dict())
+
+        return answer.string
+
+    async def start_status_stream(self, interval_ms: int) -> str:
+        """
+        Asks the device to push a status package every interval_ms milliseconds.
+        The packages can then be consumed with receive_streamed_status.
+        """
+        assert self.supports_status_stream
+        return await self.execute_command("!stream=", interval_ms, should_log=False)
+
+    async def stop_status_stream(self) -> str:
+        return await self.execute_command("!stream=", 0, should_log=False)
+
+    async def receive_streamed_status(self, timeout: Optional[float] = None) -> Status:
+        """
+        Waits for the next status package pushed by the device and updates the status with it.
+        Packages that cannot be validated are skipped.
+
+        Args:
+            timeout (Optional[float]): Maximal time in seconds to wait for a single package.
+
+        Returns:
+            Status: The updated status of the device.
 
-        return command.answer.string
+        Raises:
+            asyncio.TimeoutError: If the device did not push a package in the given timeout.
+        """
+        status_command = self._commands["-"]
+        while True:
+            package = await asyncio.wait_for(self._serial.read_status_package(), timeout)
+            answer = Answer()
+            answer.receive_answer(package)
+            valid, status_result = status_command.validate_answer(answer)
+            if valid:
+                break
+            self._logger.debug("Could not validate streamed status package %s", package)
+
+        self._update_status_snapshot(status_result)
+        await self._status.update(
+            **status_result, timestamp=answer.received_timestamp
+        )
+        return self._status
 
     async def get_help(self) -> str:
         return await self.execute_command("?help")
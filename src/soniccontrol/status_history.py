@@ -0,0 +1,70 @@
+from typing import Optional
+
+import numpy as np
+
+from soniccontrol.status_snapshot import STATUS_SNAPSHOT_DTYPE, StatusSnapshot
+
+
+class StatusHistory:
+    """
+    Ring buffer of the last status snapshots of a device, stored as a preallocated numpy structured array.
+
+    Every snapshot is written twice, at its slot and at its slot plus the capacity. So the last n snapshots
+    are always a contiguous slice of the buffer and can be returned as views without copying.
+    Views share the memory of the buffer, they get overwritten by later appends once the buffer wrapped around.
+    Copy them, if they are kept longer.
+
+    The snapshots have to be appended in the order of their monotonic_time, so time ranges can be found
+    with a binary search.
+    """
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        assert capacity > 0
+        self._capacity = capacity
+        self._buffer = np.zeros(2 * capacity, dtype=STATUS_SNAPSHOT_DTYPE)
+        self._write_count = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def write_count(self) -> int:
+        """ The number of snapshots appended so far, including the ones that were overwritten """
+        return self._write_count
+
+    def __len__(self) -> int:
+        return min(self._write_count, self._capacity)
+
+    def append(self, snapshot: StatusSnapshot) -> None:
+        slot = self._write_count % self._capacity
+        self._buffer[slot] = snapshot
+        self._buffer[slot + self._capacity] = snapshot
+        self._write_count += 1
+
+    def latest(self) -> Optional[StatusSnapshot]:
+        if self._write_count == 0:
+            return None
+        return StatusSnapshot._make(self._buffer[(self._write_count - 1) % self._capacity].item())
+
+    def view(self, last: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the stored snapshots, or only the last ones, from the oldest to the newest as a view of the buffer.
+        """
+        length = len(self) if last is None else min(last, len(self))
+        end = (self._write_count - 1) % self._capacity + 1
+        if self._write_count > self._capacity:
+            end += self._capacity # the newest snapshots are contiguous with the older ones only in the mirror
+        return self._buffer[end - length:end]
+
+    def between(self, start: float, stop: float) -> np.ndarray:
+        """
+        Returns the snapshots with start <= monotonic_time < stop as a view of the buffer.
+        """
+        snapshots = self.view()
+        times = snapshots["monotonic_time"]
+        first, last = np.searchsorted(times, [start, stop], side="left")
+        return snapshots[first:last]
+
+    def clear(self) -> None:
+        self._write_count = 0
@@ -0,0 +1,121 @@
+import math
+import struct
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, NamedTuple, Optional, Tuple
+
+from soniccontrol.device_data import Status
+
+
+class StatusRecord(NamedTuple):
+    timestamp: float
+    error: int
+    frequency: int
+    gain: int
+    procedure: int
+    signal: bool
+    wipe_mode: bool
+    urms: float
+    irms: float
+    phase: float
+    temperature: Optional[float]
+
+
+class StatusRingBuffer:
+    """
+    Ring buffer of status records in shared memory, so that a process can publish the status
+    of a device and other processes can read it without copying it through a pipe.
+
+    There is exactly one writer. Every slot starts with a sequence number that is odd while
+    the slot is written, so readers can detect records that got overwritten while reading them.
+    The header holds the capacity and the number of records written so far.
+    """
+
+    _HEADER = struct.Struct("<QQ")
+    _SEQUENCE = struct.Struct("<Q")
+    _RECORD = struct.Struct("<dqqqq??dddd")
+    _SLOT_SIZE = _SEQUENCE.size + _RECORD.size
+
+    def __init__(self, shared_memory: SharedMemory, capacity: int, is_owner: bool) -> None:
+        self._shared_memory = shared_memory
+        self._buffer = shared_memory.buf
+        self._capacity = capacity
+        self._is_owner = is_owner
+
+    @classmethod
+    def create(cls, capacity: int) -> "StatusRingBuffer":
+        assert capacity > 0
+        size = cls._HEADER.size + capacity * cls._SLOT_SIZE
+        shared_memory = SharedMemory(create=True, size=size)
+        shared_memory.buf[:size] = bytes(size)
+        cls._HEADER.pack_into(shared_memory.buf, 0, capacity, 0)
+        return cls(shared_memory, capacity, is_owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "StatusRingBuffer":
+        shared_memory = SharedMemory(name=name)
+        capacity, _ = cls._HEADER.unpack_from(shared_memory.buf, 0)
+        return cls(shared_memory, capacity, is_owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def write_count(self) -> int:
+        return self._HEADER.unpack_from(self._buffer, 0)[1]
+
+    def _slot_offset(self, index: int) -> int:
+        return self._HEADER.size + (index % self._capacity) * self._SLOT_SIZE
+
+    def write(self, status: Status) -> None:
+        index = self.write_count
+        offset = self._slot_offset(index)
+        temperature = status.temperature if status.temperature is not None else math.nan
+
+        self._SEQUENCE.pack_into(self._buffer, offset, 2 * index + 1)
+        self._RECORD.pack_into(
+            self._buffer, offset + self._SEQUENCE.size,
+            status.timestamp.timestamp(),
+            status.error, status.frequency, status.gain, status.procedure,
+            status.signal, status.wipe_mode,
+            status.urms, status.irms, status.phase, temperature,
+        )
+        self._SEQUENCE.pack_into(self._buffer, offset, 2 * index + 2)
+        self._HEADER.pack_into(self._buffer, 0, self._capacity, index + 1)
+
+    def read_since(self, index: int) -> Tuple[List[StatusRecord], int]:
+        """
+        Reads all records written since the given index.
+
+        Args:
+            index (int): The write count returned by the previous call, 0 for the first one.
+
+        Returns:
+            Tuple[List[StatusRecord], int]: The records in the order they were written and the index
+            for the next call. If the reader fell more than the capacity behind, the oldest records are lost.
+        """
+        write_count = self.write_count
+        index = max(index, write_count - self._capacity)
+        records: List[StatusRecord] = []
+        for i in range(index, write_count):
+            offset = self._slot_offset(i)
+            sequence_before, = self._SEQUENCE.unpack_from(self._buffer, offset)
+            values = self._RECORD.unpack_from(self._buffer, offset + self._SEQUENCE.size)
+            sequence_after, = self._SEQUENCE.unpack_from(self._buffer, offset)
+            if sequence_before != 2 * i + 2 or sequence_after != sequence_before:
+                continue # the writer already overwrote this slot
+            record = StatusRecord(*values)
+            if math.isnan(record.temperature):
+                record = record._replace(temperature=None)
+            records.append(record)
+        return records, write_count
+
+    def close(self) -> None:
+        self._buffer = None
+        self._shared_memory.close()
+        if self._is_owner:
+            self._shared_memory.unlink()
@@ -0,0 +1,60 @@
+import math
+from typing import Any, Dict, Iterable, NamedTuple
+
+import numpy as np
+
+
+class StatusSnapshot(NamedTuple):
+    """
+    Compact copy of the status values of a device at one point in time.
+
+    Unlike Status, it is an immutable tuple without converters, validators or events. So it is cheap to create,
+    copy and keep in large numbers. The timestamp is taken from time.monotonic, so the time between two snapshots
+    is exact, even if the clock of the system is adjusted. Unknown temperatures are stored as nan.
+    """
+    monotonic_time: float = 0.
+    error: int = 0
+    frequency: int = 0
+    gain: int = 0
+    procedure: int = 0
+    signal: bool = False
+    wipe_mode: bool = False
+    urms: float = 0.
+    irms: float = 0.
+    phase: float = 0.
+    temperature: float = math.nan
+
+    def updated(self, status_result: Dict[str, Any], monotonic_time: float) -> "StatusSnapshot":
+        """
+        Returns a snapshot with the values of the result of a command. Values that are not in the result
+        are taken from this snapshot, like Status.update keeps them.
+        """
+        get = status_result.get
+        values = [get(name, value) for name, value in zip(_VALUE_FIELDS, self[1:])]
+        if values[-1] is None: # temperature
+            values[-1] = math.nan
+        return StatusSnapshot._make((monotonic_time, *values))
+
+
+_VALUE_FIELDS = StatusSnapshot._fields[1:]
+
+
+# Numpy dtype with the same fields as StatusSnapshot, for storing snapshots in structured arrays.
+STATUS_SNAPSHOT_DTYPE = np.dtype([
+    ("monotonic_time", np.float64),
+    ("error", np.int64),
+    ("frequency", np.int64),
+    ("gain", np.int64),
+    ("procedure", np.int64),
+    ("signal", np.bool_),
+    ("wipe_mode", np.bool_),
+    ("urms", np.float64),
+    ("irms", np.float64),
+    ("phase", np.float64),
+    ("temperature", np.float64),
+])
+
+
+def to_array(snapshots: Iterable[StatusSnapshot]) -> np.ndarray:
+    """ Converts snapshots into a structured array with the dtype STATUS_SNAPSHOT_DTYPE """
+    return np.array(list(snapshots), dtype=STATUS_SNAPSHOT_DTYPE)
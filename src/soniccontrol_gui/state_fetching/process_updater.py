@@ -0,0 +1,50 @@
+import asyncio
+from typing import Optional
+from soniccontrol.device_data import Status
+from soniccontrol.device_process import DeviceProcess
+from soniccontrol.events import Event, EventManager
+
+
+class ProcessUpdater(EventManager):
+    """
+    Counterpart of the Updater for devices, whose communication runs in a DeviceProcess.
+    It does not send anything to the device, it only reads the status records the worker process
+    published into shared memory and emits the same "update" events as the Updater.
+    No window uses it yet.
+    """
+
+    def __init__(self, device_process: DeviceProcess, read_interval: float = 0.05) -> None:
+        super().__init__()
+        self._device_process = device_process
+        self._read_interval = read_interval
+        self._status = Status()
+        self._running: asyncio.Event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> asyncio.Event:
+        return self._running
+
+    @property
+    def status(self) -> Status:
+        return self._status
+
+    def start(self) -> None:
+        self._running.set()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        assert self._task is not None
+        self._running.clear()
+        await self._task
+
+    async def update(self, **tags) -> None:
+        """ Emits the status records published since the last update, with the tags added like the Updater does """
+        for record in self._device_process.read_status_records():
+            await self._status.update(**record._asdict())
+            self.emit(Event("update", status=self._status, **tags))
+
+    async def _loop(self) -> None:
+        while self._running.is_set():
+            await self.update()
+            await asyncio.sleep(self._read_interval)
@@ -1,14 +1,17 @@
 
-import asyncio
 from typing import Any, Dict, List, Type, Union
 from attrs import validators
 import attrs
 
 from soniccontrol_gui.state_fetching.updater import Updater
 from soniccontrol.interfaces import Scriptable
-from soniccontrol.procedures.holder import Holder, HolderArgs, convert_to_holder_args
+from soniccontrol.procedures.holder import HolderArgs, convert_to_holder_args
 from soniccontrol.procedures.procedure import Procedure
 from soniccontrol.procedures.procs.ramper import RamperArgs
+from soniccontrol.procedures.status_sampling import check_connection
+from soniccontrol.procedures.step_scheduler import StepScheduler
+from soniccontrol.procedures.sweep_result import SweepResult
+from soniccontrol.status_snapshot import StatusSnapshot
 
 @attrs.define()
 class SpectrumMeasureModel:
@@ -16,16 +19,25 @@ class SpectrumMeasureModel:
 
 @attrs.define()
 class SpectrumMeasureArgs(RamperArgs):
+    # settle time after setting the frequency, before the samples are taken
     time_offset_measure: HolderArgs = attrs.field(
         default=HolderArgs(100, "ms"), 
         converter=convert_to_holder_args
     )
+    samples_per_step: int = attrs.field(default=1, validator=[
+        validators.instance_of(int),
+        validators.ge(1),
+        validators.le(100)
+    ])
 
 
 # TODO: This class can be easily merged with RamperLocal
 class SpectrumMeasure(Procedure):
     def __init__(self, updater: Updater) -> None:
         self._updater = updater        
+        self._set_frequencies: List[int] = []
+        self._step_indices: List[int] = []
+        self._samples: List[StatusSnapshot] = []
 
     @classmethod
     def get_args_class(cls) -> Type: 
@@ -35,37 +47,66 @@ class SpectrumMeasure(Procedure):
         self,
         device: Scriptable,
         args: SpectrumMeasureArgs
-    ) -> None:
+    ) -> SweepResult:
+        """
+        Ramps the frequency and takes samples_per_step status samples in each step, after the settle time
+        time_offset_measure. Returns all samples, tagged with the index of their step.
+        Polls that get no valid answer are left out.
+
+        Raises:
+            ConnectionError: If the connection was lost.
+        """
         start = args.freq_center - args.half_range
         stop = args.freq_center + args.half_range + args.step # add a step to stop so that stop is inclusive
         values = [start + i * args.step for i in range(int((stop - start) / args.step)) ]
 
+        self._set_frequencies = []
+        self._step_indices = []
+        self._samples = []
         try:
             await self._updater.stop()
             await device.get_overview()
-            await self._ramp(device, list(values), args.hold_on, args.hold_off)
+            await self._ramp(device, list(values), args)
         finally:
             await device.set_signal_off()
             self._updater.start()
+        return SweepResult.from_snapshots(self._set_frequencies, self._samples, self._step_indices)
 
     async def _ramp(
         self,
         device: Scriptable,
         values: List[Union[int, float]],
-        hold_on: HolderArgs,
-        hold_off: HolderArgs,
+        args: SpectrumMeasureArgs,
     ) -> None:
-        for  i in range(len(values)):
+        # The samples are polled one after another on the command path of the ramp, so they cannot
+        # overtake the next frequency command. If they take longer than the hold, the step is extended.
+        hold_on_s = args.hold_on.duration_in_ms / 1000
+        hold_off_s = args.hold_off.duration_in_ms / 1000
+        settle_s = args.time_offset_measure.duration_in_ms / 1000
+        scheduler = StepScheduler()
+        for i in range(len(values)):
             value = values[i]
 
+            scheduler.begin_step(hold_on_s + hold_off_s)
             await device.execute_command(f"!f={value}") # FIXME use internal freq command of device
-            if hold_off.duration:
+            if args.hold_off.duration:
                 await device.set_signal_on()
-            asyncio.get_running_loop().create_task(self._updater.update())
-            await Holder.execute(hold_on)
+            check_connection(device)
+            await scheduler.hold_until(settle_s)
+            for _ in range(args.samples_per_step):
+                previous_snapshot = device.status_snapshot
+                await self._updater.update(step=i)
+                check_connection(device)
+                if device.status_snapshot is previous_snapshot:
+                    # the poll got no valid answer, the snapshot is the one of the previous sample
+                    continue
+                self._set_frequencies.append(int(value))
+                self._step_indices.append(i)
+                self._samples.append(device.status_snapshot)
+            await scheduler.hold_until(hold_on_s)
 
-            if hold_off.duration:
+            if args.hold_off.duration:
                 await device.set_signal_off()
-                await Holder.execute(hold_off)
-
-
+                check_connection(device)
+                await scheduler.hold_until(hold_on_s + hold_off_s)
+            scheduler.end_step()
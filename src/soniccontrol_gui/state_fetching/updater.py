@@ -1,4 +1,3 @@
-
 import asyncio
 from typing import Optional
 from soniccontrol.sonic_device import SonicDevice
@@ -6,9 +5,14 @@ from soniccontrol.events import Event, EventManager
 
 
 class Updater(EventManager):
-    def __init__(self, device: SonicDevice) -> None:
+    STATUS_STREAM_INTERVAL_MS = 100
+    # if no package was pushed in this many intervals, we poll once ourselves
+    STATUS_STREAM_TIMEOUT_INTERVALS = 5
+
+    def __init__(self, device: SonicDevice, stream_interval_ms: int = STATUS_STREAM_INTERVAL_MS) -> None:
         super().__init__()
         self._device = device
+        self._stream_interval_ms = stream_interval_ms
         self._running: asyncio.Event = asyncio.Event()
         self._task: Optional[asyncio.Task] = None
 
@@ -25,16 +29,37 @@ class Updater(EventManager):
         self._running.clear()
         await self._task
 
-    async def update(self) -> None:
+    async def update(self, **tags) -> None:
+        """
+        Polls the status once and emits it. The tags are added to the update event,
+        like the step index of a spectrum measure.
+        """
         # HINT: If ever needed to update different device attributes, we can do that, by checking what components the device has
         # and then additionally call other commands to get this information
         await self._device.execute_command("-", should_log=False)
-        self.emit(Event("update", status=self._device.status))
+        self.emit(Event("update", status=self._device.status, **tags))
 
     async def _loop(self) -> None:
         try:
-            while self._running.is_set():
-                await self.update()
+            if self._device.supports_status_stream:
+                await self._stream()
+            else:
+                # Fallback for firmware that cannot push its status
+                while self._running.is_set():
+                    await self.update()
         except Exception as e:
             raise
-        
+
+    async def _stream(self) -> None:
+        timeout = self.STATUS_STREAM_TIMEOUT_INTERVALS * self._stream_interval_ms / 1000
+        await self._device.start_status_stream(self._stream_interval_ms)
+        try:
+            while self._running.is_set():
+                try:
+                    status = await self._device.receive_streamed_status(timeout)
+                except asyncio.TimeoutError:
+                    await self.update()
+                    continue
+                self.emit(Event("update", status=status))
+        finally:
+            await self._device.stop_status_stream()
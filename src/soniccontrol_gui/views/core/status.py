@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import Callable, Tuple
+from typing import Callable, Optional, Tuple
 import ttkbootstrap as ttk
 from soniccontrol_gui.ui_component import UIComponent
 from soniccontrol_gui.view import View
@@ -22,6 +22,7 @@ class StatusBar(UIComponent):
         self._view = StatusBarView(parent_slot)
         self._status_panel = StatusPanel(self, self._view.panel_frame)
         self._status_panel_expanded = False
+        self._shown_status_version: Optional[int] = None
         super().__init__(parent, self._view, self._logger)
         self._view.set_status_clicked_command(self.on_expand_status_panel)
         self._view.expand_panel_frame(self._status_panel_expanded)
@@ -30,8 +31,13 @@ class StatusBar(UIComponent):
         self._logger.debug("Expand status panel")
         self._status_panel_expanded = not self._status_panel_expanded
         self._view.expand_panel_frame(self._status_panel_expanded)
+        self._shown_status_version = None # so that the panel gets filled with the next update
 
     def on_update_status(self, status: Status):
+        # The updaters emit an update for every status they read, also if nothing changed
+        if status.version == self._shown_status_version:
+            return
+        self._shown_status_version = status.version
         temperature = status.temperature if status.temperature is not None else 0
         self._view.update_labels(
             f"{status.communication_mode}",
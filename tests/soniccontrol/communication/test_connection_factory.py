@@ -0,0 +1,66 @@
+import asyncio
+import socket
+import pytest
+import pytest_asyncio
+
+from soniccontrol.communication.connection_factory import TcpConnectionFactory
+from soniccontrol.communication.serial_communicator import LegacySerialCommunicator, SerialCommunicator
+
+
+@pytest_asyncio.fixture()
+async def echo_server():
+    async def echo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while line := await reader.readline():
+            writer.write(line)
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(echo, "127.0.0.1", 0)
+    yield server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_tcp_connection_factory_round_trip(echo_server):
+    factory = TcpConnectionFactory(connection_name="bench", host="127.0.0.1", port=echo_server)
+    reader, writer = await factory.open_connection()
+
+    writer.write(b"?info\n")
+    await writer.drain()
+    answer = await asyncio.wait_for(reader.readline(), 1)
+    writer.close()
+
+    assert answer == b"?info\n"
+
+
+@pytest.mark.asyncio
+async def test_tcp_connection_factory_sets_socket_options(echo_server):
+    factory = TcpConnectionFactory(connection_name="bench", host="127.0.0.1", port=echo_server)
+    _reader, writer = await factory.open_connection()
+
+    sock = writer.get_extra_info("socket")
+    no_delay = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    keep_alive = sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    writer.close()
+
+    assert no_delay != 0
+    assert keep_alive != 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("communicator_class", [SerialCommunicator, LegacySerialCommunicator])
+async def test_communicators_set_the_baudrate_of_rfc2217_ports(monkeypatch, communicator_class):
+    opened_with = {}
+
+    async def open_serial_connection(**kwargs):
+        opened_with.update(kwargs)
+        raise ConnectionRefusedError()
+
+    monkeypatch.setattr("soniccontrol.communication.connection_factory.open_serial_connection", open_serial_connection)
+    factory = TcpConnectionFactory(connection_name="bench", host="127.0.0.1", port=4001, protocol="rfc2217")
+
+    with pytest.raises(ConnectionRefusedError):
+        await communicator_class().open_communication(factory, baudrate=115200)
+
+    assert opened_with == {"url": "rfc2217://127.0.0.1:4001", "baudrate": 115200}
@@ -30,3 +30,25 @@ async def test_get_answer_of_package_ensures_that_order_does_not_matter():
 
     assert (answer == msg)
 
+
+@pytest.mark.asyncio
+async def test_status_stream_packages_are_not_treated_as_answers():
+    reader = asyncio.StreamReader()
+    protocol = SonicProtocol()
+    pkg_fetcher = PackageFetcher(reader, protocol)
+
+    status_msg = "20#0#1000#50#0#0#0#0#0#on"
+    msg = "1000 Hz"
+    msg_id = 3
+
+    pkg_fetcher.run()
+    reader.feed_data(protocol.parse_request(status_msg, SonicProtocol.STATUS_STREAM_PACKAGE_ID).encode(PLATFORM.encoding))
+    reader.feed_data(protocol.parse_request(msg, msg_id).encode(PLATFORM.encoding))
+
+    answer = await asyncio.wait_for(pkg_fetcher.get_answer_of_package(msg_id), 1)
+    status_package = await asyncio.wait_for(pkg_fetcher.pop_status_package(), 1)
+    await pkg_fetcher.stop()
+
+    assert answer == msg
+    assert status_package == status_msg
+    assert SonicProtocol.STATUS_STREAM_PACKAGE_ID not in pkg_fetcher._answers
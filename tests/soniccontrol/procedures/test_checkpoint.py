@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from typing import List
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.commands import CommandSet
+from soniccontrol.device_data import Info, Status
+from soniccontrol.procedures.holder import HolderArgs
+from soniccontrol.procedures.procedure import ProcedureType
+from soniccontrol.procedures.procedure_controller import ProcedureController
+from soniccontrol.procedures.procedure_instantiator import ProcedureInstantiator
+from soniccontrol.procedures.procs.ramper import RampCheckpoint, RamperArgs, RamperLocal
+from soniccontrol.scripting.legacy_scripting import LegacyScriptingFacade
+from soniccontrol.sonic_device import SonicDevice
+from soniccontrol.status_snapshot import StatusSnapshot
+
+
+def create_device(sent: List[str], fail_at: str = "") -> Mock:
+    """ Mocks a device, whose connection drops when the message fail_at is sent """
+    device = Mock(spec=SonicDevice)
+    device._logger = logging.getLogger()
+    device.status_snapshot = StatusSnapshot()
+
+    async def execute_command(message: str, *args, **kwargs):
+        if message == fail_at:
+            raise ConnectionError("Connection lost")
+        sent.append(message)
+        device.status_snapshot = device.status_snapshot._replace(monotonic_time=len(sent))
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    device.has_command = Mock(return_value=False)
+    device.set_frequency = AsyncMock(side_effect=lambda frequency: execute_command(f"!f={frequency}"))
+    return device
+
+
+@pytest.fixture(autouse=True)
+def local_ramp(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr("soniccontrol.scripting.legacy_scripting.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(
+        ProcedureInstantiator, "instantiate_procedures",
+        lambda _self, _device: {ProcedureType.RAMP: RamperLocal()}
+    )
+
+
+@pytest.mark.asyncio
+async def test_interrupted_ramp_resumes_after_the_last_completed_step():
+    sent: List[str] = []
+    args = RamperArgs(1020, 20, 10, HolderArgs(1, "ms"))
+    proc_controller = ProcedureController(create_device(sent, fail_at="!f=1030"))
+
+    with pytest.raises(ConnectionError):
+        await proc_controller.run_proc(ProcedureType.RAMP, args)
+
+    checkpoint = proc_controller.checkpoint
+    assert checkpoint is not None and isinstance(checkpoint.state, RampCheckpoint)
+    assert checkpoint.state.next_step == 3
+    assert list(checkpoint.state.partial_result().set_frequencies) == [1000, 1010, 1020]
+
+    # reconnected
+    sent.clear()
+    new_controller = ProcedureController(create_device(sent))
+    result = await new_controller.resume_proc(checkpoint)
+
+    assert [message for message in sent if message.startswith("!f=")] == ["!f=1030", "!f=1040"]
+    assert list(result.set_frequencies) == [1000, 1010, 1020, 1030, 1040]
+    assert len(result) == 5
+    assert new_controller.checkpoint is None
+
+
+@pytest.mark.asyncio
+async def test_resume_proc_raises_without_checkpoint():
+    proc_controller = ProcedureController(create_device([]))
+
+    with pytest.raises(Exception):
+        proc_controller.resume_proc()
+
+
+async def run_script(script) -> None:
+    async for _ in script:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_interrupted_script_resumes_with_its_loop_counters_and_ramp():
+    text = "startloop 3\n!g=10\nendloop\nramp_freq 1000 1040 10 1ms\n!g=20"
+    sent: List[str] = []
+    scripting = LegacyScriptingFacade(create_device(sent, fail_at="!f=1030"))
+    script = scripting.parse_script(text)
+
+    with pytest.raises(ConnectionError):
+        await run_script(script)
+
+    checkpoint = script.checkpoint
+    assert checkpoint.current_line == 3
+    assert checkpoint.procedure is not None
+    assert sent.count("!g=10") == 3
+
+    # reconnected
+    sent.clear()
+    new_scripting = LegacyScriptingFacade(create_device(sent))
+    await run_script(new_scripting.parse_script(text, checkpoint))
+
+    assert "!g=10" not in sent
+    assert [message for message in sent if message.startswith("!f=")] == ["!f=1030", "!f=1040"]
+    assert sent[-1] == "!g=20"
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_in_a_loop_keeps_the_remaining_iterations():
+    text = "startloop 3\n!g=10\nhold 1ms\nendloop"
+    sent: List[str] = []
+    script = LegacyScriptingFacade(create_device(sent)).parse_script(text)
+    steps = script.__aiter__()
+    # run until the second iteration of the loop was entered
+    while sent.count("!g=10") < 2:
+        await steps.__anext__()
+    checkpoint = script.checkpoint
+
+    sent.clear()
+    await run_script(LegacyScriptingFacade(create_device(sent)).parse_script(text, checkpoint))
+
+    assert sent.count("!g=10") == 1
+
+
+class DroppingCommunicator:
+    """ Answers like a device until the message drop_at is sent. Then the device stops responding. """
+    def __init__(self, drop_at: str) -> None:
+        self.drop_at = drop_at
+        self.sent: List[str] = []
+        self.connection_opened = asyncio.Event()
+        self.connection_opened.set()
+
+    async def send_and_wait_for_answer(self, request) -> None:
+        if not self.connection_opened.is_set():
+            raise ConnectionError("The connection was closed")
+        if request.full_message == self.drop_at:
+            # like the SerialCommunicator, that closes the connection if the device does not respond
+            self.connection_opened.clear()
+            raise ConnectionError("Device is not responding")
+        self.sent.append(request.full_message)
+        answer = "0#1000000#100#0#293150000#1000#2000#30#0#on" if request.full_message == "-" else "ok"
+        request.answer.receive_answer(answer)
+
+    async def close_communication(self, restart: bool = False) -> None:
+        self.connection_opened.clear()
+
+
+def create_sonic_device(serial: DroppingCommunicator) -> SonicDevice:
+    commands = CommandSet(serial)
+    return SonicDevice(
+        serial=serial,
+        commands={commands.get_status.message: commands.get_status},
+        status=Status(),
+        info=Info(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_ramp_stops_with_a_checkpoint_when_the_connection_is_lost():
+    serial = DroppingCommunicator(drop_at="!f=1030")
+    args = RamperArgs(1020, 20, 10, HolderArgs(1, "ms"))
+    proc_controller = ProcedureController(create_sonic_device(serial))
+
+    with pytest.raises(ConnectionError):
+        await proc_controller.run_proc(ProcedureType.RAMP, args)
+
+    checkpoint = proc_controller.checkpoint
+    assert checkpoint is not None and isinstance(checkpoint.state, RampCheckpoint)
+    assert checkpoint.state.next_step == 3
+    assert len(checkpoint.state.samples) == 3
+    assert all(sample.frequency == 1000000 for sample in checkpoint.state.samples)
+    assert "!f=1040" not in serial.sent
+
+
+@pytest.mark.asyncio
+async def test_script_stops_at_the_line_that_lost_the_connection():
+    serial = DroppingCommunicator(drop_at="!g=20")
+    script = LegacyScriptingFacade(create_sonic_device(serial)).parse_script("!g=10\n!g=20\n!g=30")
+
+    with pytest.raises(ConnectionError):
+        await run_script(script)
+
+    assert script.checkpoint.current_line == 1
+    assert "!g=30" not in serial.sent
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import math
+import time
+from typing import List
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.device_data import Status
+from soniccontrol.procedures.completion_watcher import CompletionWatcher
+from soniccontrol.procedures.holder import HolderArgs
+from soniccontrol.procedures.procedure import ProcedureType
+from soniccontrol.procedures.procedure_controller import ProcedureController
+from soniccontrol.procedures.procedure_instantiator import ProcedureInstantiator
+from soniccontrol.procedures.procs.tune import TuneArgs, TuneProc
+from soniccontrol.sonic_device import SonicDevice
+
+
+def create_device() -> Mock:
+    device = Mock(spec=SonicDevice)
+    device.procedure_reported_at = -math.inf
+
+    async def execute_command(message: str, *args, **kwargs):
+        if message == "-":
+            device.procedure_reported_at = time.monotonic()
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    return device
+
+
+async def watch_for(watcher: CompletionWatcher, duration: float) -> None:
+    task = asyncio.create_task(watcher.watch())
+    await asyncio.sleep(duration)
+    task.cancel()
+    await asyncio.wait([task])
+
+
+def test_poll_interval_is_shortest_around_the_expected_end():
+    watcher = CompletionWatcher(Mock(spec=SonicDevice), expected_duration=2.)
+
+    intervals = [watcher.poll_interval(elapsed) for elapsed in [0., 1., 1.9, 2., 2.4, 10.]]
+
+    assert intervals == pytest.approx([0.5, 0.25, 0.05, 0.05, 0.1, 1.])
+    assert CompletionWatcher(Mock(spec=SonicDevice)).poll_interval(0.) == CompletionWatcher.DEFAULT_INTERVAL_S
+
+
+@pytest.mark.asyncio
+async def test_watcher_polls_if_nobody_reports_the_status():
+    device = create_device()
+    watcher = CompletionWatcher(device, expected_duration=0.2)
+
+    await watch_for(watcher, 0.3)
+
+    assert 2 <= watcher.poll_count <= 10
+    device.execute_command.assert_awaited_with("-", should_log=False)
+
+
+@pytest.mark.asyncio
+async def test_watcher_does_not_poll_if_the_status_is_reported_anyway():
+    device = create_device()
+    watcher = CompletionWatcher(device, expected_duration=0.2)
+
+    async def stream():
+        while True:
+            device.procedure_reported_at = time.monotonic()
+            await asyncio.sleep(0.01)
+
+    stream_task = asyncio.create_task(stream())
+    await watch_for(watcher, 0.3)
+    stream_task.cancel()
+
+    assert watcher.poll_count == 0
+
+
+TUNE_ARGS = TuneArgs(1000, HolderArgs(100, "ms"))
+
+
+def create_controller(monkeypatch, device: Mock) -> ProcedureController:
+    monkeypatch.setattr(
+        "soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger()
+    )
+    monkeypatch.setattr(
+        ProcedureInstantiator, "instantiate_procedures", Mock(return_value={ProcedureType.TUNE: TuneProc()})
+    )
+    return ProcedureController(device)
+
+
+def create_remote_device(sent: List[str], running_for: float) -> Mock:
+    """ Mocks a device, that runs tune for the given time and reports it only, if it is polled """
+    device = create_device()
+    device.status = Status()
+    started_at = math.inf
+
+    async def execute_command(message: str, *args, **kwargs):
+        nonlocal started_at
+        sent.append(message)
+        if message == "!tune":
+            started_at = time.monotonic()
+        elif message == "-":
+            device.procedure_reported_at = time.monotonic()
+            running = time.monotonic() - started_at < running_for
+            await device.status.update(procedure=3 if running else 0)
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    return device
+
+
+@pytest.mark.asyncio
+async def test_remote_procedure_finishes_without_anybody_else_polling(monkeypatch):
+    sent: List[str] = []
+    proc_controller = create_controller(monkeypatch, create_remote_device(sent, running_for=0.1))
+
+    await asyncio.wait_for(proc_controller.run_proc(ProcedureType.TUNE, TUNE_ARGS), 2)
+
+    assert "-" in sent
+    # the watcher starts after the start command, so the upload does not count to the duration
+    assert sent.index("!tune") < sent.index("-")
+    assert not proc_controller.is_proc_running
+
+
+@pytest.mark.asyncio
+async def test_remote_procedure_finishes_if_no_report_saw_it_running(monkeypatch):
+    sent: List[str] = []
+    proc_controller = create_controller(monkeypatch, create_remote_device(sent, running_for=0))
+
+    await asyncio.wait_for(proc_controller.run_proc(ProcedureType.TUNE, TUNE_ARGS), 2)
+
+    assert sent.count("-") >= 1
+    assert not proc_controller.is_proc_running
+
+
+@pytest.mark.asyncio
+async def test_remote_procedure_raises_if_the_connection_is_lost(monkeypatch):
+    sent: List[str] = []
+    device = create_remote_device(sent, running_for=math.inf)
+    proc_controller = create_controller(monkeypatch, device)
+
+    task = asyncio.create_task(proc_controller.run_proc(ProcedureType.TUNE, TUNE_ARGS))
+    await asyncio.sleep(0.1)
+    device.is_connected = False
+
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(task, 2)
+    assert not proc_controller.is_proc_running
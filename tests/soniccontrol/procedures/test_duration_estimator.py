@@ -0,0 +1,80 @@
+import math
+
+import pytest
+
+from soniccontrol.link_statistics import LinkStatistics
+from soniccontrol.procedures.duration_estimator import DurationEstimator
+from soniccontrol.procedures.holder import HolderArgs
+from soniccontrol.procedures.procs.ramper import RamperArgs
+from soniccontrol.procedures.procs.tune import TuneArgs, TuneProc
+from soniccontrol.scripting.legacy_scripting import SonicParser
+
+
+def create_link(latency: float) -> LinkStatistics:
+    statistics = LinkStatistics()
+    for message in ["?", "-", "!f=1000", "!ON", "!OFF", "!g=50"]:
+        statistics.record(message, latency)
+    return statistics
+
+
+def parse(text: str):
+    parsed = SonicParser().parse_text(text)
+    return [
+        {"command": command, "argument": argument, "loop": loop}
+        for command, argument, loop in zip(parsed["commands"], parsed["arguments"], parsed["loops"])
+    ]
+
+
+def test_local_ramp_absorbs_latencies_shorter_than_the_holds():
+    estimator = DurationEstimator(create_link(0.01))
+    args = RamperArgs(1000, 50, 10, HolderArgs(100, "ms"), HolderArgs(50, "ms"))
+
+    estimate = estimator.estimate_local_ramp(args)
+
+    assert estimate.steps == 11
+    assert estimate.nominal == pytest.approx(11 * 0.15)
+    assert estimate.step_error == 0.
+    assert estimate.overhead == pytest.approx(0.02) # only the setup
+    assert estimate.min_step_duration == pytest.approx(0.04)
+    assert estimate.feasible
+
+
+def test_local_ramp_is_infeasible_if_the_commands_exceed_the_holds():
+    estimator = DurationEstimator(create_link(0.03))
+    args = RamperArgs(1000, 50, 10, HolderArgs(50, "ms"))
+
+    estimate = estimator.estimate_local_ramp(args)
+
+    assert not estimate.feasible
+    assert estimate.step_error == pytest.approx(0.01)
+    assert estimate.total == pytest.approx(0.06 + 11 * 0.06)
+
+
+def test_remote_procedure_adds_the_upload_to_the_expected_duration():
+    estimator = DurationEstimator(create_link(0.01), default_latency=0.01)
+
+    estimate = estimator.estimate_remote_procedure(TuneProc(), TuneArgs(1000, HolderArgs(2, "s")))
+
+    assert estimate.nominal == pytest.approx(2.)
+    assert estimate.total > estimate.nominal
+
+
+def test_script_counts_loops_and_ramps():
+    estimator = DurationEstimator(create_link(0.01))
+    commands = parse("frequency 1000\non\nstartloop 3\nhold 100ms\n!g=50\nendloop\nramp_freq 1000 1100 10 50ms\noff")
+
+    estimate = estimator.estimate_script(commands, estimator.estimate_local_ramp)
+
+    ramp = estimator.estimate_local_ramp(RamperArgs.from_range(1000, 1100, 10, 50, "ms"))
+    assert estimate.nominal == pytest.approx(0.3 + ramp.nominal)
+    assert estimate.total == pytest.approx(0.02 + 0.02 + 3 * 0.11 + ramp.total + 0.01)
+    assert estimate.steps == 2 + 6 + ramp.steps + 1
+    assert estimate.feasible
+
+
+def test_script_with_endless_loop_takes_forever():
+    estimator = DurationEstimator(create_link(0.01))
+
+    estimate = estimator.estimate_script(parse("startloop\nhold 1s\nendloop"), estimator.estimate_local_ramp)
+
+    assert math.isinf(estimate.total)
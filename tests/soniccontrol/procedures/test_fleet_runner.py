@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Dict, List
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.device_data import Status
+from soniccontrol.procedures.fleet_runner import FleetRunner
+from soniccontrol.procedures.procedure import ProcedureType
+from soniccontrol.procedures.procedure_controller import ProcedureController
+from soniccontrol.procedures.procedure_instantiator import ProcedureInstantiator
+from soniccontrol.procedures.procs.scan import ScanArgs, ScanProc
+from soniccontrol.procedures.procs.tune import TuneArgs, TuneProc
+from soniccontrol.sonic_device import SonicDevice
+
+
+def create_device(latency: float, arrivals: Dict[str, List[float]]) -> Mock:
+    """ Mocks a device, whose link takes half of the latency in each direction """
+    device = Mock(spec=SonicDevice)
+    device.status = Status()
+    device.procedure_reported_at = time.monotonic()
+    finished_at = math.inf
+
+    async def execute_command(message: str, *args, **kwargs):
+        nonlocal finished_at
+        await asyncio.sleep(latency / 2)
+        arrivals.setdefault(message, []).append(time.monotonic())
+        if message in ["!tune", "!scan"]:
+            finished_at = time.monotonic() + 0.05
+        elif message == "-":
+            procedure = 1 if time.monotonic() < finished_at else 0
+        await asyncio.sleep(latency / 2)
+        if message == "-":
+            device.procedure_reported_at = time.monotonic()
+            await device.status.update(procedure=procedure)
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    return device
+
+
+@pytest.mark.asyncio
+async def test_starts_arrive_at_the_devices_at_the_same_time(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(ProcedureInstantiator, "instantiate_procedures", lambda _self, _device: {ProcedureType.TUNE: TuneProc()})
+    arrivals: Dict[str, List[float]] = {}
+    latencies = [0.01, 0.05, 0.15]
+    controllers = [ProcedureController(create_device(latency, arrivals)) for latency in latencies]
+
+    results = await FleetRunner(controllers).run(ProcedureType.TUNE, TuneArgs(1000))
+
+    assert [result.error for result in results] == [None, None, None]
+    assert [result.latency for result in results] == pytest.approx(latencies, abs=0.02)
+    assert all(abs(result.start_skew) < 0.02 for result in results)
+    # all parameters were uploaded before the first start
+    assert max(arrivals["!tune_t_step=100"]) < min(arrivals["!tune"])
+    assert max(arrivals["!tune"]) - min(arrivals["!tune"]) < 0.03
+
+
+@pytest.mark.asyncio
+async def test_commands_before_the_start_are_accounted_for(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(ProcedureInstantiator, "instantiate_procedures", lambda _self, _device: {ProcedureType.SCAN: ScanProc()})
+    arrivals: Dict[str, List[float]] = {}
+    latencies = [0.01, 0.05, 0.15]
+    controllers = [ProcedureController(create_device(latency, arrivals)) for latency in latencies]
+
+    results = await FleetRunner(controllers).run(ProcedureType.SCAN, ScanArgs(1000000, 100, 10000, 100))
+
+    assert [result.error for result in results] == [None, None, None]
+    assert all(abs(result.start_skew) < 0.02 for result in results)
+    # the scan sets the frequency before it is started
+    assert max(arrivals["!f=1000000"]) - min(arrivals["!f=1000000"]) > 0.1
+    assert max(arrivals["!scan"]) - min(arrivals["!scan"]) < 0.03
+
+
+@pytest.mark.asyncio
+async def test_cancelled_run_does_not_start_the_devices(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(ProcedureInstantiator, "instantiate_procedures", lambda _self, _device: {ProcedureType.TUNE: TuneProc()})
+    arrivals: Dict[str, List[float]] = {}
+    controllers = [ProcedureController(create_device(0.01, arrivals)) for _ in range(2)]
+
+    run = asyncio.create_task(FleetRunner(controllers, start_margin=0.5).run(ProcedureType.TUNE, TuneArgs(1000)))
+    await asyncio.sleep(0.2) # the devices are prepared, but not started yet
+    run.cancel()
+    await asyncio.wait([run])
+    await asyncio.sleep(0.5)
+
+    assert "!tune_t_step=100" in arrivals
+    assert "!tune" not in arrivals
+    assert not any(controller.is_proc_running for controller in controllers)
+
+
+@pytest.mark.asyncio
+async def test_run_raises_if_a_device_lacks_the_procedure(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(ProcedureInstantiator, "instantiate_procedures", lambda _self, _device: {})
+    controllers = [ProcedureController(create_device(0.01, {}))]
+
+    with pytest.raises(Exception):
+        await FleetRunner(controllers).run(ProcedureType.TUNE, TuneArgs(1000))
+
+
+@pytest.mark.asyncio
+async def test_devices_that_cannot_be_prepared_do_not_stop_the_others(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(ProcedureInstantiator, "instantiate_procedures", lambda _self, _device: {ProcedureType.TUNE: TuneProc()})
+    arrivals: Dict[str, List[float]] = {}
+    broken_device = create_device(0.01, {})
+    broken_device.execute_command.side_effect = ConnectionError("Connection lost")
+    controllers = [
+        ProcedureController(create_device(0.01, arrivals)),
+        ProcedureController(broken_device),
+        ProcedureController(create_device(0.02, arrivals)),
+    ]
+
+    results = await FleetRunner(controllers).run(ProcedureType.TUNE, TuneArgs(1000))
+
+    assert [result.device_index for result in results] == [0, 1, 2]
+    assert results[0].error is None and results[2].error is None
+    assert isinstance(results[1].error, ConnectionError)
+    assert math.isnan(results[1].latency)
+    assert not controllers[1].is_proc_running
+    assert len(arrivals["!tune"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_raises_if_a_queue_is_running(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(ProcedureInstantiator, "instantiate_procedures", lambda _self, _device: {ProcedureType.TUNE: TuneProc()})
+    arrivals: Dict[str, List[float]] = {}
+    controllers = [ProcedureController(create_device(0.01, arrivals)) for _ in range(2)]
+    controllers[1].enqueue(ProcedureType.TUNE, TuneArgs(1000))
+    controllers[1].start_queue()
+
+    with pytest.raises(Exception, match="queue"):
+        await FleetRunner(controllers).run(ProcedureType.TUNE, TuneArgs(1000))
+
+    assert not controllers[0].is_proc_running
+    await controllers[1].stop_queue()
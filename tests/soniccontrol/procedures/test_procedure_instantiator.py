@@ -0,0 +1,35 @@
+from unittest.mock import Mock
+
+import pytest
+
+from soniccontrol.commands import CommandSet, CommandSetLegacy
+from soniccontrol.device_data import Info, Status
+from soniccontrol.procedures.procedure import ProcedureType
+from soniccontrol.procedures.procedure_instantiator import ProcedureInstantiator
+from soniccontrol.sonic_device import SonicDevice
+
+
+def create_device(command_set) -> SonicDevice:
+    commands = command_set(Mock())
+    return SonicDevice(
+        serial=Mock(),
+        commands={commands.get_status.message: commands.get_status},
+        status=Status(),
+        info=Info(),
+    )
+
+
+@pytest.mark.parametrize("command_set, offered", [
+    (CommandSet, True), # the status has urms, irms and phase
+    (CommandSetLegacy, False),
+])
+def test_resonance_search_is_only_offered_if_the_status_measures_the_impedance(command_set, offered):
+    procedures = ProcedureInstantiator().instantiate_procedures(create_device(command_set))
+
+    assert (ProcedureType.RESONANCE_SEARCH in procedures) == offered
+
+
+def test_resonance_search_is_not_offered_without_status_command():
+    device = SonicDevice(serial=Mock(), commands={}, status=Status(), info=Info())
+
+    assert ProcedureType.RESONANCE_SEARCH not in ProcedureInstantiator().instantiate_procedures(device)
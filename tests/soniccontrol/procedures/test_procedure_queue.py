@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Type
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.device_data import Status
+from soniccontrol.events import Event
+from soniccontrol.procedures.procedure import Procedure, ProcedureType
+from soniccontrol.procedures.procedure_controller import ProcedureController
+from soniccontrol.procedures.procedure_instantiator import ProcedureInstantiator
+from soniccontrol.procedures.procs.auto import AutoArgs, AutoProc
+from soniccontrol.procedures.procs.scan import ScanArgs, ScanProc
+from soniccontrol.procedures.procs.tune import TuneArgs, TuneProc
+from soniccontrol.sonic_device import SonicDevice
+
+
+class FakeProc(Procedure):
+    def __init__(self, name: str, log: List[str], duration: float = 0.01) -> None:
+        self._name = name
+        self._log = log
+        self._duration = duration
+
+    @classmethod
+    def get_args_class(cls) -> Type:
+        return dict
+
+    async def execute(self, device: Any, args: Any) -> Any:
+        self._log.append(self._name)
+        await asyncio.sleep(self._duration)
+        return f"{self._name} result"
+
+
+def create_controller(monkeypatch, procedures: Dict[ProcedureType, Procedure], device: Any = None) -> ProcedureController:
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(ProcedureInstantiator, "instantiate_procedures", Mock(return_value=procedures))
+    return ProcedureController(device or Mock(spec=SonicDevice))
+
+
+def record_events(proc_controller: ProcedureController) -> List[Event]:
+    events: List[Event] = []
+    for event_type in [
+        ProcedureController.QUEUE_ITEM_STARTED, ProcedureController.QUEUE_ITEM_FINISHED,
+        ProcedureController.QUEUE_ITEM_SKIPPED, ProcedureController.QUEUE_ITEM_FAILED,
+        ProcedureController.QUEUE_FINISHED,
+    ]:
+        proc_controller.subscribe(event_type, events.append)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_queue_runs_procedures_in_order(monkeypatch):
+    log: List[str] = []
+    proc_controller = create_controller(monkeypatch, {
+        ProcedureType.SCAN: FakeProc("scan", log),
+        ProcedureType.TUNE: FakeProc("tune", log),
+        ProcedureType.WIPE: FakeProc("wipe", log),
+    })
+    events = record_events(proc_controller)
+
+    for _ in range(2):
+        proc_controller.enqueue(ProcedureType.SCAN, {})
+        proc_controller.enqueue(ProcedureType.TUNE, {})
+        proc_controller.enqueue(ProcedureType.WIPE, {})
+    await proc_controller.run_queue()
+
+    assert log == ["scan", "tune", "wipe"] * 2
+    finished = [event.data["result"] for event in events if event.type_ == ProcedureController.QUEUE_ITEM_FINISHED]
+    assert finished == ["scan result", "tune result", "wipe result"] * 2
+    assert events[-1].type_ == ProcedureController.QUEUE_FINISHED
+    assert proc_controller.queue == []
+    assert not proc_controller.is_queue_running
+    assert proc_controller._running_procedure is None
+
+
+@pytest.mark.asyncio
+async def test_unmet_conditions_skip_the_procedure_or_stop_the_queue(monkeypatch):
+    log: List[str] = []
+    proc_controller = create_controller(monkeypatch, {
+        ProcedureType.SCAN: FakeProc("scan", log),
+        ProcedureType.TUNE: FakeProc("tune", log),
+        ProcedureType.WIPE: FakeProc("wipe", log),
+    })
+    events = record_events(proc_controller)
+
+    proc_controller.enqueue(ProcedureType.SCAN, {}, precondition=AsyncMock(return_value=False))
+    tune = proc_controller.enqueue(ProcedureType.TUNE, {}, postcondition=AsyncMock(return_value=False))
+    wipe = proc_controller.enqueue(ProcedureType.WIPE, {})
+    await proc_controller.run_queue()
+
+    assert log == ["tune"]
+    assert [(event.type_, event.data.get("reason")) for event in events] == [
+        (ProcedureController.QUEUE_ITEM_SKIPPED, "precondition"),
+        (ProcedureController.QUEUE_ITEM_STARTED, None),
+        (ProcedureController.QUEUE_ITEM_FAILED, "postcondition"),
+        (ProcedureController.QUEUE_FINISHED, None),
+    ]
+    tune.postcondition.assert_awaited_once_with(proc_controller._device, "tune result")
+    assert proc_controller.queue == [wipe]
+
+
+@pytest.mark.asyncio
+async def test_skip_current_continues_with_the_next_procedure(monkeypatch):
+    log: List[str] = []
+    proc_controller = create_controller(monkeypatch, {
+        ProcedureType.SCAN: FakeProc("scan", log, duration=10),
+        ProcedureType.TUNE: FakeProc("tune", log),
+    })
+    events = record_events(proc_controller)
+
+    proc_controller.enqueue(ProcedureType.SCAN, {})
+    proc_controller.enqueue(ProcedureType.TUNE, {})
+    proc_controller.start_queue()
+    await asyncio.sleep(0.05)
+    await proc_controller.skip_current()
+    await asyncio.sleep(0.1)
+
+    assert log == ["scan", "tune"]
+    assert [(event.type_, event.data.get("reason")) for event in events][:2] == [
+        (ProcedureController.QUEUE_ITEM_STARTED, None),
+        (ProcedureController.QUEUE_ITEM_SKIPPED, "skipped"),
+    ]
+    assert not proc_controller.is_queue_running
+
+
+def create_remote_device(sent: List[str], failing: Optional[str] = None) -> Mock:
+    """
+    Mocks a device, whose remote procedures finish 50 ms after they were started.
+    The failing message raises the first time it is sent.
+    """
+    running = False
+
+    async def execute_command(message: str, *args, **kwargs):
+        nonlocal running, failing
+        await asyncio.sleep(0.005)
+        sent.append(message)
+        if message == failing:
+            failing = None
+            raise Exception("Device did not answer")
+        if message in ["!scan", "!tune", "!auto"]:
+            running = True
+            asyncio.get_running_loop().call_later(0.05, finish)
+        elif message == "-":
+            device.procedure_reported_at = time.monotonic()
+            await device.status.update(procedure=1 if running else 0)
+
+    def finish():
+        nonlocal running
+        sent.append("finished")
+        running = False
+
+    device = Mock(spec=SonicDevice)
+    device.status = Status()
+    device.procedure_reported_at = time.monotonic() # read by the completion watcher
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    return device
+
+
+@pytest.mark.asyncio
+async def test_args_of_the_next_procedure_are_uploaded_while_the_current_one_runs(monkeypatch):
+    sent: List[str] = []
+    proc_controller = create_controller(monkeypatch, {
+        ProcedureType.SCAN: ScanProc(),
+        ProcedureType.TUNE: TuneProc(),
+    }, create_remote_device(sent))
+
+    proc_controller.enqueue(ProcedureType.SCAN, ScanArgs(1000000, 100, 10000, 100))
+    proc_controller.enqueue(ProcedureType.TUNE, TuneArgs(1000), overlap_upload=True)
+    await proc_controller.run_queue()
+
+    assert [message for message in sent if message != "-"] == [
+        "!scan_gain=100", "!scan_f_range=10000", "!scan_f_step=100", "!scan_t_step=100", "!f=1000000", "!scan",
+        "!tune_f_step=1000", "!tune_t_time=100", "!tune_t_step=100",
+        "finished",
+        "!tune",
+        "finished",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_args_are_uploaded_after_the_running_procedure_was_started(monkeypatch):
+    sent: List[str] = []
+    proc_controller = create_controller(monkeypatch, {
+        ProcedureType.SCAN: ScanProc(),
+        ProcedureType.TUNE: TuneProc(),
+    }, create_remote_device(sent))
+
+    proc_controller.enqueue(ProcedureType.SCAN, ScanArgs(1000000, 100, 10000, 100))
+    proc_controller.enqueue(ProcedureType.TUNE, TuneArgs(1000), overlap_upload=True)
+    await proc_controller.run_queue()
+
+    # the commands of the scan and of the upload are not sent in between each other
+    assert sent.index("!scan") < sent.index("!tune_f_step=1000")
+
+
+@pytest.mark.asyncio
+async def test_procedure_uploads_its_args_itself_if_the_upload_in_advance_failed(monkeypatch):
+    sent: List[str] = []
+    proc_controller = create_controller(monkeypatch, {
+        ProcedureType.SCAN: ScanProc(),
+        ProcedureType.TUNE: TuneProc(),
+    }, create_remote_device(sent, failing="!tune_t_time=100"))
+    events = record_events(proc_controller)
+
+    proc_controller.enqueue(ProcedureType.SCAN, ScanArgs(1000000, 100, 10000, 100))
+    proc_controller.enqueue(ProcedureType.TUNE, TuneArgs(1000), overlap_upload=True)
+    await proc_controller.run_queue()
+
+    assert [event.type_ for event in events].count(ProcedureController.QUEUE_ITEM_FINISHED) == 2
+    sent = [message for message in sent if message != "-"]
+    assert sent[-5:] == [
+        "!tune_f_step=1000", "!tune_t_time=100", "!tune_t_step=100", "!tune", "finished"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_args_are_not_uploaded_to_setters_of_the_running_procedure(monkeypatch):
+    sent: List[str] = []
+    proc_controller = create_controller(monkeypatch, {
+        ProcedureType.SCAN: ScanProc(),
+        ProcedureType.AUTO: AutoProc(),
+    }, create_remote_device(sent))
+
+    proc_controller.enqueue(ProcedureType.SCAN, ScanArgs(1000000, 100, 10000, 100))
+    proc_controller.enqueue(ProcedureType.AUTO, AutoArgs(1000000, 50, 10000, 100), overlap_upload=True)
+    await proc_controller.run_queue()
+
+    sent = [message for message in sent if message != "-"]
+    # the auto procedure uses the scan setters too, so its args are uploaded after the scan finished
+    assert sent.index("finished") < sent.index("!scan_gain=50")
+    assert sent[-2:] == ["!auto", "finished"]
+
+
+@pytest.mark.asyncio
+async def test_queue_item_fails_if_the_procedure_cannot_be_started(monkeypatch):
+    log: List[str] = []
+    proc_controller = create_controller(monkeypatch, {
+        ProcedureType.SCAN: FakeProc("scan", log, duration=0.1),
+        ProcedureType.TUNE: FakeProc("tune", log),
+    })
+    events = record_events(proc_controller)
+
+    tune = proc_controller.enqueue(ProcedureType.TUNE, {})
+    second_tune = proc_controller.enqueue(ProcedureType.TUNE, {})
+    proc_controller.start_queue()
+    proc_controller.execute_proc(ProcedureType.SCAN, {}) # started outside of the queue, before the queue started tune
+    await asyncio.sleep(0.05)
+
+    assert [(event.type_, event.data.get("reason")) for event in events] == [
+        (ProcedureController.QUEUE_ITEM_FAILED, "error"),
+        (ProcedureController.QUEUE_FINISHED, None),
+    ]
+    assert events[0].data["item"] is tune
+    assert proc_controller.queue == [second_tune]
+    assert not proc_controller.is_queue_running
+    assert log == ["scan"]
+    await asyncio.sleep(0.1) # let the scan finish
+
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.procedures.holder import HolderArgs
+from soniccontrol.procedures.procs.resonance_search import ResonanceSearchArgs, ResonanceSearchProc, find_resonance_bracket
+from soniccontrol.sonic_device import SonicDevice
+from soniccontrol.status_snapshot import StatusSnapshot
+
+
+def create_transducer(resonance: float) -> Mock:
+    """ Mocks a device with a sharp series resonance, the phase crosses zero at the resonance frequency """
+    device = Mock(spec=SonicDevice)
+    device.status_snapshot = StatusSnapshot()
+    set_frequencies = []
+
+    async def execute_command(message: str, *args, **kwargs):
+        if message == "-":
+            device.status_snapshot = device.status_snapshot._replace(monotonic_time=len(set_frequencies))
+            return
+        frequency = int(message.removeprefix("!f="))
+        set_frequencies.append(frequency)
+        detuning = (frequency - resonance) / 50
+        impedance = 100 * np.sqrt(1 + detuning ** 2)
+        device.status_snapshot = StatusSnapshot(
+            frequency=frequency, urms=1000., irms=1000. / impedance, phase=float(np.degrees(np.arctan(detuning)))
+        )
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    device.has_command = Mock(return_value=False)
+    device.set_frequencies = set_frequencies
+    return device
+
+
+def test_bracket_interpolates_the_phase_crossing_closest_to_the_impedance_minimum():
+    frequencies = np.array([100, 200, 300, 400, 500])
+    phase = np.array([-10., 10., 20., -20., -30.]) # crossings in [100, 200] and [300, 400]
+    impedance = np.array([3., 1., 2., 4., 5.])
+
+    assert find_resonance_bracket(frequencies, phase, impedance) == (0, 1, 150.)
+
+
+def test_bracket_falls_back_to_the_impedance_minimum():
+    frequencies = np.array([100, 200, 300, 400])
+    phase = np.array([10., 20., 30., 40.])
+    impedance = np.array([3., 2., 1., 4.])
+
+    assert find_resonance_bracket(frequencies, phase, impedance) == (1, 3, 300.)
+
+
+@pytest.mark.asyncio
+async def test_search_finds_the_resonance_with_few_measurements():
+    device = create_transducer(resonance=1_234_567)
+    args = ResonanceSearchArgs(1_200_000, 100_000, 1000, resolution=1, hold_on=HolderArgs(0, "ms"))
+
+    result = await ResonanceSearchProc().execute(device, args)
+
+    assert abs(result.resonance_frequency - 1_234_567) <= 1
+    assert result.resolution == 1
+    # a uniform sweep with the resolution as step would take 200001 measurements
+    assert len(result.sweep) < 300
+    assert device.set_frequencies[-1] == result.resonance_frequency
+    device.set_signal_off.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_raises_if_the_device_measures_no_impedance_and_phase():
+    device = Mock(spec=SonicDevice)
+    device.status_snapshot = StatusSnapshot()
+
+    async def execute_command(message: str, *args, **kwargs):
+        device.status_snapshot = StatusSnapshot(frequency=int(message.removeprefix("!f=")) if message != "-" else 0)
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    device.has_command = Mock(return_value=False)
+    args = ResonanceSearchArgs(1_200_000, 100_000, 1000, hold_on=HolderArgs(0, "ms"))
+
+    with pytest.raises(Exception, match="impedance"):
+        await ResonanceSearchProc().execute(device, args)
+
+    device.set_signal_off.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_raises_instead_of_using_stale_samples():
+    device = create_transducer(resonance=1_234_567)
+    answer_status = device.execute_command.side_effect
+
+    async def execute_command(message: str, *args, **kwargs):
+        if message != "-" or len(device.set_frequencies) < 5: # the status is not answered anymore
+            await answer_status(message)
+
+    device.execute_command.side_effect = execute_command
+    args = ResonanceSearchArgs(1_200_000, 100_000, 1000, hold_on=HolderArgs(0, "ms"))
+
+    with pytest.raises(Exception, match="valid measurement"):
+        await ResonanceSearchProc().execute(device, args)
+
+    device.set_signal_off.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_raises_if_the_connection_is_lost():
+    device = create_transducer(resonance=1_234_567)
+    device.is_connected = False
+    args = ResonanceSearchArgs(1_200_000, 100_000, 1000, hold_on=HolderArgs(0, "ms"))
+
+    with pytest.raises(ConnectionError):
+        await ResonanceSearchProc().execute(device, args)
+
+    assert len(device.set_frequencies) == 1
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.procedures.holder import HolderArgs
+from soniccontrol.procedures.procs.ramper import RamperArgs, RamperLocal
+from soniccontrol.procedures.step_scheduler import StepScheduler
+from soniccontrol.status_snapshot import StatusSnapshot
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 100.
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, duration: float) -> None:
+        self.now += duration
+
+
+@pytest.mark.asyncio
+async def test_command_latency_is_subtracted_from_the_hold():
+    fake_time = FakeTime()
+    scheduler = StepScheduler(clock=fake_time.clock, sleep=fake_time.sleep)
+
+    timings = []
+    for latency in [0.01, 0.03, 0.02]:
+        scheduler.begin_step(0.1)
+        fake_time.now += latency
+        await scheduler.hold_until(0.1)
+        timings.append(scheduler.end_step())
+
+    assert [timing.planned_start for timing in timings] == pytest.approx([0., 0.1, 0.2])
+    assert [timing.actual_end for timing in timings] == pytest.approx([0.1, 0.2, 0.3])
+    assert [timing.command_latency for timing in timings] == pytest.approx([0.01, 0.03, 0.02])
+    assert [timing.overrun for timing in timings] == pytest.approx([0., 0., 0.], abs=1e-9)
+
+
+@pytest.mark.asyncio
+async def test_steps_after_an_overrun_keep_their_full_duration():
+    fake_time = FakeTime()
+    scheduler = StepScheduler(clock=fake_time.clock, sleep=fake_time.sleep)
+
+    scheduler.begin_step(0.1)
+    fake_time.now += 0.25
+    await scheduler.hold_until(0.1)
+    first = scheduler.end_step()
+    scheduler.begin_step(0.1)
+    await scheduler.hold_until(0.1)
+    second = scheduler.end_step()
+
+    assert first.overrun == pytest.approx(0.15)
+    assert second.planned_start == pytest.approx(0.25)
+    assert second.actual_end - second.actual_start == pytest.approx(0.1)
+
+
+@pytest.mark.asyncio
+async def test_ramp_steps_do_not_drift_by_the_command_latency():
+    async def slow_command(message, *args, **kwargs):
+        if message.startswith("!f="):
+            await asyncio.sleep(0.01)
+        device.status_snapshot = StatusSnapshot(monotonic_time=time.monotonic())
+
+    device = AsyncMock()
+    device.execute_command.side_effect = slow_command
+    device.has_command = Mock(return_value=False)
+    device.status_snapshot = StatusSnapshot()
+    ramper = RamperLocal()
+    args = RamperArgs(freq_center=100000, half_range=200, step=100, hold_on=HolderArgs(30, "ms"))
+
+    start = time.monotonic()
+    await ramper.execute(device, args)
+    elapsed = time.monotonic() - start
+
+    assert len(ramper.step_timings) == 5
+    assert ramper.step_timings[-1].planned_end == pytest.approx(0.15, abs=1e-9)
+    # without the scheduler each step would take 30 ms + 10 ms
+    assert elapsed < 0.15 + 0.04
+    assert all(timing.command_latency >= 0.01 for timing in ramper.step_timings)
@@ -0,0 +1,150 @@
+import logging
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.procedures.holder import HolderArgs
+from soniccontrol.procedures.procedure_controller import ProcedureController, ProcedureType
+from soniccontrol.procedures.procedure_instantiator import ProcedureInstantiator
+from soniccontrol.procedures.procs.ramper import RamperArgs, RamperLocal
+from soniccontrol.procedures.sweep_result import SweepResult
+from soniccontrol.sonic_device import SonicDevice
+from soniccontrol.status_snapshot import StatusSnapshot
+
+
+def create_device() -> Mock:
+    """ Mocks a device, whose urms follows the last set frequency """
+    device = Mock(spec=SonicDevice)
+    device.status_snapshot = StatusSnapshot()
+
+    async def execute_command(message: str, *args, **kwargs):
+        if message == "-":
+            device.status_snapshot = device.status_snapshot._replace(monotonic_time=device.status_snapshot.monotonic_time + 1)
+            return
+        frequency = int(message.removeprefix("!f="))
+        device.status_snapshot = StatusSnapshot(frequency=frequency, urms=frequency / 1000, temperature=20.)
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    device.has_command = Mock(return_value=False)
+    return device
+
+
+def test_save_and_load_keep_all_values(tmp_path):
+    result = SweepResult.from_snapshots(
+        [1000, 2000],
+        [
+            StatusSnapshot(monotonic_time=1., frequency=1001, urms=1.5, irms=2.5, phase=3.5, temperature=20.),
+            StatusSnapshot(monotonic_time=2., frequency=2001, urms=4.5, irms=5.5, phase=6.5),
+        ]
+    )
+
+    result.save(tmp_path / "sweep.npz")
+    loaded = SweepResult.load(tmp_path / "sweep.npz")
+
+    assert len(loaded) == 2
+    assert loaded.set_frequencies.tolist() == [1000, 2000]
+    assert loaded.frequency.tolist() == [1001, 2001]
+    assert loaded.urms.tolist() == [1.5, 4.5]
+    assert loaded.irms.tolist() == [2.5, 5.5]
+    assert loaded.phase.tolist() == [3.5, 6.5]
+    assert loaded.temperature[0] == 20.
+    assert np.isnan(loaded.temperature[1])
+
+
+@pytest.mark.asyncio
+async def test_local_ramp_measures_once_per_step():
+    device = create_device()
+
+    result = await RamperLocal().execute(device, RamperArgs(100000, 200, 100, HolderArgs(1, "ms")))
+
+    assert result.set_frequencies.tolist() == [99800, 99900, 100000, 100100, 100200]
+    assert result.frequency.tolist() == result.set_frequencies.tolist()
+    assert result.urms.tolist() == pytest.approx([99.8, 99.9, 100., 100.1, 100.2])
+    assert [call.args[0] for call in device.execute_command.await_args_list].count("-") == 5
+
+
+@pytest.mark.asyncio
+async def test_local_ramp_samples_with_sens_if_the_device_has_it():
+    device = create_device()
+    device.has_command = Mock(side_effect=lambda message: message == "?sens")
+
+    async def execute_command(message: str, *args, **kwargs):
+        if message == "?sens":
+            device.status_snapshot = device.status_snapshot._replace(urms=1.)
+        elif message.startswith("!f="):
+            device.status_snapshot = StatusSnapshot(frequency=int(message.removeprefix("!f=")))
+
+    device.execute_command.side_effect = execute_command
+
+    result = await RamperLocal().execute(device, RamperArgs(100000, 100, 100, HolderArgs(1, "ms")))
+
+    messages = [call.args[0] for call in device.execute_command.await_args_list]
+    assert messages.count("?sens") == 3
+    assert "-" not in messages
+    assert result.urms.tolist() == [1., 1., 1.]
+
+
+@pytest.mark.asyncio
+async def test_local_ramp_polls_the_status_if_sens_is_not_answered():
+    device = create_device()
+    device.has_command = Mock(return_value=True)
+    sample_status = device.execute_command.side_effect
+
+    async def execute_command(message: str, *args, **kwargs):
+        if message != "?sens": # invalid answers do not update the snapshot
+            await sample_status(message)
+
+    device.execute_command.side_effect = execute_command
+
+    result = await RamperLocal().execute(device, RamperArgs(100000, 100, 100, HolderArgs(1, "ms")))
+
+    messages = [call.args[0] for call in device.execute_command.await_args_list]
+    assert messages.count("?sens") == 3
+    assert messages.count("-") == 3
+    assert len(result) == 3
+
+
+@pytest.mark.asyncio
+async def test_local_ramp_raises_if_no_sample_is_answered():
+    device = create_device()
+
+    async def execute_command(message: str, *args, **kwargs):
+        pass
+
+    device.execute_command.side_effect = execute_command
+    ramper = RamperLocal()
+
+    with pytest.raises(Exception):
+        await ramper.execute(device, RamperArgs(100000, 100, 100, HolderArgs(1, "ms")))
+
+    assert ramper.checkpoint is not None
+    assert ramper.checkpoint.next_step == 0
+    assert ramper.checkpoint.samples == []
+
+
+@pytest.mark.asyncio
+async def test_run_proc_returns_the_result_and_keeps_it(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr(ProcedureInstantiator, "instantiate_ramp", Mock(return_value=RamperLocal()))
+    proc_controller = ProcedureController(create_device())
+
+    result = await proc_controller.run_proc(ProcedureType.RAMP, RamperArgs(100000, 100, 100, HolderArgs(1, "ms")))
+
+    assert isinstance(result, SweepResult)
+    assert proc_controller.last_result is result
+    assert not proc_controller.is_proc_running
+
+
+def test_samples_are_tagged_with_their_step(tmp_path):
+    result = SweepResult.from_snapshots(
+        [1000, 1000, 1010, 1010],
+        [StatusSnapshot(monotonic_time=float(i)) for i in range(4)],
+        step_indices=[0, 0, 1, 1]
+    )
+
+    result.save(tmp_path / "sweep.npz")
+    loaded = SweepResult.load(tmp_path / "sweep.npz")
+
+    assert loaded.step_indices.tolist() == [0, 0, 1, 1]
+    assert SweepResult.from_snapshots([1000, 1010], [StatusSnapshot()] * 2).step_indices.tolist() == [0, 1]
@@ -0,0 +1,96 @@
+# Answers recorded from devices and the firmware simulation for each command of the command sets.
+# They are keyed by the attribute name of the command in CommandSetLegacy and CommandSet.
+# Used by the tests of the validators and by scripts/benchmark_command_validation.py
+
+from typing import Dict, List
+
+
+LEGACY_ANSWERS: Dict[str, List[str]] = {
+    "get_overview": [
+        "sonicdescale\nKHZ\nfrequency = 1000000\ngain = 100\nsignal on\nserial mode",
+        "soniccatch\nMHZ\nfreq=1910000\ngain=60\nsignal off",
+    ],
+    "get_type": ["soniccatch", "sonicwipe", "sonicdescale"],
+    "get_info": [
+        "soniccatch\nFirmware version 0.4\nbuilt 2023",
+        "sonicdescale\nver 1.3\nusePAT GmbH",
+    ],
+    "set_frequency": ["frequency = 1000000", "freq=1910000"],
+    "set_gain": ["gain = 100", "gain=60"],
+    "set_switching_frequency": ["frequency = 100000"],
+    "get_status": [
+        "0-1000000-100-0-0-'23.5'",
+        "0#1910000#60#1#0#'-12.25'",
+        "0-0-0-0-0-",
+        "1-1000000-100-0-1-'23.5'",
+    ],
+    "get_sens": ["1000000 3000.5 200.1 45.2", "1910000 -3.5 0 -45", "error"],
+    "get_sens_factorised": ["1000000 3000500 200100 45200000", "error"],
+    "get_sens_fullscale_values": ["1000000 300000 3100000 12", "1000000 282300 303800 -7"],
+    "signal_on": ["signal is on", "1000000#ON"],
+    "signal_off": ["signal is off", "0#OFF"],
+    "signal_auto": ["auto mode"],
+    "set_serial_mode": ["mode serial"],
+    "set_analog_mode": ["mode analog"],
+    "set_khz_mode": ["KHZ mode"],
+    "set_mhz_mode": ["MHZ mode"],
+    "set_atf1": ["frequency 1 = 1000000"],
+    "get_atf1": ["1000000\n0.5", "1000000\n-12"],
+    "set_atk1": ["0.5"],
+    "set_atf2": ["frequency 2 = 2000000"],
+    "get_atf2": ["2000000\n1.25"],
+    "set_atk2": ["1.25"],
+    "set_atf3": ["frequency 3 = 3000000"],
+    "get_atf3": ["3000000\n-0.75"],
+    "set_atk3": ["-0.75"],
+    "set_att1": ["23.5"],
+    "get_att1": ["23.5", "-4"],
+}
+
+
+ANSWERS: Dict[str, List[str]] = {
+    "set_frequency": ["1000000 Hz"],
+    "set_gain": ["100 %"],
+    "set_switching_frequency": ["100000 Hz"],
+    "get_info": ["sonicdescale\n1.0.0\n01.01.2024", "soniccatch\n2.1.3\n24.12.2023"],
+    "get_command_list": ["?info#?list_commands#-#!freq=#!gain=#!ON#!OFF#?uipt"],
+    "set_status_stream": ["100 ms", "0 ms"],
+    "get_status": [
+        "0#1000000#50#0#300000#1000#2000#3000#0#on",
+        "0#1910000#100#3#296150#1200000#250000#45000#1#off",
+    ],
+    "signal_on": ["on"],
+    "ramp": [""],
+    "signal_off": ["off"],
+    "get_frequency": ["1000000 Hz"],
+    "get_gain": ["100 %"],
+    "get_uipt": [
+        "1000 uV#200 uA#300 mDeg#25000 mDegC",
+        "23000000 uV#1200000 uA#45000 mDeg#296150 mDegC",
+    ],
+    "get_pzt": ["transducer_a#1000000"],
+    "get_atf_values": ["atf1=100000 Hz\natf2=200000 Hz\natf3=300000 Hz\natf4=400000 Hz"],
+    "get_atk_values": ["atk1=0.5\natk2=1.0\natk3=1.5\natk4=2.0"],
+    "get_att_values": ["att1=23.5 °C\natt2=24.5 °C\natt3=25.5 °C\natt4=26.5 °C"],
+    "get_aton_values": ["aton1=100 ms\naton2=200 ms\naton3=300 ms\naton4=400 ms"],
+    "set_atf1": ["1000000 Hz"],
+    "set_atf2": ["2000000 Hz"],
+    "set_atf3": ["3000000 Hz"],
+    "set_atf4": ["4000000 Hz"],
+    "set_aton1": ["100 ms"],
+    "set_aton2": ["200 ms"],
+    "set_aton3": ["300 ms"],
+    "set_aton4": ["400 ms"],
+    "set_atk1": ["0.5"],
+    "set_atk2": ["1.0"],
+    "set_atk3": ["1.5"],
+    "set_atk4": ["2.0"],
+    "set_att1": ["23.5"],
+    "set_att2": ["24.5"],
+    "set_att3": ["25.5"],
+    "set_att4": ["26.5"],
+    "tune": [""],
+    "wipe": [""],
+    "scan": [""],
+    "auto": [""],
+}
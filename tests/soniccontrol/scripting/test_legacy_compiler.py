@@ -0,0 +1,59 @@
+import logging
+from typing import List
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.scripting.legacy_compiler import OpCode, compile_script
+from soniccontrol.scripting.legacy_scripting import LegacyScriptingFacade, SonicParser
+from soniccontrol.scripting.scripting_facade import BuiltInFunctions
+from soniccontrol.sonic_device import SonicDevice
+
+
+NESTED_LOOPS = "startloop 2\n!g=10\nstartloop 3\n!g=20\nendloop\nendloop\nAUTO"
+
+
+def parse(text: str):
+    parsed = SonicParser().parse_text(text)
+    return [
+        {"command": command, "argument": argument, "loop": loop}
+        for command, argument, loop in zip(parsed["commands"], parsed["arguments"], parsed["loops"])
+    ]
+
+
+def test_loops_are_compiled_into_jump_table_and_counter_slots():
+    program = compile_script(parse(NESTED_LOOPS))
+
+    assert program.opcodes == (
+        OpCode.LOOP_START, OpCode.SEND, OpCode.LOOP_START, OpCode.SEND, OpCode.LOOP_END, OpCode.LOOP_END, OpCode.CALL
+    )
+    assert program.jumps == (6, -1, 5, -1, 2, 0, -1)
+    assert program.slots == (0, -1, 1, -1, 1, 0, -1)
+    assert program.initial_counters == (2, 3)
+    assert program.nested_slots == ((1,), ())
+    assert program.functions[6] == BuiltInFunctions.AUTO
+
+
+def test_unknown_function_is_rejected():
+    with pytest.raises(ValueError):
+        compile_script([{"command": "explode", "argument": (), "loop": {}}])
+
+
+@pytest.mark.asyncio
+async def test_nested_loops_restart_the_inner_loop_every_iteration(monkeypatch):
+    monkeypatch.setattr("soniccontrol.procedures.procedure_controller.get_base_logger", lambda _: logging.getLogger())
+    monkeypatch.setattr("soniccontrol.scripting.legacy_scripting.get_base_logger", lambda _: logging.getLogger())
+    sent: List[str] = []
+    device = Mock(spec=SonicDevice)
+
+    async def execute_command(message: str, *args, **kwargs):
+        sent.append(message)
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    script = LegacyScriptingFacade(device).parse_script(NESTED_LOOPS)
+
+    async for _ in script:
+        pass
+
+    assert sent == (["!g=10"] + ["!g=20"] * 3) * 2
+    device.set_signal_auto.assert_awaited_once()
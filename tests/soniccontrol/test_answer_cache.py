@@ -0,0 +1,95 @@
+import pytest
+
+from soniccontrol.answer_cache import AnswerCache
+from soniccontrol.commands import CommandSetLegacy
+from soniccontrol.device_data import Info, Status
+from soniccontrol.sonic_device import SonicDevice
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_returns_answers_until_they_expire():
+    clock = FakeClock()
+    cache = AnswerCache(ttls={"?type": 10.}, clock=clock)
+
+    assert cache.get("?type") is None
+    cache.put("?type", "", "soniccatch")
+    clock.now = 9.
+    assert cache.get("?type") == "soniccatch"
+    clock.now = 10.
+    assert cache.get("?type") is None
+
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_messages_without_ttl_are_not_cached_or_counted():
+    cache = AnswerCache(ttls={"?type": 10.})
+
+    cache.put("-", "", "0-1000000-100-0-0-")
+
+    assert cache.get("-") is None
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_answers_are_cached_per_argument():
+    cache = AnswerCache(ttls={"?atf": 10.})
+
+    cache.put("?atf", 1, "1000000")
+
+    assert cache.get("?atf", 1) == "1000000"
+    assert cache.get("?atf", 2) is None
+
+
+@pytest.mark.parametrize("setter, invalidated, kept", [
+    ("!atf1=", ["?atf1", "?atf"], ["?atf2", "?att1", "?info"]),
+    ("!atf1=1000000", ["?atf1", "?atf"], ["?atf2"]),
+    ("!atk1=", ["?atf1", "?atk"], ["?atf"]),
+    ("!att2=", ["?att2", "?att"], ["?att1"]),
+    ("?atf1", [], ["?atf1", "?atf"]),
+])
+def test_setters_invalidate_the_getters_of_their_value(setter, invalidated, kept):
+    getters = invalidated + kept
+    cache = AnswerCache(ttls={getter: 10. for getter in getters})
+    for getter in getters:
+        cache.put(getter, "", "answer")
+
+    cache.invalidate(setter)
+
+    assert [getter for getter in getters if cache.get(getter) is None] == invalidated
+
+
+class CountingCommunicator:
+    def __init__(self, answers) -> None:
+        self.answers = answers
+        self.sent = []
+
+    async def send_and_wait_for_answer(self, request) -> None:
+        self.sent.append(request.full_message)
+        request.answer.receive_answer(self.answers[request.message])
+
+
+@pytest.mark.asyncio
+async def test_sonic_device_answers_getters_from_the_cache_until_the_setter_runs():
+    serial = CountingCommunicator({"?atf1": "1000000\n0.5", "!atf1=": "Frequency 1 = 2000000"})
+    commands = CommandSetLegacy(serial)
+    device = SonicDevice(
+        serial=serial,
+        commands={command.message: command for command in [commands.get_atf1, commands.set_atf1]},
+        status=Status(),
+        info=Info(),
+        answer_cache=AnswerCache(),
+    )
+
+    assert await device.get_atf(1) == "1000000\n0.5"
+    assert await device.get_atf(1) == "1000000\n0.5"
+    await device.set_atf(1, 2000000)
+    await device.get_atf(1)
+
+    assert serial.sent == ["?atf1", "!atf1=2000000", "?atf1"]
+    assert (device.answer_cache.hits, device.answer_cache.misses) == (1, 2)
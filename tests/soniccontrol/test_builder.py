@@ -0,0 +1,18 @@
+from unittest.mock import Mock
+
+from soniccontrol.builder import DeviceBuilder
+from soniccontrol.command import Answer
+from soniccontrol.commands import CommandSet
+
+
+def test_add_commands_from_list_command_answer_adds_known_and_reports_unknown_commands():
+    commands = CommandSet(None)
+    device = Mock()
+    answer = Answer()
+    answer.receive_answer("?info#-#!freq=#?sweep#!ON#!foo=")
+
+    unknown_commands = DeviceBuilder()._add_commands_from_list_command_answer(commands, device, answer)
+
+    added = [call.args[0] for call in device.add_command.call_args_list]
+    assert added == [commands.get_info, commands.get_status, commands.set_frequency, commands.signal_on]
+    assert unknown_commands == ["?sweep", "!foo="]
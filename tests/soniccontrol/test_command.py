@@ -0,0 +1,173 @@
+import asyncio
+
+import attrs
+import pytest
+
+from soniccontrol import commands
+from soniccontrol.command import Command, CommandValidator, ConversionError
+from soniccontrol.commands import CommandSet, CommandSetLegacy
+from tests.soniccontrol.recorded_answers import ANSWERS, LEGACY_ANSWERS
+
+
+def test_accepts_converts_groups():
+    validator = CommandValidator(pattern=r"(\d+)#(\w+)", frequency=int, mode=str.upper)
+
+    assert validator.accepts("1000#on")
+    assert validator.result == {"frequency": 1000, "mode": "ON"}
+    assert validator.errors == []
+
+
+def test_accepts_runs_after_converters_with_converted_groups():
+    validator = CommandValidator(
+        pattern=r"(\d+) (\d+)",
+        a=int,
+        b=int,
+        sum={"worker": lambda a, b: a + b, "keywords": ["a", "b"]},
+    )
+
+    assert validator.accepts("3 4")
+    assert validator.result == {"a": 3, "b": 4, "sum": 7}
+
+
+def test_accepts_collects_conversion_errors():
+    validator = CommandValidator(pattern=r"(\w+)#(\w+)", frequency=int, mode=str)
+
+    assert validator.accepts("abc#on")
+    assert validator.result == {"frequency": False, "mode": "on"}
+    assert len(validator.errors) == 1
+    error = validator.errors[0]
+    assert isinstance(error, ConversionError)
+    assert error.keyword == "frequency"
+    assert error.value == "abc"
+    assert isinstance(error.exception, ValueError)
+
+
+def test_accepts_runs_after_converters_when_a_converter_fails():
+    validator = CommandValidator(
+        pattern=r"(\w+) (\w+)",
+        a=int,
+        b=int,
+        a_or_b={"worker": lambda a, b: a or b, "keywords": ["a", "b"]},
+    )
+
+    assert validator.accepts("x 4")
+    assert validator.result == {"a": False, "b": 4, "a_or_b": 4}
+    assert [error.keyword for error in validator.errors] == ["a"]
+
+
+@pytest.mark.parametrize("value", ["on", "OFF", "True", "f", "yes", "N", "1", "0", "maybe", "", None])
+def test_to_bool_converts_like_attrs(value):
+    try:
+        expected = attrs.converters.to_bool(str(value))
+    except ValueError:
+        with pytest.raises(ValueError):
+            commands.to_bool(value)
+    else:
+        assert commands.to_bool(value) is expected
+
+
+def test_accepts_resets_errors_of_previous_call():
+    validator = CommandValidator(pattern=r"(\w+)", frequency=int)
+
+    assert validator.accepts("abc")
+    assert validator.accepts("100")
+    assert validator.errors == []
+
+
+def test_accepts_rejects_answers_not_matching():
+    validator = CommandValidator(pattern=r"(\d+) Hz", frequency=int)
+
+    assert not validator.accepts("")
+    assert not validator.accepts("on")
+
+
+@pytest.mark.parametrize("command_set, answers", [
+    (CommandSetLegacy(None), LEGACY_ANSWERS),
+    (CommandSet(None), ANSWERS),
+])
+def test_recorded_answers_are_accepted(command_set, answers):
+    for name, recorded in answers.items():
+        command: Command = getattr(command_set, name)
+        for answer in recorded:
+            if not answer:
+                continue
+            command.answer.receive_answer(answer)
+            assert command.validate(), f"{name} did not accept {answer!r}"
+
+
+def test_validate_skips_validators_whose_literal_is_missing():
+    validator = CommandValidator(pattern=r".*gain\s*=?\s*(\d+).*", literal="GAIN", gain=int)
+    command = Command(message="?", validators=validator)
+
+    command.answer.receive_answer("frequency = 1000\nsignal on")
+    assert not command.validate()
+
+    command.answer.receive_answer("frequency = 1000\nGain = 20")
+    assert command.validate()
+    assert command.status_result == {"gain": 20}
+
+
+def test_validate_checks_lines_for_anchored_patterns():
+    validator = CommandValidator(pattern=r"^(\d+) Hz$", frequency=int)
+    command = Command(message="?", validators=validator)
+    assert not validator.matches_within_lines
+
+    command.answer.receive_answer("frequency\n1000 Hz\nsignal on")
+    assert command.validate()
+    assert command.status_result == {"frequency": 1000}
+    assert command.answer.unknown_answers == {"frequency", "signal on"}
+
+
+@pytest.mark.parametrize("command_set_type", [CommandSetLegacy, CommandSet])
+def test_command_sets_share_validators_between_connections(command_set_type):
+    first = command_set_type(None)
+    second = command_set_type(None)
+
+    for definition, first_command, second_command in zip(command_set_type.definitions, first, second):
+        assert first_command is not second_command
+        assert first_command.message == second_command.message == definition.message
+        assert first_command.validators is second_command.validators
+
+
+@pytest.mark.parametrize("command_set_type", [CommandSetLegacy, CommandSet])
+def test_command_sets_declare_an_attribute_for_each_definition(command_set_type):
+    names = [definition.name for definition in command_set_type.definitions]
+    assert len(names) == len(set(names))
+    assert set(names) == set(command_set_type.__annotations__) - {"definitions"}
+
+
+def test_add_validators_does_not_modify_shared_validators():
+    validator = CommandValidator(pattern=r"(\d+) Hz", frequency=int)
+    first, second = CommandSet(None), CommandSet(None)
+
+    first.get_frequency.add_validators(validator)
+
+    assert validator in first.get_frequency.validators
+    assert validator not in second.get_frequency.validators
+
+
+class DelayedEchoCommunicator:
+    """Answers with the argument of the request after a delay given by the argument, so that answers overtake each other."""
+
+    async def send_and_wait_for_answer(self, request) -> None:
+        await asyncio.sleep(int(request.argument) / 1000)
+        request.answer.receive_answer(f"{request.argument} Hz")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_executions_of_a_command_get_their_own_answers():
+    command = Command(
+        message="!freq=",
+        validators=CommandValidator(pattern=r"(\d+)\s*Hz", frequency=int),
+        serial_communication=DelayedEchoCommunicator(),
+    )
+
+    (slow_answer, slow_result), (fast_answer, fast_result) = await asyncio.gather(
+        command.execute(argument=50), command.execute(argument=10)
+    )
+
+    assert slow_answer.string == "50 Hz" and slow_result["frequency"] == 50
+    assert fast_answer.string == "10 Hz" and fast_result["frequency"] == 10
+    assert slow_answer.valid and fast_answer.valid
+    assert command.argument == ""
+    assert command.answer is slow_answer # the last completed call
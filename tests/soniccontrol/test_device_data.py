@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from soniccontrol.device_data import Status
+
+
+@pytest.mark.asyncio
+async def test_update_wakes_waiters_without_delaying_the_caller():
+    status = Status()
+    changed = asyncio.create_task(status.changed.wait())
+    version = asyncio.create_task(status.wait_for_change())
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(status.update(frequency=1000), timeout=0.01)
+
+    assert await asyncio.wait_for(changed, timeout=1)
+    assert await asyncio.wait_for(version, timeout=1) == status.version == 1
+    assert not status.changed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_update_without_changes_keeps_the_version():
+    status = Status(frequency=1000)
+
+    await status.update(frequency=1000)
+
+    assert status.version == 0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_change_returns_changes_that_happened_since_the_given_version():
+    status = Status()
+    seen_version = status.version
+
+    await status.update(gain=50)
+
+    assert await asyncio.wait_for(status.wait_for_change(seen_version), timeout=0.01) == 1
+
+
+@pytest.mark.asyncio
+async def test_update_signals_when_the_remote_procedure_finished():
+    status = Status(procedure=3)
+    finished = asyncio.create_task(status.remote_proc_finished_running.wait())
+    await asyncio.sleep(0)
+
+    await status.update(procedure=0)
+
+    assert await asyncio.wait_for(finished, timeout=1)
+    assert not status.remote_proc_finished_running.is_set()
+
+
+@pytest.mark.asyncio
+async def test_subscribers_get_the_change_set_of_updates_that_change_their_field():
+    status = Status()
+    phase_changes, urms_or_irms_changes = [], []
+    status.subscribe("phase", phase_changes.append)
+    status.subscribe("urms", urms_or_irms_changes.append)
+    status.subscribe("irms", urms_or_irms_changes.append)
+
+    await status.update(urms=1.0, irms=2.0)
+    await status.update(urms=1.0, irms=2.0)
+    await status.update(phase=3.0)
+
+    assert phase_changes == [status.last_change]
+    assert phase_changes[0].version == 2 and phase_changes[0].changes == {"phase": 3.0}
+    assert len(urms_or_irms_changes) == 1
+    assert urms_or_irms_changes[0].version == 1
+    assert urms_or_irms_changes[0].changes == {"urms": 1.0, "irms": 2.0}
+
+
+@pytest.mark.asyncio
+async def test_unsubscribed_listeners_are_not_called():
+    status = Status()
+    changes = []
+    status.subscribe("gain", changes.append)
+    status.unsubscribe("gain", changes.append)
+
+    await status.update(gain=10)
+
+    assert changes == []
+
+
+def test_subscribe_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        Status().subscribe("voltage", print)
@@ -0,0 +1,98 @@
+import asyncio
+from multiprocessing.shared_memory import SharedMemory
+import re
+import pytest
+import pytest_asyncio
+
+from soniccontrol.communication.connection_factory import TcpConnectionFactory
+from soniccontrol.device_process import DeviceProcess
+
+
+_ANSWERS = {
+    "?info": "sonicdescale\n1.0.0\n01.01.2024",
+    "?list_commands": "?info#?list_commands#-#!freq=#!gain=#!ON#!OFF",
+}
+
+
+class FakeDevice:
+    """ A device on a tcp socket, that answers the packages of the new protocol """
+    def __init__(self) -> None:
+        self.frequency = 1000000
+        self.messages = []
+
+    def answer(self, message: str) -> str:
+        self.messages.append(message)
+        if message.startswith("!freq="):
+            self.frequency = int(message[len("!freq="):])
+            return f"{self.frequency} Hz"
+        if message == "-":
+            return f"20#0#{self.frequency}#50#0#300000#1000#2000#3000#0#on" # starts with the command code
+        return _ANSWERS.get(message, "ok")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        buffer = b""
+        while data := await reader.read(1024):
+            buffer += data
+            while b">" in buffer:
+                package, buffer = buffer.split(b">", 1)
+                match = re.search(rb"<[^#]+#[^#]+#(\d+)#\d+#(.*)", package, re.S)
+                if match is None:
+                    continue
+                answer = self.answer(match.group(2).decode())
+                writer.write(f"<0#0#{match.group(1).decode()}#{len(answer)}#{answer}>".encode())
+                await writer.drain()
+        writer.close()
+
+
+@pytest_asyncio.fixture()
+async def fake_device():
+    device = FakeDevice()
+    server = await asyncio.start_server(device.handle, "127.0.0.1", 0)
+    device.port = server.sockets[0].getsockname()[1]
+    yield device
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_device_process_publishes_status_and_executes_commands(fake_device, tmp_path):
+    connection_factory = TcpConnectionFactory(connection_name="fake", host="127.0.0.1", port=fake_device.port)
+    device_process = DeviceProcess(connection_factory, log_path=tmp_path, poll_interval=0.05)
+
+    await asyncio.wait_for(device_process.start(), timeout=30)
+    try:
+        assert device_process.is_running
+        assert device_process.info["device_type"] == "descale"
+
+        answer = await device_process.execute_command("!freq=", 120000)
+        assert "120000" in answer
+
+        records = []
+        for _ in range(100):
+            records += device_process.read_status_records()
+            if any(record.frequency == 120000 for record in records):
+                break
+            await asyncio.sleep(0.05)
+        assert records
+        assert records[-1].frequency == 120000
+        assert records[0].urms == 1000
+    finally:
+        process = device_process._process
+        ring_buffer_name = device_process._ring_buffer.name
+        await device_process.stop()
+
+    assert not device_process.is_running
+    assert process is not None and process.exitcode == 0 # the worker stopped itself and was not terminated
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=ring_buffer_name) # the ring buffer was unlinked
+
+
+@pytest.mark.asyncio
+async def test_device_process_start_raises_if_device_is_unreachable(tmp_path):
+    connection_factory = TcpConnectionFactory(connection_name="fake", host="127.0.0.1", port=1)
+    device_process = DeviceProcess(connection_factory, log_path=tmp_path)
+
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(device_process.start(), timeout=30)
+
+    assert not device_process.is_running
@@ -0,0 +1,37 @@
+import pytest
+
+from soniccontrol.link_statistics import LinkStatistics, command_key
+
+
+def test_command_key_strips_the_argument():
+    assert command_key("!f=1000") == "!f="
+    assert command_key("!ON") == "!ON"
+
+
+def test_statistics_are_recorded_per_command():
+    statistics = LinkStatistics()
+
+    for seconds in [0.01, 0.02, 0.03]:
+        statistics.record(f"!f={int(seconds * 1e5)}", seconds)
+    statistics.record("!ON", 0.1)
+
+    frequency = statistics.latency("!f=")
+    assert frequency is not None
+    assert frequency.count == 3
+    assert frequency.mean == pytest.approx(0.02)
+    assert frequency.std == pytest.approx(0.01)
+    assert (frequency.minimum, frequency.maximum) == (0.01, 0.03)
+    assert statistics.overall.count == 4
+    assert statistics.overall.mean == pytest.approx(0.04)
+
+
+def test_expected_latency_falls_back_to_overall_and_default():
+    statistics = LinkStatistics()
+    assert statistics.expected_latency("!g=", default=0.2).mean == 0.2
+
+    statistics.record("!ON", 0.1)
+    assert statistics.expected_latency("!g=", default=0.2).mean == pytest.approx(0.1)
+
+    statistics.clear()
+    assert statistics.latency("!ON") is None
+    assert statistics.overall.count == 0
@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+
+from soniccontrol.command import Command
+from soniccontrol.device_data import Status
+from soniccontrol.logging import add_trace_sink, is_tracing, remove_trace_sink
+
+
+class EchoCommunicator:
+    async def send_and_wait_for_answer(self, request) -> None:
+        request.answer.receive_answer(f"{request.argument} Hz")
+
+
+@pytest.fixture
+def records():
+    records = []
+    sink = lambda kind, data: records.append((kind, data))
+    add_trace_sink(sink)
+    yield records
+    remove_trace_sink(sink)
+
+
+@pytest.mark.asyncio
+async def test_command_execute_passes_call_and_answer_to_trace_sinks(records):
+    command = Command(message="!f=", serial_communication=EchoCommunicator())
+
+    await command.execute(argument=1000)
+    await command.execute(argument=2000, should_log=False)
+
+    assert records == [
+        ("COMMAND_CALL", {"argument": "1000", "message": "!f="}),
+        ("ANSWER", {"message": "1000 Hz"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parrot_feeder_logs_records_as_json(caplog):
+    command = Command(message="!f=", serial_communication=EchoCommunicator())
+
+    with caplog.at_level(logging.DEBUG, logger="parrot_feeder"):
+        assert is_tracing()
+        await command.execute(argument=1000)
+
+    assert [record.getMessage() for record in caplog.records] == [
+        'COMMAND_CALL({"argument": "1000", "message": "!f="})',
+        'ANSWER({"message": "1000 Hz"})',
+    ]
+    assert caplog.records[0].funcName == "execute"
+
+
+def test_tracing_is_off_without_sinks_and_parrot_feeder():
+    assert not is_tracing()
+
+
+def test_status_get_dict_contains_the_serialisable_fields():
+    not_serialisable = {
+        "timestamp", "_changed", "_changed_data", "_remote_proc_finished_running",
+        "_change_waiters", "_subscribers", "_last_change",
+    }
+
+    result = Status(frequency=1000).get_dict()
+
+    assert result["frequency"] == 1000
+    assert set(result) == {field.name for field in Status.__attrs_attrs__} - not_serialisable
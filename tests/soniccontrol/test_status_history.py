@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from soniccontrol.status_history import StatusHistory
+from soniccontrol.status_snapshot import StatusSnapshot
+
+
+def fill(history: StatusHistory, count: int) -> None:
+    for i in range(count):
+        history.append(StatusSnapshot(monotonic_time=float(i), frequency=i, temperature=20.))
+
+
+def test_empty_history():
+    history = StatusHistory(capacity=4)
+
+    assert len(history) == 0
+    assert history.latest() is None
+    assert len(history.view()) == 0
+    assert len(history.between(0., 10.)) == 0
+
+
+@pytest.mark.parametrize("count", [3, 4, 5, 8, 11])
+def test_view_returns_the_last_snapshots_in_order(count):
+    history = StatusHistory(capacity=4)
+    fill(history, count)
+
+    expected = list(range(max(0, count - 4), count))
+    assert history.view()["frequency"].tolist() == expected
+    assert history.view(last=2)["frequency"].tolist() == expected[-2:]
+    assert history.latest() == StatusSnapshot(monotonic_time=float(count - 1), frequency=count - 1, temperature=20.)
+    assert history.write_count == count
+
+
+def test_views_share_the_memory_of_the_buffer():
+    history = StatusHistory(capacity=4)
+    fill(history, 6)
+
+    view = history.view()
+
+    assert not view.flags.owndata
+    assert np.shares_memory(view, history.view(last=1))
+
+
+def test_between_finds_time_ranges():
+    history = StatusHistory(capacity=8)
+    fill(history, 12)
+
+    assert history.between(5., 7.)["frequency"].tolist() == [5, 6]
+    assert history.between(0., 5.5)["frequency"].tolist() == [4, 5]
+    assert history.between(10.5, 100.)["frequency"].tolist() == [11]
+    assert len(history.between(20., 30.)) == 0
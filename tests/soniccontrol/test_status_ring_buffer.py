@@ -0,0 +1,61 @@
+import datetime
+import pytest
+
+from soniccontrol.device_data import Status
+from soniccontrol.status_ring_buffer import StatusRingBuffer
+
+
+@pytest.fixture()
+def ring_buffer():
+    ring_buffer = StatusRingBuffer.create(capacity=4)
+    yield ring_buffer
+    ring_buffer.close()
+
+
+def make_status(frequency: int) -> Status:
+    return Status(frequency=frequency, urms=1.5, temperature=None, timestamp=datetime.datetime(2024, 1, 1))
+
+
+def test_read_since_returns_written_records_in_order(ring_buffer):
+    for frequency in (1000, 2000, 3000):
+        ring_buffer.write(make_status(frequency))
+
+    records, index = ring_buffer.read_since(0)
+
+    assert [record.frequency for record in records] == [1000, 2000, 3000]
+    assert index == 3
+    assert records[0].urms == 1.5
+    assert records[0].temperature is None
+    assert records[0].timestamp == datetime.datetime(2024, 1, 1).timestamp()
+
+
+def test_read_since_only_returns_new_records(ring_buffer):
+    ring_buffer.write(make_status(1000))
+    _, index = ring_buffer.read_since(0)
+    ring_buffer.write(make_status(2000))
+
+    records, index = ring_buffer.read_since(index)
+
+    assert [record.frequency for record in records] == [2000]
+    assert index == 2
+
+
+def test_read_since_drops_overwritten_records(ring_buffer):
+    for frequency in range(1, 7):
+        ring_buffer.write(make_status(frequency))
+
+    records, index = ring_buffer.read_since(0)
+
+    assert [record.frequency for record in records] == [3, 4, 5, 6]
+    assert index == 6
+
+
+def test_attached_ring_buffer_reads_what_the_owner_writes(ring_buffer):
+    reader = StatusRingBuffer.attach(ring_buffer.name)
+    ring_buffer.write(make_status(1234))
+
+    records, _ = reader.read_since(0)
+    reader.close()
+
+    assert reader.capacity == 4
+    assert [record.frequency for record in records] == [1234]
@@ -0,0 +1,44 @@
+import math
+
+from soniccontrol.commands import CommandSet, CommandSetLegacy
+from soniccontrol.status_snapshot import STATUS_SNAPSHOT_DTYPE, StatusSnapshot, to_array
+
+
+def test_updated_takes_the_values_of_the_result_and_keeps_the_others():
+    snapshot = StatusSnapshot(monotonic_time=1., frequency=1000, urms=5.)
+
+    updated = snapshot.updated({"frequency": 2000, "timestamp": 123., "atf1": 3}, monotonic_time=2.)
+
+    assert updated == StatusSnapshot(monotonic_time=2., frequency=2000, urms=5.)
+    assert snapshot.frequency == 1000
+
+
+def test_updated_stores_unknown_temperatures_as_nan():
+    snapshot = StatusSnapshot(temperature=20.)
+
+    assert math.isnan(snapshot.updated({"temperature": None}, monotonic_time=1.).temperature)
+
+
+def test_snapshots_are_built_from_the_results_of_the_status_decoders():
+    v2_status = CommandSet(None).get_status
+    v2_status.answer.receive_answer("0#1910000#100#3#296150#1200000#250000#45000#1#off")
+    assert v2_status.validate()
+    legacy_status = CommandSetLegacy(None).get_status
+    legacy_status.answer.receive_answer("0-1000000-100-0-0-")
+    assert legacy_status.validate()
+
+    snapshot = StatusSnapshot().updated(v2_status.status_result, monotonic_time=1.)
+    assert snapshot[1:] == (0, 1910000, 100, 3, False, False, 1200000, 250000, 45000, snapshot.temperature)
+    assert math.isclose(snapshot.temperature, 24.)
+
+    snapshot = snapshot.updated(legacy_status.status_result, monotonic_time=2.)
+    assert (snapshot.frequency, snapshot.signal, snapshot.urms) == (1000000, True, 1200000)
+
+
+def test_to_array_creates_a_structured_array():
+    array = to_array([StatusSnapshot(monotonic_time=1., frequency=1000), StatusSnapshot(monotonic_time=2., signal=True)])
+
+    assert array.dtype == STATUS_SNAPSHOT_DTYPE
+    assert array["frequency"].tolist() == [1000, 0]
+    assert array["signal"].tolist() == [False, True]
+    assert array.dtype.names == StatusSnapshot._fields
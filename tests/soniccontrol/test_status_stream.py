@@ -0,0 +1,50 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from soniccontrol.commands import CommandSet
+from soniccontrol.device_data import Info, Status
+from soniccontrol.sonic_device import SonicDevice
+
+
+class StreamingCommunicator:
+    """ Pushes the given status packages, then nothing anymore """
+    def __init__(self, packages: List[str]) -> None:
+        self.packages: asyncio.Queue = asyncio.Queue()
+        for package in packages:
+            self.packages.put_nowait(package)
+
+    async def read_status_package(self) -> str:
+        return await self.packages.get()
+
+
+def create_device(serial: StreamingCommunicator) -> SonicDevice:
+    commands = CommandSet(serial)
+    return SonicDevice(
+        serial=serial,
+        commands={commands.get_status.message: commands.get_status},
+        status=Status(),
+        info=Info(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_receive_streamed_status_skips_invalid_packages():
+    serial = StreamingCommunicator(["garbage", "0#1000000#100#0#293150000#1000#2000#30#0#on"])
+    device = create_device(serial)
+
+    status = await device.receive_streamed_status(timeout=1)
+
+    assert status.frequency == 1000000
+    assert status.gain == 100
+    assert device.status_snapshot.frequency == 1000000
+    assert serial.packages.empty()
+
+
+@pytest.mark.asyncio
+async def test_receive_streamed_status_times_out_without_packages():
+    device = create_device(StreamingCommunicator(["garbage"]))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await device.receive_streamed_status(timeout=0.05)
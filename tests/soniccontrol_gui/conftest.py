@@ -0,0 +1,20 @@
+import logging
+
+# Importing soniccontrol_gui configures the logging of the application, which disables the existing loggers
+# and logs everything from the root logger. The other tests expect the default logging, so it is restored.
+_root = logging.getLogger()
+_root_level = _root.level
+_root_handlers = list(_root.handlers)
+_disabled = {
+    name: logger.disabled for name, logger in logging.Logger.manager.loggerDict.items()
+    if isinstance(logger, logging.Logger)
+}
+
+import soniccontrol_gui # noqa: E402
+
+for _handler in list(_root.handlers):
+    if _handler not in _root_handlers:
+        _root.removeHandler(_handler)
+_root.setLevel(_root_level)
+for _name, _was_disabled in _disabled.items():
+    logging.getLogger(_name).disabled = _was_disabled
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import List, Tuple
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.procedures.holder import HolderArgs
+from soniccontrol.sonic_device import SonicDevice
+from soniccontrol.status_snapshot import StatusSnapshot
+from soniccontrol_gui.state_fetching.spectrum_measure import SpectrumMeasure, SpectrumMeasureArgs
+from soniccontrol_gui.state_fetching.updater import Updater
+
+
+LATENCY_S = 0.005
+
+# (message, step tag of the update, time the command was sent, time it was answered)
+Call = Tuple[str, int, float, float]
+
+
+def create_device_and_updater(calls: List[Call]) -> Tuple[Mock, Mock]:
+    device = Mock(spec=SonicDevice)
+    device.status_snapshot = StatusSnapshot()
+
+    async def execute_command(message: str, *args, **kwargs):
+        sent_at = time.monotonic()
+        await asyncio.sleep(LATENCY_S)
+        device.status_snapshot = device.status_snapshot._replace(frequency=int(message.removeprefix("!f=")))
+        calls.append((message, -1, sent_at, time.monotonic()))
+
+    async def update(step: int):
+        sent_at = time.monotonic()
+        await asyncio.sleep(LATENCY_S)
+        device.status_snapshot = device.status_snapshot._replace(monotonic_time=time.monotonic())
+        calls.append(("-", step, sent_at, time.monotonic()))
+
+    device.execute_command = AsyncMock(side_effect=execute_command)
+    updater = Mock(spec=Updater)
+    updater.update = AsyncMock(side_effect=update)
+    return device, updater
+
+
+@pytest.mark.asyncio
+async def test_each_step_takes_its_samples_after_the_settle_time():
+    calls: List[Call] = []
+    device, updater = create_device_and_updater(calls)
+    args = SpectrumMeasureArgs(
+        100000, 100, 100, hold_on=HolderArgs(40, "ms"), time_offset_measure=HolderArgs(20, "ms"), samples_per_step=3
+    )
+
+    result = await SpectrumMeasure(updater).execute(device, args)
+
+    assert [(message, step) for message, step, _, _ in calls] == [
+        ("!f=99900", -1), ("-", 0), ("-", 0), ("-", 0),
+        ("!f=100000", -1), ("-", 1), ("-", 1), ("-", 1),
+        ("!f=100100", -1), ("-", 2), ("-", 2), ("-", 2),
+    ]
+    settle_s = args.time_offset_measure.duration_in_ms / 1000
+    for step in range(3):
+        frequency_call = calls[4 * step]
+        samples = calls[4 * step + 1:4 * step + 4]
+        # the settle time is measured from the begin of the step, which is right before the frequency is sent
+        assert samples[0][2] - frequency_call[2] >= settle_s - 0.001
+        if step < 2:
+            next_frequency_call = calls[4 * step + 4]
+            # the polls were answered, before the next frequency was sent
+            assert samples[-1][3] <= next_frequency_call[2]
+    assert result.step_indices.tolist() == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+    assert result.set_frequencies.tolist() == [99900] * 3 + [100000] * 3 + [100100] * 3
+    assert result.frequency.tolist() == result.set_frequencies.tolist()
+    updater.stop.assert_awaited_once()
+    updater.start.assert_called_once()
+    device.set_signal_off.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_polls_without_valid_answer_are_left_out():
+    calls: List[Call] = []
+    device, updater = create_device_and_updater(calls)
+    answer_poll = updater.update.side_effect
+
+    async def update(step: int):
+        if step != 1: # the polls of the second step get no valid answer
+            await answer_poll(step)
+
+    updater.update.side_effect = update
+    args = SpectrumMeasureArgs(100000, 100, 100, hold_on=HolderArgs(10, "ms"), time_offset_measure=HolderArgs(0, "ms"))
+
+    result = await SpectrumMeasure(updater).execute(device, args)
+
+    assert result.step_indices.tolist() == [0, 2]
+    assert result.set_frequencies.tolist() == [99900, 100100]
+
+
+@pytest.mark.asyncio
+async def test_measure_raises_if_the_connection_is_lost():
+    calls: List[Call] = []
+    device, updater = create_device_and_updater(calls)
+    device.is_connected = False
+    args = SpectrumMeasureArgs(100000, 100, 100, hold_on=HolderArgs(10, "ms"), time_offset_measure=HolderArgs(0, "ms"))
+
+    with pytest.raises(ConnectionError):
+        await SpectrumMeasure(updater).execute(device, args)
+
+    assert [message for message, _, _, _ in calls] == ["!f=99900"]
+    updater.start.assert_called_once() # the updater is restarted anyway
@@ -0,0 +1,73 @@
+import asyncio
+from typing import List
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from soniccontrol.device_data import Status
+from soniccontrol.events import Event
+from soniccontrol.sonic_device import SonicDevice
+from soniccontrol_gui.state_fetching.updater import Updater
+
+
+def create_streaming_device() -> Mock:
+    device = Mock(spec=SonicDevice)
+    device.supports_status_stream = True
+    device.status = Status()
+    return device
+
+
+@pytest.mark.asyncio
+async def test_stream_polls_once_if_no_package_arrives_in_time():
+    device = create_streaming_device()
+    pushed = Status(frequency=1000)
+    received = 0
+
+    async def receive_streamed_status(timeout):
+        nonlocal received
+        received += 1
+        if received == 1:
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(0.01)
+        return pushed
+
+    device.receive_streamed_status = AsyncMock(side_effect=receive_streamed_status)
+    updater = Updater(device, stream_interval_ms=10)
+    events: List[Event] = []
+    updater.subscribe("update", events.append)
+
+    updater.start()
+    await asyncio.sleep(0.05)
+    await updater.stop()
+
+    device.start_status_stream.assert_awaited_once_with(10)
+    device.execute_command.assert_awaited_once_with("-", should_log=False)
+    assert events[0].data["status"] is device.status
+    assert events[1].data["status"] is pushed
+    device.stop_status_stream.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_is_stopped_if_receiving_fails():
+    device = create_streaming_device()
+    device.receive_streamed_status = AsyncMock(side_effect=ConnectionError("Connection lost"))
+    updater = Updater(device, stream_interval_ms=10)
+
+    updater.start()
+    await asyncio.sleep(0.01)
+    with pytest.raises(ConnectionError):
+        await updater.stop()
+
+    device.stop_status_stream.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_tags_the_event():
+    device = create_streaming_device()
+    updater = Updater(device)
+    events: List[Event] = []
+    updater.subscribe("update", events.append)
+
+    await updater.update(step=3)
+
+    assert events[0].data["step"] == 3